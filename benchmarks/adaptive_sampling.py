@@ -0,0 +1,83 @@
+"""
+Top-k recovery per API call: AdaptiveSampler vs. uniform round-robin over the same
+budget, on a synthetic catalog where each model's true quality and price are known.
+A pull is `--tasks` Bernoulli(quality) scores, like one call per benchmark task.
+
+    python benchmarks/adaptive_sampling.py --models 200 --budgets 600,1200,2400
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+from adaptive_sampler import AdaptiveSampler
+
+
+def population(n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    quality = rng.uniform(0.4, 0.95, n)
+    # Prices cluster within an order of magnitude, so quality matters for the value rank
+    price = np.round(rng.lognormal(0.0, 0.6, n), 3)
+    rows = [{"provider": "Synthetic", "model_id": f"model-{i:04d}", "input": p, "output": p} for i, p in enumerate(price)]
+    return rows, quality, price
+
+
+def true_top_k(quality, price, k: int) -> set:
+    value = quality / (price + 0.0001)
+    return {f"model-{i:04d}" for i in np.argsort(-value)[:k]}
+
+
+def run_adaptive(rows, quality, k, budget, tasks, seed):
+    rng = np.random.default_rng(seed + 1)
+    sampler = AdaptiveSampler(rows, calls_per_pull=tasks, budget=budget, top_k=k, seed=seed, max_pulls=budget)
+    for batch in iter(sampler.next_batch, []):
+        for row in batch:
+            q = quality[int(row["model_id"].split("-")[1])]
+            sampler.update(row, list((rng.random(tasks) < q).astype(float)))
+        sampler.snapshot()
+    return {m for _, m in sampler.ranking()}, sampler
+
+
+def run_uniform(rows, quality, price, k, budget, tasks, seed):
+    rng = np.random.default_rng(seed + 1)
+    n = len(rows)
+    total = np.zeros(n)
+    count = np.zeros(n)
+    order = np.random.default_rng(seed).permutation(n)
+    for step in range(budget // tasks):
+        i = order[step % n]
+        total[i] += (rng.random(tasks) < quality[i]).sum()
+        count[i] += tasks
+    estimate = np.where(count > 0, total / np.maximum(count, 1), 0.5)
+    return true_top_k(estimate, price, k)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=6, help="Calls per pull (benchmark items per model).")
+    parser.add_argument("--budgets", default="600,1200,2400,4800")
+    parser.add_argument("--seeds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.models} models, top-{args.top_k}, {args.tasks} calls per pull, mean over {args.seeds} seeds")
+    print(f"{'budget':>7}  {'uniform recall':>14}  {'adaptive recall':>15}  {'stability':>9}  {'models pulled':>13}")
+    for budget in [int(b) for b in args.budgets.split(",")]:
+        uniform, adaptive, stability, pulled = [], [], [], []
+        for seed in range(args.seeds):
+            rows, quality, price = population(args.models, seed)
+            truth = true_top_k(quality, price, args.top_k)
+            uniform.append(len(run_uniform(rows, quality, price, args.top_k, budget, args.tasks, seed) & truth) / args.top_k)
+            picked, sampler = run_adaptive(rows, quality, args.top_k, budget, args.tasks, seed)
+            adaptive.append(len(picked & truth) / args.top_k)
+            stability.append(sampler.history[-1]["stability"] if sampler.history else 0.0)
+            pulled.append(int((sampler.pulls > 0).sum()))
+        print(f"{budget:>7}  {np.mean(uniform):>14.3f}  {np.mean(adaptive):>15.3f}  {np.mean(stability):>9.3f}  {np.mean(pulled):>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Catalog-scale stress suite. Generates synthetic catalogs and benchmark tables
+(aggregator-style: the same model listed by many providers) at each size and times
+the pipeline's post-processing stages, with peak Python/numpy heap from tracemalloc:
+
+    scout_postprocess   ProviderScout pricing + catalog Parquet write (and CSV export)
+    calculate_rankings  IntelligenceEngine merge, scores, Pareto columns, artifact write
+    detect_arbitrage    IntelligenceEngine.detect_arbitrage
+    feed_full           DaaSGenerator.generate_feed(incremental=False)
+    feed_incremental    DaaSGenerator.generate_feed() on a fresh output (hash + index + changelog)
+    prepare_parquet     DatasetPublisher.prepare_parquet
+
+Timing and memory come from separate calls (tracemalloc slows allocation-heavy code
+several-fold). Arrow buffers live outside tracemalloc, so memory is a lower bound
+for Arrow-heavy stages.
+
+    python benchmarks/catalog_scale.py --sizes 1000,10000,100000,1000000
+    python benchmarks/catalog_scale.py --baseline benchmarks/baselines/catalog_scale.json
+    python benchmarks/catalog_scale.py --write-baseline benchmarks/baselines/catalog_scale.json
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+from provider_tracker import ProviderScout
+from intelligence_engine import IntelligenceEngine
+from daas_feed import DaaSGenerator
+from dataset_publisher import DatasetPublisher
+from schema import write_frame
+
+ORGS = ["openai", "meta-llama", "qwen", "mistralai", "google", "deepseek", "anthropic", "nvidia", "microsoft", "x-ai"]
+FAMILIES = ["llama-3.1", "gpt-4o", "qwen-2.5", "mixtral", "gemma-2", "deepseek-v3", "phi-3", "claude-3", "grok", "nemotron"]
+VARIANTS = ["instruct", "chat", "base", "turbo", "mini", "flash"]
+
+
+def synthetic_tables(n: int, seed: int = 0, providers: int = 60, listings: int = 4):
+    """(raw scout rows, catalog, benchmarks) with n catalog rows; each model listed by ~`listings` providers."""
+    rng = np.random.default_rng(seed)
+    n_models = max(1, n // listings)
+    model_ids = np.array([
+        f"{ORGS[i % len(ORGS)]}/{FAMILIES[(i // 7) % len(FAMILIES)]}-{(i % 400) + 1}b-{VARIANTS[i % len(VARIANTS)]}-{i}"
+        for i in range(n_models)
+    ])
+    provider_names = np.array([f"Provider {p:03d}" for p in range(providers)])
+
+    # Every row is a distinct (provider, model_id) listing
+    idx = np.arange(n)
+    models = model_ids[idx % n_models]
+    provs = provider_names[(idx // n_models + idx * 7) % providers]
+    raw = pd.DataFrame({"provider": provs, "model_id": models, "created": 1700000000 + idx, "owned_by": "synthetic"})
+
+    price = np.round(rng.lognormal(-0.5, 1.2, n), 4)
+    catalog = raw.assign(input=price, output=np.round(price * rng.uniform(1.0, 4.0, n), 4), pricing_source="estimated")
+    bench = pd.DataFrame({
+        "model_id": models,
+        "provider": provs,
+        "Coding_score": np.round(rng.uniform(0.4, 0.99, n), 4),
+        "Math_score": np.round(rng.uniform(0.4, 0.99, n), 4),
+        "Reasoning_score": np.round(rng.uniform(0.4, 0.99, n), 4),
+        "avg_speed": np.round(rng.lognormal(4.3, 0.6, n), 2),
+    })
+    return raw, catalog, bench
+
+
+def measure(fn, memory: bool):
+    """Wall time of one call, then (optionally) peak heap from a second, traced call."""
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    peak = 0
+    if memory:
+        # Traced separately: tracemalloc slows allocation-heavy code several-fold
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {"seconds": round(seconds, 4), "peak_mb": round(peak / 2 ** 20, 2)}
+
+
+def run_size(n: int, memory: bool, seed: int) -> dict:
+    raw, catalog, bench = synthetic_tables(n, seed)
+    scout = ProviderScout(config_path=os.path.join(ROOT, "config", "providers.yaml"),
+                          pricing_path=os.path.join(ROOT, "config", "pricing.yaml"))
+    records = raw.to_dict('records')
+    workdir = tempfile.mkdtemp(prefix="modelradar-scale-")
+    cwd = os.getcwd()
+    stages = {}
+    try:
+        os.chdir(workdir)
+        os.makedirs("data")
+        write_frame(catalog, "data/provider_catalog.parquet")
+        write_frame(bench, "data/benchmark_results.parquet")
+        engine = IntelligenceEngine()
+
+        def scout_postprocess():
+            write_frame(scout._priced(records), "data/scout_catalog.parquet", csv_path="data/scout_catalog.csv")
+
+        stages["scout_postprocess"] = measure(scout_postprocess, memory)
+        stages["calculate_rankings"] = measure(engine.calculate_rankings, memory)
+        stages["detect_arbitrage"] = measure(engine.detect_arbitrage, memory)
+        stages["feed_full"] = measure(lambda: DaaSGenerator(output_path="data/full/live_intel.json", incremental=False).generate_feed(), memory)
+        fresh = iter(range(10))  # a new output dir per call so neither call is an unchanged no-op
+        stages["feed_incremental"] = measure(lambda: DaaSGenerator(output_path=f"data/inc{next(fresh)}/live_intel.json").generate_feed(), memory)
+        stages["prepare_parquet"] = measure(DatasetPublisher("data").prepare_parquet, memory)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return stages
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    problems = []
+    for size, stages in results.items():
+        for stage, m in stages.items():
+            base = baseline.get(size, {}).get(stage)
+            if not base:
+                continue
+            # Small absolute slack so millisecond stages don't flap
+            if m["seconds"] > base["seconds"] * (1 + tolerance) + 0.02:
+                problems.append(f"{size} {stage}: {m['seconds']}s > baseline {base['seconds']}s")
+            if base.get("peak_mb") and m["peak_mb"] > base["peak_mb"] * (1 + tolerance) + 1:
+                problems.append(f"{size} {stage}: {m['peak_mb']} MB > baseline {base['peak_mb']} MB")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (it slows allocation-heavy stages).")
+    parser.add_argument("--baseline")
+    parser.add_argument("--write-baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    args = parser.parse_args()
+
+    results = {}
+    for n in [int(s) for s in args.sizes.split(",")]:
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, "w")  # the stages print progress per call
+        try:
+            results[str(n)] = run_size(n, memory=not args.no_memory, seed=args.seed)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        for stage, m in results[str(n)].items():
+            print(f"{n:>9} rows  {stage:<20} {m['seconds']:9.3f}s  {m['peak_mb']:9.1f} MB")
+
+    if args.write_baseline:
+        os.makedirs(os.path.dirname(args.write_baseline) or ".", exist_ok=True)
+        with open(args.write_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.write_baseline}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare(results, json.load(f), args.tolerance)
+        for p in problems:
+            print(f"REGRESSION: {p}")
+        if problems:
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Cold-start cost of the pipeline entry points: the per-module scripts and the
+orchestrator (before) against the lazy `modelradar` CLI and in-process stages (after),
+plus the providers.yaml lookup per benchmark call. Stages run on a copy of config/ and
+the data/ exports in a temp dir, so the repo's data is untouched.
+
+    python benchmarks/cold_start.py --repeat 5
+"""
+import argparse
+import glob
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+SRC = os.path.join(ROOT, "src")
+sys.path.insert(0, SRC)
+
+
+def wall(cmd, cwd: str, repeat: int) -> float:
+    """Median wall time of a fresh interpreter running `cmd`."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=cwd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def in_process(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--lookups", type=int, default=200, help="Provider config lookups (one per benchmark call).")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="cold_start_")
+    try:
+        shutil.copytree(os.path.join(ROOT, "config"), os.path.join(workdir, "config"))
+        os.makedirs(os.path.join(workdir, "data"))
+        for path in glob.glob(os.path.join(ROOT, "data", "*.csv")) + glob.glob(os.path.join(ROOT, "data", "*.json")):
+            shutil.copy(path, os.path.join(workdir, "data"))
+        py = sys.executable
+        cli = [py, os.path.join(SRC, "modelradar.py")]
+        cases = [
+            ("--help", [py, os.path.join(SRC, "langgraph_orchestrator.py"), "--help"], cli + ["--help"]),
+            ("rank", [py, os.path.join(SRC, "intelligence_engine.py")], cli + ["rank"]),
+            ("feed", [py, os.path.join(SRC, "daas_feed.py")], cli + ["feed"]),
+        ]
+        print(f"{'fresh interpreter':<34} {'before (s)':>10} {'after (s)':>10}")
+        for label, before, after in cases:
+            print(f"{label:<34} {wall(before, workdir, args.repeat):>10.3f} {wall(after, workdir, args.repeat):>10.3f}")
+
+        # Dashboard button: one subprocess per stage (before) vs. run_stage in the already-running app (after)
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            import pandas  # noqa: F401  (the dashboard process has it loaded already)
+            start = time.perf_counter()
+            for stage in ("intelligence_engine.py", "daas_feed.py"):
+                subprocess.run([py, os.path.join(SRC, stage)], check=True, stdout=subprocess.DEVNULL)
+            subprocesses = time.perf_counter() - start
+
+            import contextlib
+            import io
+            from modelradar import run_stage
+
+            def rank_and_feed():
+                with contextlib.redirect_stdout(io.StringIO()):
+                    run_stage("rank")
+                    run_stage("feed")
+            first = in_process(rank_and_feed, 1)
+            warm = in_process(rank_and_feed, args.repeat)
+            print(f"{'rank+feed from the dashboard':<34} {subprocesses:>10.3f} {first:>10.3f}  (first call; {warm:.3f} warm)")
+
+            import yaml
+            from provider_config import ProvidersConfig
+
+            def reparse():
+                with open("config/providers.yaml") as f:
+                    conf = yaml.safe_load(f)
+                return next((p for p in conf['providers'] if p['name'] == "Groq"), None)
+            per_call_before = in_process(lambda: [reparse() for _ in range(args.lookups)], 1) / args.lookups
+            per_call_after = in_process(lambda: [ProvidersConfig.load().get("Groq") for _ in range(args.lookups)], 1) / args.lookups
+            print(f"{'provider config lookup (ms/call)':<34} {per_call_before * 1e3:>10.3f} {per_call_after * 1e3:>10.3f}")
+        finally:
+            os.chdir(cwd)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Load test for the local DaaS feed server. Starts src/feed_server.py in a subprocess
+pinned to one core (where the OS allows), then drives it from several client
+processes over keep-alive connections and reports requests/sec per scenario.
+
+    python benchmarks/feed_server_load.py --rankings data/model_rankings.csv --seconds 5
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(port, timeout=20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            return json.loads(conn.getresponse().read())
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("feed server did not start")
+
+
+def client(port, path, headers, seconds, out):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    done, statuses, deadline = 0, {}, time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        conn.request("GET", path, headers=headers)
+        resp = conn.getresponse()
+        resp.read()
+        statuses[resp.status] = statuses.get(resp.status, 0) + 1
+        done += 1
+    conn.close()
+    out.put((done, statuses))
+
+
+def run_scenario(port, path, headers, clients, seconds):
+    out = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=client, args=(port, path, headers, seconds, out)) for _ in range(clients)]
+    start = time.monotonic()
+    for p in procs:
+        p.start()
+    results = [out.get() for _ in procs]
+    for p in procs:
+        p.join()
+    elapsed = time.monotonic() - start
+    total = sum(r[0] for r in results)
+    statuses = {}
+    for _, s in results:
+        for k, v in s.items():
+            statuses[k] = statuses.get(k, 0) + v
+    return total / elapsed, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rankings", default=os.path.join(ROOT, "data", "model_rankings.arrow"))
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "src", "feed_server.py"), "--port", str(port), "--rankings", args.rankings],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(server.pid, {min(os.sched_getaffinity(0))})
+        health = wait_ready(port)
+        version = health["version"]
+
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request("GET", "/feed", headers={"Accept-Encoding": "gzip"})
+        resp = conn.getresponse()
+        gz_size, etag = len(resp.read()), resp.getheader("ETag")
+        conn.request("GET", "/feed")
+        resp = conn.getresponse()
+        raw_size = len(resp.read())
+        print(f"{health['models']} models, version {version}; /feed {raw_size} B raw, {gz_size} B gzip")
+
+        scenarios = [
+            ("full feed, gzip", "/feed", {"Accept-Encoding": "gzip"}),
+            ("conditional 304", "/feed", {"Accept-Encoding": "gzip", "If-None-Match": etag}),
+            ("filtered query", "/models?min_perf=0.5&max_cost=1", {"Accept-Encoding": "gzip"}),
+            ("provider query", "/models?provider=groq", {"Accept-Encoding": "gzip"}),
+            ("delta, unchanged", f"/delta?since={version}", {"Accept-Encoding": "gzip"}),
+        ]
+        for name, path, headers in scenarios:
+            rps, statuses = run_scenario(port, path, headers, args.clients, args.seconds)
+            print(f"{name:<18} {rps:9.0f} req/s  {statuses}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
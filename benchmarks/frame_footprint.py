@@ -0,0 +1,91 @@
+"""
+Load time, resident size and file size of the stage frames (catalog, benchmarks,
+rankings) in the legacy CSV exchange with inferred dtypes versus the Parquet/Arrow
+exchange with the dtypes from src/schema.py. Uses the synthetic tables from
+catalog_scale.py.
+
+    python benchmarks/frame_footprint.py --sizes 10000,100000,1000000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from catalog_scale import synthetic_tables
+from intelligence_engine import IntelligenceEngine
+import ranking_artifact
+from schema import footprint, widen, write_frame, read_frame
+
+
+def timed_load(fn, repeat: int = 3):
+    """Best of `repeat` loads, and the frame from the last one."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, df
+
+
+def load_artifact(path: str) -> pd.DataFrame:
+    ranking_artifact._CACHE.clear()  # measure the parse, not the cache hit
+    return ranking_artifact.load_rankings(path, csv_path=None)
+
+
+def run_size(n: int, seed: int):
+    _, catalog, bench = synthetic_tables(n, seed)
+    workdir = tempfile.mkdtemp(prefix="modelradar-frames-")
+    cwd = os.getcwd()
+    rows = []
+    try:
+        os.chdir(workdir)
+        os.makedirs("data")
+        write_frame(catalog, "data/provider_catalog.parquet", csv_path="data/provider_catalog.csv")
+        write_frame(bench, "data/benchmark_results.parquet", csv_path="data/benchmark_results.csv")
+        stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+        try:
+            IntelligenceEngine().calculate_rankings()
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+
+        pairs = [
+            ("catalog", "data/provider_catalog.csv", "data/provider_catalog.parquet", read_frame),
+            ("benchmarks", "data/benchmark_results.csv", "data/benchmark_results.parquet", read_frame),
+            ("rankings", "data/model_rankings.csv", "data/model_rankings.arrow", load_artifact),
+        ]
+        for frame, csv_path, compact_path, loader in pairs:
+            before_s, before = timed_load(lambda: pd.read_csv(csv_path))
+            after_s, after = timed_load(lambda: loader(compact_path))
+            rows.append((frame, "csv", before_s, footprint(before)["mb"], os.path.getsize(csv_path) / 2 ** 20))
+            rows.append((frame, os.path.splitext(compact_path)[1][1:], after_s, footprint(after)["mb"],
+                         os.path.getsize(compact_path) / 2 ** 20))
+        # What the JSON feed and history snapshots convert back to
+        rows.append(("rankings", "widened", 0.0, footprint(widen(after))["mb"], 0.0))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'rows':>9}  {'frame':<11} {'format':<8} {'load s':>8} {'memory MB':>10} {'file MB':>8}")
+    for n in [int(s) for s in args.sizes.split(",")]:
+        for frame, fmt, seconds, mb, disk in run_size(n, args.seed):
+            print(f"{n:>9}  {frame:<11} {fmt:<8} {seconds:8.3f} {mb:10.1f} {disk:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Query latency of IntelHistory over a synthetic multi-year set of daily snapshots,
+optionally after DatasetPublisher.compact_history rolls them into monthly partitions.
+
+    python benchmarks/history_queries.py --days 1095 --models 1000 --compact
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from history import IntelHistory
+from dataset_publisher import DatasetPublisher
+
+
+def write_history(data_dir, days, models, seed=0):
+    rng = np.random.default_rng(seed)
+    model_ids = np.array([f"org{i % 40}/model-{i}" for i in range(models)])
+    providers = np.array([f"Provider{i % 25}" for i in range(models)])
+    cost = rng.uniform(0.05, 10.0, models)
+    perf = rng.uniform(0.5, 0.99, models)
+    speed = rng.uniform(20, 800, models)
+    first = date.today() - timedelta(days=days)
+    for d in range(days):
+        # Occasional repricing; each model is re-benchmarked about weekly
+        cost = np.where(rng.random(models) < 0.01, cost * rng.uniform(0.5, 1.2, models), cost)
+        rebench = rng.random(models) < 1 / 7
+        perf = np.where(rebench, np.clip(perf + rng.normal(0, 0.01, models), 0, 1), perf)
+        speed = np.where(rebench, speed * rng.uniform(0.9, 1.1, models), speed)
+        table = pa.table({
+            "model_id": model_ids,
+            "provider": providers,
+            "avg_speed": speed,
+            "input": cost * 0.8,
+            "output": cost * 1.2,
+            "avg_perf": perf,
+            "avg_cost": cost,
+            "value_score": perf / (cost + 0.0001),
+        })
+        pq.write_table(table, os.path.join(data_dir, f"model_intel_{first + timedelta(days=d)}.parquet"))
+    return first, first + timedelta(days=days - 1)
+
+
+def timed(label, fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1e3:9.1f} ms  ({len(out)} rows)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=1095)
+    parser.add_argument("--models", type=int, default=1000)
+    parser.add_argument("--compact", action="store_true", help="compact into monthly partitions before querying")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="history_bench_")
+    try:
+        start = time.perf_counter()
+        first, last = write_history(data_dir, args.days, args.models)
+        print(f"wrote {args.days} snapshots x {args.models} models in {time.perf_counter() - start:.1f}s")
+        if args.compact:
+            start = time.perf_counter()
+            written = DatasetPublisher(data_dir).compact_history(include_current_month=True, remove_daily=True)
+            print(f"compacted into {len(written)} monthly partitions in {time.perf_counter() - start:.1f}s")
+        print()
+
+        history = IntelHistory(data_dir)
+        timed("list snapshot dates (cold)", history.snapshot_dates, repeat=1)
+        timed("trajectory, full history", lambda: history.trajectory("org7/model-7"))
+        timed("trajectory, last 90 days", lambda: history.trajectory("org7/model-7", start=last - timedelta(days=90)))
+        timed("price drops, last 30 days", lambda: history.price_drops(start=last - timedelta(days=30)))
+        timed("price drops, full history", lambda: history.price_drops(), repeat=1)
+        timed("rank changes, last 365 days", lambda: history.rank_changes(start=last - timedelta(days=365)))
+    finally:
+        shutil.rmtree(data_dir)
+
+
+if __name__ == "__main__":
+    main()
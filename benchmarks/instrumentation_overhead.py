@@ -0,0 +1,77 @@
+"""
+Per-call cost of the instrumentation hooks with metrics disabled (the default) and
+enabled, against an empty loop. Disabled hooks should cost well under a microsecond.
+
+    python benchmarks/instrumentation_overhead.py --calls 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+from instrumentation import METRICS, span, count, record_http, timed
+
+
+@timed("bench.fn")
+def decorated():
+    pass
+
+
+def plain():
+    pass
+
+
+def per_call(fn, n):
+    start = time.perf_counter()
+    fn(n)
+    return (time.perf_counter() - start) / n * 1e9
+
+
+def loop_empty(n):
+    for _ in range(n):
+        plain()
+
+
+def loop_span(n):
+    for _ in range(n):
+        with span("bench.span", provider="p"):
+            pass
+
+
+def loop_count(n):
+    for _ in range(n):
+        count("bench_total", provider="p")
+
+
+def loop_http(n):
+    for _ in range(n):
+        record_http("bench", "p", 200, 0.123, 512)
+
+
+def loop_timed(n):
+    for _ in range(n):
+        decorated()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=1000000)
+    args = parser.parse_args()
+    n = args.calls
+
+    baseline = per_call(loop_empty, n)
+    print(f"{'hook':<14} {'disabled':>12} {'enabled':>12}   (ns/call over an empty function call, {baseline:.0f} ns)")
+    for name, fn in [("span", loop_span), ("count", loop_count), ("record_http", loop_http), ("@timed", loop_timed)]:
+        METRICS.enable(False)
+        off = per_call(fn, n) - baseline
+        METRICS.enable(True)
+        METRICS.reset()
+        on = per_call(fn, n) - baseline
+        print(f"{name:<14} {off:12.0f} {on:12.0f}")
+    METRICS.enable(False)
+
+
+if __name__ == "__main__":
+    main()
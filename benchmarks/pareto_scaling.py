@@ -0,0 +1,47 @@
+"""
+Scaling of the Pareto helpers in intelligence_engine on random model/provider rows.
+
+    python benchmarks/pareto_scaling.py --rows 1000 10000 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from intelligence_engine import IntelligenceEngine, dominance_counts_2d, pareto_front_2d, pareto_front_3d
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    engine = IntelligenceEngine()
+    print(f"{'rows':>8} {'front 2-D':>10} {'front 3-D':>10} {'dominance':>10} {'all columns':>12}  (ms)")
+    for n in args.rows:
+        df = pd.DataFrame({
+            "avg_perf": rng.uniform(0.4, 1.0, n).round(3),
+            "avg_cost": rng.lognormal(0, 1, n).round(3),
+            "avg_speed": rng.uniform(10, 1000, n).round(1),
+            "latency_p90": rng.uniform(0.1, 5, n).round(2),
+            "Coding_score": rng.uniform(0.4, 1.0, n),
+        })
+        pts = np.column_stack([-df["avg_perf"], df["avg_cost"], -df["avg_speed"]]).astype(float)
+        print(f"{n:>8} {timed(pareto_front_2d, pts[:, :2]):>10.1f} {timed(pareto_front_3d, pts):>10.1f} "
+              f"{timed(dominance_counts_2d, pts[:, :2]):>10.1f} {timed(engine.add_pareto_columns, df):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
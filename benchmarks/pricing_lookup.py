@@ -0,0 +1,83 @@
+"""
+Per-lookup cost of pricing a synthetic 10k-model catalog: the old linear substring
+scan (dict rebuilt per call, first-match wins) vs. the compiled PricingIndex.
+--extra-keys grows the pricing table to show how each approach scales with it.
+
+    python benchmarks/pricing_lookup.py --models 10000 --extra-keys 1000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+from pricing_index import PricingIndex, _INDEX_CACHE
+
+
+def legacy_lookup(model_id, table):
+    pricing_data = {k: dict(v) for k, v in table.items()}  # the old code rebuilt its dict on every call
+    for key in pricing_data:
+        if key.lower() in model_id.lower():
+            return pricing_data[key]
+    rng = random.Random(model_id)
+    base_price = rng.uniform(0.1, 5.0)
+    return {"input": round(base_price, 2), "output": round(base_price * 1.5, 2)}
+
+
+def synthetic_catalog(n, keys, seed=0):
+    rng = random.Random(seed)
+    orgs = ["openai", "meta-llama", "qwen", "mistralai", "google", "deepseek", "acme", "nvidia"]
+    ids = []
+    for i in range(n):
+        if rng.random() < 0.6:
+            base = rng.choice(keys)
+        else:
+            base = f"model-{rng.randrange(10 ** 6):06d}-{rng.choice(['instruct', 'chat', 'base'])}"
+        ids.append(f"{rng.choice(orgs)}/{base}{rng.choice(['', ':free', '-2024-08', '-v2'])}")
+    return ids
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", type=int, default=10000)
+    parser.add_argument("--extra-keys", type=int, default=0)
+    args = parser.parse_args()
+
+    base = PricingIndex.load(os.path.join(ROOT, "config", "pricing.yaml"))
+    table = {k: {"input": v[0], "output": v[1]} for k, v in base.prices.items()}
+    rng = random.Random(1)
+    for i in range(args.extra_keys):
+        table[f"vendor{i}-model-{rng.randrange(10 ** 6)}"] = {"input": 1.0, "output": 2.0}
+
+    start = time.perf_counter()
+    index = PricingIndex(table)
+    build = time.perf_counter() - start
+    ids = synthetic_catalog(args.models, list(table))
+
+    start = time.perf_counter()
+    for m in ids:
+        legacy_lookup(m, table)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for m in ids:
+        index.lookup(m)
+    scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frame = index.lookup_many(ids)
+    vectorized = time.perf_counter() - start
+
+    n = len(ids)
+    print(f"index build: {build * 1e3:.2f} ms ({len(table)} keys)")
+    print(f"legacy scan:       {legacy / n * 1e6:8.2f} us/lookup")
+    print(f"index.lookup:      {scalar / n * 1e6:8.2f} us/lookup")
+    print(f"index.lookup_many: {vectorized / n * 1e6:8.2f} us/lookup")
+    print(frame['pricing_source'].value_counts().to_string())
+    _INDEX_CACHE.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Dataset publishing against a local FakeHub: a first full publish of a synthetic
+history, then a day's delta, a no-op rerun and a delta over a flaky hub (dropped
+chunk uploads that resume). Publish time should follow the delta, not the history.
+
+    python benchmarks/publish_delta.py --months 24 --file-mb 4 --fail-rate 0.3
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from dataset_publisher import DatasetPublisher
+from fake_hub import FakeHub
+from history import HISTORY_DIR, MANIFEST_NAME
+from hub_client import HttpHub
+
+REPO = "bench/model-radar-intelligence"
+
+
+def write(path: str, size: int, rng):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(rng.bytes(size))
+
+
+def run(publisher: DatasetPublisher, hub: FakeHub, label: str, **kwargs):
+    before = dict(hub.stats)
+    start = time.perf_counter()
+    stats = publisher.publish(REPO, hub=HttpHub(hub.endpoint, REPO), backoff_base=0.01, **kwargs)
+    elapsed = time.perf_counter() - start
+    received = hub.stats["bytes_received"] - before["bytes_received"]
+    print(f"{label:<22} {elapsed:>8.2f} {stats['uploaded']:>9} {stats['unchanged']:>10} {stats['deleted']:>8} "
+          f"{received / 1e6:>10.1f} {stats['retries']:>8} {hub.stats['resumes'] - before['resumes']:>8}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--days", type=int, default=20, help="Daily snapshots in the current month.")
+    parser.add_argument("--file-mb", type=float, default=4.0, help="Size of each monthly partition.")
+    parser.add_argument("--daily-kb", type=float, default=200.0)
+    parser.add_argument("--fail-rate", type=float, default=0.3)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--chunk-kb", type=int, default=512)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    data_dir = tempfile.mkdtemp(prefix="publish_bench_")
+    hub = FakeHub().start()
+    try:
+        for m in range(args.months):
+            year, month = 2024 + m // 12, m % 12 + 1
+            write(os.path.join(data_dir, HISTORY_DIR, f"year={year}", f"month={month:02d}", "part-0.parquet"),
+                  int(args.file_mb * 1e6), rng)
+        write(os.path.join(data_dir, HISTORY_DIR, MANIFEST_NAME), 2000, rng)
+        for d in range(1, args.days + 1):
+            write(os.path.join(data_dir, f"model_intel_2026-03-{d:02d}.parquet"), int(args.daily_kb * 1e3), rng)
+
+        publisher = DatasetPublisher(data_dir)
+        common = {"concurrency": args.concurrency, "chunk_size": args.chunk_kb * 1024}
+        print(f"{args.months} monthly partitions of {args.file_mb} MB, {args.days} daily snapshots of {args.daily_kb} kB")
+        print(f"{'run':<22} {'seconds':>8} {'uploaded':>9} {'unchanged':>10} {'deleted':>8} {'MB sent':>10} {'retries':>8} {'resumes':>8}")
+        run(publisher, hub, "full history", **common)
+        write(os.path.join(data_dir, f"model_intel_2026-03-{args.days + 1:02d}.parquet"), int(args.daily_kb * 1e3), rng)
+        run(publisher, hub, "one new day", **common)
+        run(publisher, hub, "no change", **common)
+
+        # Month end: the month's dailies roll into a new partition and are removed locally
+        hub.fail_rate = args.fail_rate
+        write(os.path.join(data_dir, HISTORY_DIR, "year=2026", "month=03", "part-0.parquet"), int(args.file_mb * 1e6), rng)
+        for d in range(1, args.days + 2):
+            os.remove(os.path.join(data_dir, f"model_intel_2026-03-{d:02d}.parquet"))
+        run(publisher, hub, f"month roll, {args.fail_rate:.0%} drops", delete_missing=True, **common)
+        hub.fail_rate = 0.0
+
+        local = DatasetPublisher(data_dir).local_files()
+        remote = hub.files(REPO)
+        mismatched = [p for p, f in local.items() if remote.get(p) != f["sha256"]]
+        stale = sorted(set(remote) - set(local) - {"_publish_manifest.json"})
+        print(f"remote matches local: {not mismatched and not stale} ({len(mismatched)} mismatched, {len(stale)} stale)")
+    finally:
+        hub.stop(remove=True)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Replay time of RoutingSimulator (all policies plus a fixed baseline) against a random
+ranking table, by trace size and candidate count.
+
+    python benchmarks/routing_replay.py --requests 100000 1000000 --candidates 20
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from routing_simulator import POLICIES, RoutingSimulator, synthetic_trace
+
+
+def rankings(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    price = rng.lognormal(0, 1, n).round(3)
+    perf = rng.uniform(0.4, 0.95, n)
+    df = pd.DataFrame({
+        "provider": "Synthetic",
+        "model_id": [f"model-{i:04d}" for i in range(n)],
+        "input": price,
+        "output": price * 3,
+        "avg_perf": perf,
+        "avg_speed": rng.uniform(20, 500, n),
+        "avg_ttft": rng.uniform(0.1, 1.5, n),
+        "ttft_ctx_short": rng.uniform(0.1, 0.8, n),
+        "ttft_ctx_4k": rng.uniform(0.5, 2.0, n),
+        "ttft_ctx_32k": rng.uniform(2.0, 8.0, n),
+        "Coding_score": np.clip(perf + rng.normal(0, 0.05, n), 0, 1),
+        "Math_score": np.clip(perf + rng.normal(0, 0.05, n), 0, 1),
+    })
+    df["avg_cost"] = (df["input"] + df["output"]) / 2
+    df["value_score"] = df["avg_perf"] / (df["avg_cost"] + 0.0001)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--candidates", type=int, nargs="+", default=[10, 20, 50])
+    parser.add_argument("--models", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    table = rankings(args.models, args.seed)
+    policies = list(POLICIES) + [f"fixed:{table['model_id'].iloc[0]}"]
+    print(f"{'requests':>9} {'candidates':>10} {'replay (s)':>10} {'requests/s':>12}")
+    for n in args.requests:
+        trace = synthetic_trace(n, seed=args.seed)
+        for m in args.candidates:
+            sim = RoutingSimulator(table, max_candidates=m, seed=args.seed)
+            start = time.perf_counter()
+            sim.replay(trace, policies)
+            elapsed = time.perf_counter() - start
+            print(f"{n:>9} {len(sim.models):>10} {elapsed:>10.2f} {n / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Scan-time benchmark for ProviderScout against a local stub of ~100 providers.
+
+Each stub provider answers /models after its own delay; a few never answer in time.
+A concurrent scan should take roughly as long as the slowest host (capped by the
+per-host timeout), while a serial scan takes the sum of all of them.
+
+    python benchmarks/scan_concurrency.py --providers 100 --serial
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from provider_tracker import ProviderScout
+
+
+def make_handler(delays):
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            # Path looks like /p17/models
+            idx = int(self.path.split("/")[1][1:])
+            time.sleep(delays[idx])
+            body = json.dumps({"data": [{"id": f"stub-model-{idx}-{j}", "owned_by": "stub"} for j in range(5)]}).encode()
+            try:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, *args):
+            pass
+    return StubHandler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--providers", type=int, default=100)
+    parser.add_argument("--max-delay", type=float, default=0.3)
+    parser.add_argument("--dead", type=int, default=3, help="providers that hang past the host timeout")
+    parser.add_argument("--host-timeout", type=float, default=1.0)
+    parser.add_argument("--serial", action="store_true", help="also time the serial scan")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    delays = [rng.uniform(0.01, args.max_delay) for _ in range(args.providers)]
+    for idx in rng.sample(range(args.providers), min(args.dead, args.providers)):
+        delays[idx] = args.host_timeout * 3
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(delays))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    workdir = tempfile.mkdtemp(prefix="scan_bench_")
+    config_path = os.path.join(workdir, "providers.yaml")
+    with open(config_path, "w") as f:
+        yaml.safe_dump({"providers": [
+            {"name": f"Stub{i}", "api_base": f"{base}/p{i}", "models_suggested": ["fallback"]}
+            for i in range(args.providers)
+        ]}, f)
+
+    pricing_path = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "config", "pricing.yaml"))
+    os.chdir(workdir)
+    # The stubs share one address but stand in for separate hosts, so don't cap connections per host
+    scout = ProviderScout(config_path, pricing_path=pricing_path, max_workers=args.providers,
+                          max_per_host=args.providers, host_timeout=args.host_timeout,
+                          scan_deadline=args.host_timeout * 2)
+
+    modes = [True, False] if args.serial else [True]
+    timings = {}
+    for concurrent in modes:
+        start = time.perf_counter()
+        df = scout.run_scan(concurrent=concurrent)
+        timings["concurrent" if concurrent else "serial"] = (time.perf_counter() - start, len(df))
+
+    slowest = min(max(delays), args.host_timeout)
+    print(f"\nslowest host (capped at timeout): {slowest:.2f}s, sum of hosts: {sum(min(d, args.host_timeout) for d in delays):.2f}s")
+    for mode, (elapsed, rows) in timings.items():
+        print(f"{mode:>10}: {elapsed:.2f}s, {rows} catalog rows")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
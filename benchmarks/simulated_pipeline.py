@@ -0,0 +1,148 @@
+"""
+Offline pipeline benchmark: scout -> benchmark -> rank against the local provider
+simulator (config/simulator.yaml), inside a scratch directory. Reports stage times,
+scheduler throughput and the simulator's request/429/500 counts.
+
+The simulator is seeded, so request outcomes are reproducible; with --baseline the
+run fails (exit 1) when a stage is slower, or throughput lower, than the baseline
+by more than --tolerance, or when the deterministic counts differ.
+
+    python benchmarks/simulated_pipeline.py --streaming --trials 3
+    python benchmarks/simulated_pipeline.py --baseline benchmarks/baselines/simulated_pipeline.json
+    python benchmarks/simulated_pipeline.py --write-baseline benchmarks/baselines/simulated_pipeline.json
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import yaml
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+from provider_simulator import ProviderSimulator
+from provider_tracker import ProviderScout
+from auto_benchmarker import AutoBenchmarker
+from intelligence_engine import IntelligenceEngine
+from task_registry import SUITES
+
+# Lower is better for these; higher for the rest of TIMED_KEYS.
+DURATION_KEYS = ["scan_seconds", "benchmark_seconds", "rank_seconds"]
+THROUGHPUT_KEYS = ["requests_per_sec"]
+EXACT_KEYS = ["models", "rate_limited", "server_errors", "simulator_requests", "score_sum"]
+
+
+def run(args) -> dict:
+    sim = ProviderSimulator(config_path=os.path.join(ROOT, args.config), seed=args.seed,
+                            tasks_dir=os.path.join(ROOT, "config", "tasks")).start()
+    workdir = tempfile.mkdtemp(prefix="modelradar-sim-")
+    cwd = os.getcwd()
+    try:
+        os.makedirs(os.path.join(workdir, "config"))
+        os.makedirs(os.path.join(workdir, "data"))
+        with open(os.path.join(workdir, "config", "providers.yaml"), "w") as f:
+            yaml.safe_dump(sim.providers_yaml(), f)
+        shutil.copy(os.path.join(ROOT, "config", "pricing.yaml"), os.path.join(workdir, "config", "pricing.yaml"))
+        shutil.copytree(os.path.join(ROOT, "config", "tasks"), os.path.join(workdir, "config", "tasks"))
+        for provider in sim.config["providers"]:
+            os.environ[f"{provider['name'].upper().replace(' ', '_')}_API_KEY"] = "sim"
+        os.chdir(workdir)
+
+        start = time.perf_counter()
+        catalog = ProviderScout().run_scan()
+        scan_seconds = time.perf_counter() - start
+
+        benchmarker = AutoBenchmarker(seed=args.seed)
+        start = time.perf_counter()
+        results = benchmarker.benchmark_all(real=True, streaming=args.streaming, trials=args.trials,
+                                            warmup=args.warmup, ci_rel_width=None, suite=args.suite,
+                                            budget=args.budget, top_k=args.top_k)
+        benchmark_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rankings = IntelligenceEngine().calculate_rankings()
+        rank_seconds = time.perf_counter() - start
+
+        stats = benchmarker.last_run_stats or {}
+        score_cols = [c for c in results.columns if c.endswith("_score")]
+        return {
+            "config": {"seed": args.seed, "streaming": args.streaming, "trials": args.trials, "warmup": args.warmup,
+                       "suite": args.suite, "budget": args.budget, "top_k": args.top_k},
+            "models": int(len(catalog)),
+            "ranked": int(len(rankings)) if rankings is not None else 0,
+            "scan_seconds": round(scan_seconds, 3),
+            "benchmark_seconds": round(benchmark_seconds, 3),
+            "rank_seconds": round(rank_seconds, 3),
+            "calls": stats.get("calls", 0),
+            "retries": stats.get("retries", 0),
+            "failed": stats.get("failed", 0),
+            "requests_per_sec": stats.get("requests_per_sec", 0.0),
+            "simulator_requests": sim.stats["requests"],
+            "rate_limited": sim.stats["rate_limited"],
+            "server_errors": sim.stats["errors"],
+            "score_sum": round(float(results[score_cols].sum().sum()), 4),
+            # Mean over models of the per-tier throughput columns (informational)
+            "tier_curves": {c: round(float(results[c].mean()), 3) for c in results.columns
+                            if c.startswith(("tps_ctx_", "tps_out_", "ttft_ctx_"))},
+            "sampling": {k: v for k, v in (benchmarker.last_sampling_report or {}).items() if k != "pulls"},
+        }
+    finally:
+        os.chdir(cwd)
+        sim.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list:
+    problems = []
+    if result["config"] != baseline.get("config"):
+        problems.append(f"config {result['config']} differs from baseline {baseline.get('config')}")
+    for key in DURATION_KEYS:
+        if key in baseline and result[key] > baseline[key] * (1 + tolerance) + 0.05:
+            problems.append(f"{key}: {result[key]} > baseline {baseline[key]} (+{tolerance:.0%})")
+    for key in THROUGHPUT_KEYS:
+        if key in baseline and result[key] < baseline[key] * (1 - tolerance):
+            problems.append(f"{key}: {result[key]} < baseline {baseline[key]} (-{tolerance:.0%})")
+    for key in EXACT_KEYS:
+        if key in baseline and result[key] != baseline[key]:
+            problems.append(f"{key}: {result[key]} != baseline {baseline[key]}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", default="config/simulator.yaml")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--streaming", action="store_true")
+    parser.add_argument("--trials", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=0)
+    parser.add_argument("--suite", choices=sorted(SUITES), default="daily")
+    parser.add_argument("--budget", type=int, help="Adaptive sampling call budget instead of fixed trials per model.")
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--baseline", help="Fail if this run regresses against the JSON baseline.")
+    parser.add_argument("--write-baseline", help="Save this run as the baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    result = run(args)
+    print(json.dumps(result, indent=2))
+
+    if args.write_baseline:
+        os.makedirs(os.path.dirname(args.write_baseline) or ".", exist_ok=True)
+        with open(args.write_baseline, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Baseline written to {args.write_baseline}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare(result, json.load(f), args.tolerance)
+        for p in problems:
+            print(f"REGRESSION: {p}")
+        if problems:
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Check AutoBenchmarker's streaming measurements against a local fake SSE server
+with known timing: first token after --ttft seconds, then one token every --itl seconds.
+
+    python benchmarks/streaming_fake_sse.py --ttft 0.2 --itl 0.02 --tokens 50
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from auto_benchmarker import AutoBenchmarker
+
+
+def make_handler(ttft, itl, tokens):
+    class SSEHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _chunk(self, payload):
+            data = f"data: {payload}\n\n".encode()
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            time.sleep(ttft)
+            for i in range(tokens):
+                if i:
+                    time.sleep(itl)
+                self._chunk(json.dumps({"choices": [{"index": 0, "delta": {"content": f"tok{i} "}}]}))
+            self._chunk(json.dumps({"choices": [], "usage": {"prompt_tokens": 12, "completion_tokens": tokens}}))
+            self._chunk("[DONE]")
+            self.wfile.write(b"0\r\n\r\n")
+
+        def log_message(self, *args):
+            pass
+    return SSEHandler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ttft", type=float, default=0.2)
+    parser.add_argument("--itl", type=float, default=0.02)
+    parser.add_argument("--tokens", type=int, default=50)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.ttft, args.itl, args.tokens))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    os.environ["FAKESSE_API_KEY"] = "test"
+    bench = AutoBenchmarker(catalog_path="/nonexistent/catalog.csv")
+    bench.get_provider_config = lambda name: {"name": name, "api_base": f"http://127.0.0.1:{server.server_address[1]}"}
+    res = bench.execute_streaming_benchmark("FakeSSE", "fake-model", "hello")
+    server.shutdown()
+
+    expected = {"ttft": args.ttft, "itl_p50": args.itl, "decode_tps": 1 / args.itl,
+                "latency": args.ttft + args.itl * (args.tokens - 1)}
+    for key, want in expected.items():
+        print(f"{key:>10}: measured {res[key]:.4f}  expected ~{want:.4f}")
+    print(f"{'itl_p99':>10}: measured {res['itl_p99']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 import streamlit as st
 import pandas as pd
 import os
+import sys
+
+# Pipeline modules import each other by bare name, as when run from src/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+from ranking_artifact import load_rankings
 
 st.set_page_config(page_title="ModelRadar AI War Room", layout="wide")
 
@@ -8,26 +13,35 @@ st.title("🚀 ModelRadar AI v2.0: Live LLM Intelligence")
 st.markdown("Automated benchmarks, pricing tracking, and arbitrage alerts.")
 
 # Sidebar for controls
-if st.sidebar.button("Run Daily Scan (Manual)"):
-    st.sidebar.info("Triggering LangGraph pipeline...")
-    import subprocess
-    import sys
+def run_in_process(stage: str, **kwargs):
+    """Run a pipeline stage inside the dashboard process (no new interpreter) and show its log."""
+    import io
+    import contextlib
+    from modelradar import run_stage
+    log = io.StringIO()
     try:
-        # Use sys.executable to ensure we use the same environment where requirements are installed
-        result = subprocess.run([sys.executable, "src/langgraph_orchestrator.py"], capture_output=True, text=True)
-        st.sidebar.expander("Orchestrator Logs").code(result.stdout + "\n" + result.stderr)
-        
-        result2 = subprocess.run([sys.executable, "src/daas_feed.py"], capture_output=True, text=True)
-        st.sidebar.expander("DaaS Logs").code(result2.stdout + "\n" + result2.stderr)
-        
-        st.sidebar.success("Pipeline complete!")
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            run_stage(stage, **kwargs)
+        st.sidebar.success(f"{stage} complete!")
         st.cache_data.clear() # Force reload
     except Exception as e:
         st.sidebar.error(f"Failed: {e}")
+    st.sidebar.expander("Pipeline Logs").code(log.getvalue())
+
+if st.sidebar.button("Run Daily Scan (Manual)"):
+    st.sidebar.info("Running the LangGraph pipeline...")
+    # Feed generation is a pipeline node; publishing stays with the scheduled workflow
+    run_in_process("all", publish=False)
+
+if st.sidebar.button("Re-rank and Refresh Feed"):
+    run_in_process("rank")
+    run_in_process("feed")
 
 if st.sidebar.button("⚠️ Force Clean Reset"):
+    if os.path.exists("data/provider_catalog.parquet"): os.remove("data/provider_catalog.parquet")
     if os.path.exists("data/provider_catalog.csv"): os.remove("data/provider_catalog.csv")
     if os.path.exists("data/model_rankings.csv"): os.remove("data/model_rankings.csv")
+    if os.path.exists("data/model_rankings.arrow"): os.remove("data/model_rankings.arrow")
     st.sidebar.warning("Deleted old CSVs. Run Scan now.")
 
 with st.sidebar.expander("🔍 Debug: View Source"):
@@ -36,14 +50,11 @@ with st.sidebar.expander("🔍 Debug: View Source"):
             st.code(f.read(), language="python")
 
 # Main Tabs
-tab1, tab2 = st.tabs(["📊 Market Radar", "🔌 Developer API (DaaS)"])
+tab1, tab2, tab3 = st.tabs(["📊 Market Radar", "🔌 Developer API (DaaS)", "🧭 Routing Simulator"])
 
-# Load Data
+# Load Data (parsed once per rankings file version, shared with the engine)
 def load_data():
-    rankings_path = "data/model_rankings.csv"
-    if os.path.exists(rankings_path):
-        return pd.read_csv(rankings_path)
-    return None
+    return load_rankings()
 
 with tab1:
     df = load_data()
@@ -96,7 +107,7 @@ with tab1:
         colA, colB = st.columns(2)
         
         # Logic to get arbitrage from engine (simulated if no live engine)
-        from src.intelligence_engine import IntelligenceEngine
+        from intelligence_engine import IntelligenceEngine
         engine = IntelligenceEngine()
         deals = engine.detect_arbitrage()
         
@@ -120,17 +131,8 @@ with tab1:
             else:
                 st.info("Monitoring network latency...")
 
-        # ROI Calculator
         st.divider()
-        st.subheader("🧮 Potential Monthly Savings")
-        monthly_tokens = st.slider("Monthly Token Volume (Millions)", 1, 1000, 10)
-        
-        # Compare vs GPT-4o standard ($5/M avg)
-        standard_cost = monthly_tokens * 5.0
-        best_value_cost = monthly_tokens * df['avg_cost'].min()
-        savings = standard_cost - best_value_cost
-        
-        st.metric("Estimated Savings vs. Market Leader", f"${savings:,.2f}", f"{(savings/standard_cost)*100:.1f}% Reduction")
+        st.caption("🧮 Savings for your own workload (cost, quality and latency SLO per routing policy): see the Routing Simulator tab.")
 
     else:
         st.warning("No data found. Please run the pipeline first.")
@@ -160,3 +162,54 @@ print(f"Optimizing for: {best_model}")
     
     st.info("💡 **Commercial License Required**: Contact @ModelRadar_Admin on Telegram for API keys and Pro access.")
     st.button("Request Enterprise Access Token")
+
+with tab3:
+    st.header("🧭 Routing Simulator")
+    st.markdown("Replay a workload against today's rankings: cost, expected quality and latency-SLO attainment per routing policy.")
+    df = load_data()
+    if df is not None:
+        from routing_simulator import POLICIES, RoutingSimulator, synthetic_trace, DEFAULT_TASK_MIX
+
+        col1, col2, col3 = st.columns(3)
+        n_requests = col1.number_input("Requests in trace", 1000, 5_000_000, 100_000, step=10_000)
+        mean_input = col2.number_input("Mean input tokens", 10, 100_000, 1500)
+        mean_output = col3.number_input("Mean output tokens", 10, 8_000, 300)
+        slo_s = col1.slider("Latency SLO (seconds)", 0.5, 30.0, 5.0, 0.5)
+        profile = col2.selectbox("Pareto-weighted profile", ["balanced", "coding", "math", "reasoning", "realtime"])
+        baseline = col3.selectbox("Baseline model (always routed to)", df.sort_values('avg_perf', ascending=False)['model_id'].astype(str).unique())
+        with st.expander("Task mix"):
+            mix = {task: st.slider(task, 0.0, 1.0, share, 0.05) for task, share in DEFAULT_TASK_MIX.items()}
+        uploaded = st.file_uploader("Or upload a trace (CSV: task, input_tokens, output_tokens[, slo_s])", type="csv")
+
+        if st.button("Run simulation"):
+            if uploaded is not None:
+                trace = pd.read_csv(uploaded)
+            elif sum(mix.values()) > 0:
+                trace = synthetic_trace(int(n_requests), mix, mean_input, mean_output, slo_s)
+            else:
+                st.error("Give at least one task a non-zero share.")
+                st.stop()
+            sim = RoutingSimulator(df, profile=profile)
+            with st.spinner(f"Replaying {len(trace):,} requests..."):
+                results = sim.replay(trace, list(POLICIES) + [f"fixed:{baseline}"],
+                                     slo_s=None if 'slo_s' in trace.columns else slo_s)
+            base_cost = results['total_cost'].iloc[-1]
+            results['savings_vs_baseline'] = base_cost - results['total_cost']
+            st.dataframe(
+                results,
+                column_config={
+                    "total_cost": st.column_config.NumberColumn("Total cost", format="$%.2f"),
+                    "cost_per_1k": st.column_config.NumberColumn("Cost / 1k requests", format="$%.4f"),
+                    "savings_vs_baseline": st.column_config.NumberColumn("Savings vs. baseline", format="$%.2f"),
+                    "slo_attainment": st.column_config.ProgressColumn("SLO attainment", min_value=0.0, max_value=1.0),
+                },
+                use_container_width=True
+            )
+            best = results.iloc[:-1].sort_values('total_cost').iloc[0]
+            if base_cost > 0:
+                st.metric(f"Cheapest policy: {best['policy']}", f"${best['total_cost']:,.2f}",
+                          f"{(base_cost - best['total_cost']) / base_cost * 100:.1f}% vs. {baseline}")
+            st.caption(f"Routing over {len(sim.models)} candidate models (Pareto front plus best value). "
+                       "Cascade quality assumes a failed answer can be detected before escalating.")
+    else:
+        st.warning("No data found. Please run the pipeline first.")
@@ -0,0 +1,192 @@
+import random
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+Key = Tuple[str, str]
+
+# Floor on the per-call score variance, so a model that happened to answer a few calls
+# identically doesn't get a zero-width interval.
+MIN_VARIANCE = 0.05
+
+
+def _key(row: Dict) -> Key:
+    return (str(row['provider']), str(row['model_id']))
+
+
+class AdaptiveSampler:
+    """
+    Spends a fixed call budget where the value ranking is still uncertain.
+
+    Each model's quality is the mean per-call score in [0, 1], with a normal-approximation
+    interval (z, variance floored at MIN_VARIANCE); value = quality / (avg price + 0.0001)
+    as in IntelligenceEngine. A model is still *ambiguous* when its value interval
+    straddles the top-k boundary (LUCB: some top-k member's lower bound is below some
+    outsider's upper bound) or when it is neither clearly dominated nor clearly on the
+    quality/price Pareto front. Every round pulls the `batch_size` ambiguous models
+    with the widest intervals (unmeasured first, most optimistic value first); one pull
+    is one call per benchmark task. Models that are clearly in, clearly out, or at
+    `max_pulls` get nothing more.
+
+    `prior` maps (provider, model_id) to an earlier quality estimate, counted as
+    `prior_weight` calls, so models settled on previous days start with narrow
+    intervals. Ties are broken by `seed`, so a run is reproducible.
+    """
+    def __init__(self, rows: List[Dict], calls_per_pull: int, budget: int, top_k: int = 10, batch_size: int = 8,
+                 z: float = 1.96, max_pulls: int = 10, seed: int = 0, prior: Optional[Dict[Key, float]] = None,
+                 prior_weight: float = 2.0):
+        self.keys = [_key(r) for r in rows]
+        self.rows = {k: r for k, r in zip(self.keys, rows)}
+        self._index = {k: i for i, k in enumerate(self.keys)}
+        self.calls_per_pull = max(1, calls_per_pull)
+        self.budget = budget
+        self.top_k = min(top_k, len(self.keys))
+        self.batch_size = batch_size
+        self.z = z
+        self.max_pulls = max_pulls
+        self.seed = seed
+        self.spent = 0
+        self.history: List[Dict] = []
+
+        n = len(self.keys)
+        prices = [(float(r.get('input', np.nan)) + float(r.get('output', np.nan))) / 2 for r in rows]
+        # Unpriced models can't rank on value; they still compete on the Pareto front
+        self.cost = np.nan_to_num(np.array(prices, dtype=float), nan=np.inf)
+        self.n = np.zeros(n)
+        self.total = np.zeros(n)
+        self.sumsq = np.zeros(n)
+        self.pulls = np.zeros(n, dtype=int)
+        for i, k in enumerate(self.keys):
+            if prior and prior.get(k) is not None and np.isfinite(prior[k]):
+                self.n[i] = prior_weight
+                self.total[i] = prior[k] * prior_weight
+                self.sumsq[i] = prior[k] ** 2 * prior_weight
+        self._tiebreak = np.array([random.Random(f"{seed}:{k[0]}:{k[1]}").random() for k in self.keys])
+
+    def _intervals(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Quality mean, lower and upper bound per model; unmeasured models span [0, 1]."""
+        seen = self.n > 0
+        mean = np.where(seen, self.total / np.maximum(self.n, 1), 0.5)
+        var = np.maximum(self.sumsq / np.maximum(self.n, 1) - mean ** 2, MIN_VARIANCE)
+        radius = np.where(seen, self.z * np.sqrt(var / np.maximum(self.n, 1)), np.inf)
+        return mean, np.clip(mean - radius, 0.0, 1.0), np.clip(mean + radius, 0.0, 1.0)
+
+    def _value(self, quality: np.ndarray) -> np.ndarray:
+        return quality / (self.cost + 0.0001)
+
+    def _top_k(self, value: np.ndarray) -> np.ndarray:
+        order = np.lexsort((self._tiebreak, -value))
+        return order[:self.top_k]
+
+    def _ambiguous(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Masks of models whose top-k membership, and whose Pareto status, is still open."""
+        mean, low, high = self._intervals()
+        value, value_low, value_high = self._value(mean), self._value(low), self._value(high)
+        boundary = np.zeros(len(self.keys), dtype=bool)
+
+        inside = np.zeros(len(self.keys), dtype=bool)
+        inside[self._top_k(value)] = True
+        if inside.any() and (~inside).any():
+            weakest_in = value_low[inside].min()
+            strongest_out = value_high[~inside].max()
+            boundary |= inside & (value_low < strongest_out)
+            boundary |= ~inside & (value_high > weakest_in)
+
+        # Pareto on (quality up, price down): compare against every strictly cheaper model
+        ambiguous = np.zeros(len(self.keys), dtype=bool)
+        order = np.argsort(self.cost, kind="stable")
+        best_low = best_high = -np.inf
+        i = 0
+        while i < len(order):
+            j = i
+            while j < len(order) and self.cost[order[j]] == self.cost[order[i]]:
+                j += 1
+            group = order[i:j]
+            dominated = best_low >= high[group]
+            on_front = best_high < low[group]
+            ambiguous[group] |= ~dominated & ~on_front
+            best_low = max(best_low, low[group].max())
+            best_high = max(best_high, high[group].max())
+            i = j
+        return boundary, ambiguous
+
+    def next_batch(self) -> List[Dict]:
+        """Catalog rows to pull next, or [] when the budget is spent or nothing is ambiguous."""
+        affordable = (self.budget - self.spent) // self.calls_per_pull
+        if affordable <= 0:
+            return []
+        boundary, pareto = self._ambiguous()
+        candidates = np.flatnonzero((boundary | pareto) & (self.pulls < self.max_pulls))
+        if candidates.size == 0:
+            return []
+        _, low, high = self._intervals()
+        width = np.where(self.n > 0, high - low, 2.0)
+        optimism = self._value(high)
+        # Top-k boundary first, then the Pareto front; widest interval, then most optimistic value
+        order = np.lexsort((self._tiebreak[candidates], -optimism[candidates], -width[candidates],
+                            ~boundary[candidates]))
+        picked = candidates[order[:min(self.batch_size, affordable)]]
+        self.pulls[picked] += 1
+        self.spent += len(picked) * self.calls_per_pull
+        return [self.rows[self.keys[i]] for i in picked]
+
+    def update(self, row: Dict, scores: List[float]):
+        """Record the per-call scores of one pull of `row`."""
+        i = self._index[_key(row)]
+        values = np.asarray(scores, dtype=float)
+        self.n[i] += values.size
+        self.total[i] += values.sum()
+        self.sumsq[i] += (values ** 2).sum()
+
+    def ranking(self) -> List[Key]:
+        """Current top-k by estimated value."""
+        mean, _, _ = self._intervals()
+        return [self.keys[i] for i in self._top_k(self._value(mean))]
+
+    def stability(self, n_boot: int = 200) -> float:
+        """
+        Mean Jaccard overlap between the current top-k and the top-k of `n_boot`
+        parametric resamples of every model's quality (normal, from its interval);
+        1.0 means the top-k is settled.
+        """
+        mean, low, high = self._intervals()
+        if self.top_k == 0:
+            return 1.0
+        rng = np.random.default_rng(self.seed)
+        sd = (high - low) / (2 * self.z)
+        draws = np.clip(mean + sd * rng.standard_normal((n_boot, len(self.keys))), 0.0, 1.0)
+        point = set(self._top_k(self._value(mean)))
+        overlaps = []
+        for draw in draws:
+            boot = set(self._top_k(self._value(draw)))
+            overlaps.append(len(point & boot) / len(point | boot))
+        return float(np.mean(overlaps))
+
+    def snapshot(self) -> Dict:
+        """Record one point of the stability-vs-spend curve (call after each round's updates)."""
+        top = self.ranking()
+        previous = set(self.history[-1]["top_k"]) if self.history else None
+        point = {
+            "round": len(self.history) + 1,
+            "calls": int(self.spent),
+            "stability": round(self.stability(), 4),
+            "overlap_prev": round(len(previous & set(top)) / len(previous | set(top)), 4) if previous else None,
+            "ambiguous": int(np.logical_or(*self._ambiguous()).sum()),
+            "top_k": top,
+        }
+        self.history.append(point)
+        return point
+
+    def report(self) -> Dict:
+        """Budget use, final top-k and the per-round curve of top-k stability against calls spent."""
+        curve = [{**p, "top_k": [f"{prov}/{model}" for prov, model in p["top_k"]]} for p in self.history]
+        final = curve[-1]["stability"] if curve else None
+        return {
+            "budget": self.budget,
+            "calls": int(self.spent),
+            "models": len(self.keys),
+            "models_pulled": int((self.pulls > 0).sum()),
+            "top_k": [f"{prov}/{model}" for prov, model in self.ranking()],
+            "stability": final,
+            "pulls": {f"{prov}/{model}": int(p) for (prov, model), p in zip(self.keys, self.pulls) if p},
+            "curve": curve,
+        }
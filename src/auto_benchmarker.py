@@ -1,16 +1,88 @@
 import os
 import time
+import zlib
+import random
 import requests
 import json
+import itertools
+import contextlib
+import numpy as np
 import pandas as pd
-from typing import List, Dict
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from requests.adapters import HTTPAdapter
+from benchmark_scheduler import BenchmarkScheduler, RetryableError, RETRYABLE_STATUS
+from trial_stats import run_trials, summarize_trials
+from results_store import ResultsStore
+from instrumentation import span, count, record_http
+from schema import CATALOG_PATH, BENCHMARK_PATH, BENCHMARK_CSV, TRIALS_PATH, TRIALS_CSV, read_frame, write_frame
+from response_cache import ResponseCache, CACHE_MODES
+from scoring import BatchScorer
+from task_registry import TaskRegistry
+from adaptive_sampler import AdaptiveSampler
+from provider_config import ProviderEntry, ProvidersConfig
+
+# Completion cap for tasks that don't set max_tokens; part of the response cache key.
+MAX_TOKENS = 100
+
+def _task_id(task: Dict) -> str:
+    # Registry items have ids; ad-hoc task lists may only name a category
+    return task.get('id', task['name'])
+
+
+def _timed(measured: List) -> List:
+    """(task, run) pairs to take timings from: the fresh ones, or the cache replays if that's all there is."""
+    return [(t, r) for t, r in measured if not r.get('cached')] or measured
+
+
+def throughput_curves(measured: List) -> Dict[str, float]:
+    """
+    Mean tokens/sec per context-length tier (tps_ctx_<tier>) and per output tier
+    (tps_out_<tier>), plus TTFT per context tier for streamed calls, over the real
+    (task, run) pairs in `measured`. Simulated runs don't depend on prompt length and
+    are left out.
+    """
+    groups: Dict[str, List[float]] = {}
+    for task, run in measured:
+        if 'content' not in run:
+            continue
+        groups.setdefault(f"tps_ctx_{task.get('context_tier', 'short')}", []).append(run['tokens_per_sec'])
+        groups.setdefault(f"tps_out_{task.get('output_tier', 'small')}", []).append(run['tokens_per_sec'])
+        if run.get('ttft') is not None:
+            groups.setdefault(f"ttft_ctx_{task.get('context_tier', 'short')}", []).append(run['ttft'])
+    return {col: round(float(np.mean(vals)), 4) for col, vals in groups.items()}
+
 
 class AutoBenchmarker:
-    def __init__(self, catalog_path: str = "data/provider_catalog.csv"):
-        if os.path.exists(catalog_path):
-            self.catalog = pd.read_csv(catalog_path)
-        else:
-            self.catalog = pd.DataFrame()
+    def __init__(self, catalog_path: str = CATALOG_PATH, results_path: str = BENCHMARK_PATH,
+                 trials_path: str = TRIALS_PATH, seed: int = 0, results_csv: Optional[str] = BENCHMARK_CSV,
+                 response_cache: Optional[ResponseCache] = None, sampling_report_path: Optional[str] = "data/sampling_report.json",
+                 trials_csv: Optional[str] = TRIALS_CSV):
+        self.results_path = results_path
+        self.results_csv = results_csv
+        # Seeds the simulated results so runs are reproducible across processes
+        self.seed = seed
+        self.trials_path = trials_path
+        self.trials_csv = trials_csv
+        # Created on first real run unless one is passed in (e.g. shared across shards)
+        self.response_cache = response_cache
+        catalog = read_frame(catalog_path)
+        self.catalog = catalog if catalog is not None else pd.DataFrame()
+        self.sampling_report_path = sampling_report_path
+        self.last_run_stats = None
+        self.last_sampling_report = None
+        # Rows measured with real calls in the last benchmark_all run (for change detection)
+        self.last_measured = pd.DataFrame()
+
+    def _quality_prior(self) -> Dict:
+        """Mean task score per (provider, model_id) from the current results file, for the adaptive sampler."""
+        previous = read_frame(self.results_path)
+        if previous is None or previous.empty:
+            return {}
+        score_cols = [c for c in previous.columns if c.endswith("_score")]
+        if not score_cols:
+            return {}
+        quality = previous[score_cols].astype(float).mean(axis=1)
+        return {(str(p), str(m)): q for p, m, q in zip(previous['provider'], previous['model_id'], quality) if pd.notna(q)}
 
     def run_benchmark_task(self, provider: str, model: str, prompt: str, task_name: str):
         """Simulate benchmark for local or missing API keys."""
@@ -33,16 +105,16 @@ class AutoBenchmarker:
         for tier, config in profiles.items():
             for keyword in config["keywords"]:
                 if keyword in model.lower():
-                    # Add pseudo-random variance based on model string hash to keep it consistent per model
-                    variance = (hash(model) % 100) / 1000.0  
+                    # Pseudo-random variance from a stable hash of the model id (builtin hash() is salted per process)
+                    variance = (zlib.crc32(model.encode()) % 100) / 1000.0
                     base_score = config["base_score"] + variance
                     base_latency = config["base_latency"] * (1.0 + variance)
                     found = True
                     break
             if found: break
             
-        # Add slight time-based jitter so it's not identical every single run
-        jit = (time.time() % 100) / 10000.0
+        # Slight per-(model, task) jitter, seeded so reruns reproduce it
+        jit = random.Random(f"{self.seed}:{model}:{task_name}").random() / 100.0
         score = min(0.99, base_score + jit)
         
         tps = 100 / (base_latency + jit)
@@ -54,8 +126,12 @@ class AutoBenchmarker:
             "tokens_per_sec": round(tps, 2)
         }
 
-    def execute_real_benchmark(self, provider_name: str, model: str, prompt: str):
-        """Execute a real API call to benchmark speed and accuracy."""
+    def execute_real_benchmark(self, provider_name: str, model: str, prompt: str, session: Optional[requests.Session] = None,
+                               max_tokens: int = MAX_TOKENS):
+        """
+        Execute a real API call to benchmark speed and accuracy.
+        Raises RetryableError on 429/5xx so the scheduler can back off and retry.
+        """
         api_key = os.getenv(f"{provider_name.upper().replace(' ', '_')}_API_KEY")
         config = self.get_provider_config(provider_name)
         
@@ -69,20 +145,31 @@ class AutoBenchmarker:
         data = {
             "model": model,
             "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": 100,
+            "max_tokens": max_tokens,
             "stream": False
         }
         
+        http = session or requests
         try:
             start_time = time.time()
-            response = requests.post(
-                f"{config['api_base'].rstrip('/')}/chat/completions",
-                headers=headers,
-                json=data,
-                timeout=15
-            )
+            with span("benchmark.request", provider=provider_name):
+                response = http.post(
+                    f"{config['api_base'].rstrip('/')}/chat/completions",
+                    headers=headers,
+                    json=data,
+                    # Non-streaming reads wait for the whole completion; allow ~25 tokens/sec for long answers
+                    timeout=max(15, max_tokens / 25)
+                )
             latency = time.time() - start_time
-            
+        except Exception as e:
+            record_http("benchmark", provider_name, "error", time.time() - start_time)
+            print(f"Benchmark failed for {model} on {provider_name}: {e}")
+            return None
+        record_http("benchmark", provider_name, response.status_code, latency, len(response.content))
+
+        self._raise_if_retryable(response)
+
+        try:
             if response.status_code == 200:
                 result = response.json()
                 content = result['choices'][0]['message']['content']
@@ -98,52 +185,447 @@ class AutoBenchmarker:
             print(f"Benchmark failed for {model} on {provider_name}: {e}")
         return None
 
-    def get_provider_config(self, name: str):
-        import yaml
-        with open("config/providers.yaml", "r") as f:
-            conf = yaml.safe_load(f)
-            for p in conf['providers']:
-                if p['name'] == name: return p
-        return None
-
-    def benchmark_all(self, real: bool = False):
-        tasks = [
-            {"name": "Coding", "prompt": "Write a python function for quicksort. Only the code."},
-            {"name": "Math", "prompt": "Solve: 123 * 45 + 67. Only the number."},
-            {"name": "Reasoning", "prompt": "If A is taller than B, and B is taller than C, who is the shortest? Only the letter."}
-        ]
+    def execute_streaming_benchmark(self, provider_name: str, model: str, prompt: str, session: Optional[requests.Session] = None,
+                                    max_tokens: int = MAX_TOKENS):
+        """
+        Benchmark via the SSE stream of /chat/completions so prefill and decode are measured separately.
+        Returns TTFT, inter-token latency percentiles, decode-only tokens/sec and total latency.
+        Raises RetryableError on 429/5xx like execute_real_benchmark.
+        """
+        api_key = os.getenv(f"{provider_name.upper().replace(' ', '_')}_API_KEY")
+        config = self.get_provider_config(provider_name)
         
-        results = []
+        if not api_key or not config:
+            return None
+
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream"
+        }
+        data = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "stream": True,
+            "stream_options": {"include_usage": True}
+        }
+
+        http = session or requests
+        try:
+            start_time = time.perf_counter()
+            response = http.post(
+                f"{config['api_base'].rstrip('/')}/chat/completions",
+                headers=headers,
+                json=data,
+                timeout=15,
+                stream=True
+            )
+        except Exception as e:
+            record_http("benchmark_stream", provider_name, "error", time.perf_counter() - start_time)
+            print(f"Streaming benchmark failed for {model} on {provider_name}: {e}")
+            return None
+
+        nbytes = 0
+        with response:
+            if response.status_code != 200:
+                record_http("benchmark_stream", provider_name, response.status_code, time.perf_counter() - start_time)
+            self._raise_if_retryable(response)
+            if response.status_code != 200:
+                return None
+
+            token_times = []
+            pieces = []
+            completion_tokens = None
+            try:
+                # chunk_size=None yields each chunk of a chunked SSE response as soon as it arrives
+                for line in response.iter_lines(chunk_size=None):
+                    nbytes += len(line)
+                    if not line or not line.startswith(b"data:"):
+                        continue
+                    payload = line[5:].strip()
+                    if payload == b"[DONE]":
+                        break
+                    event = json.loads(payload)
+                    usage = event.get('usage')
+                    if usage and usage.get('completion_tokens') is not None:
+                        completion_tokens = usage['completion_tokens']
+                    for choice in event.get('choices') or []:
+                        text = (choice.get('delta') or {}).get('content')
+                        if text:
+                            token_times.append(time.perf_counter())
+                            pieces.append(text)
+            except Exception as e:
+                record_http("benchmark_stream", provider_name, "error", time.perf_counter() - start_time, nbytes)
+                print(f"Streaming benchmark failed for {model} on {provider_name}: {e}")
+                return None
+            latency = time.perf_counter() - start_time
+        record_http("benchmark_stream", provider_name, response.status_code, latency, nbytes)
+
+        if not token_times:
+            return None
+
+        # Content chunks stand in for tokens when the provider doesn't report usage.
+        n_tokens = completion_tokens or len(token_times)
+        decode_time = token_times[-1] - token_times[0]
+        gaps = np.diff(token_times)
+        if gaps.size:
+            # Providers may pack several tokens per chunk; spread each gap over them.
+            gaps = gaps * gaps.size / max(n_tokens - 1, 1)
+        else:
+            gaps = np.array([0.0])
+
+        return {
+            "content": "".join(pieces),
+            "latency": round(latency, 4),
+            "ttft": round(token_times[0] - start_time, 4),
+            "itl_p50": round(float(np.percentile(gaps, 50)), 4),
+            "itl_p90": round(float(np.percentile(gaps, 90)), 4),
+            "itl_p99": round(float(np.percentile(gaps, 99)), 4),
+            "decode_tps": round((n_tokens - 1) / decode_time, 2) if decode_time > 0 else None,
+            "tokens_per_sec": round(n_tokens / latency, 2)
+        }
+
+    def _raise_if_retryable(self, response):
+        if response.status_code in RETRYABLE_STATUS:
+            retry_after = response.headers.get("Retry-After")
+            raise RetryableError(response.status_code, float(retry_after) if retry_after and retry_after.isdigit() else None)
+
+    def get_provider_config(self, name: str) -> Optional[ProviderEntry]:
+        return ProvidersConfig.load().get(name)
+
+    def make_scheduler(self, **kwargs) -> BenchmarkScheduler:
+        """Build a scheduler using per-provider `rate_limit_rps` / `max_concurrency` from providers.yaml."""
+        return BenchmarkScheduler(provider_limits=ProvidersConfig.load().limits(), **kwargs)
+
+    def _keyed_providers(self, real: bool) -> Set[str]:
+        """Catalog providers that can answer real calls (an API key is set; local models are always simulated)."""
+        if not real or self.catalog.empty:
+            return set()
+        return {p for p in self.catalog['provider'].unique()
+                if p != 'Ollama (Local)' and os.getenv(f"{p.upper().replace(' ', '_')}_API_KEY")}
+
+    def _sample_models(self, incremental: bool, store: Optional[ResultsStore], ttl_days: float, keyed: Set[str],
+                       max_models: Optional[int], budget: Optional[int]) -> pd.DataFrame:
+        """Catalog rows to benchmark this run."""
+        if incremental:
+            sample_models = store.select_due(self.catalog, ttl_days=ttl_days, real_providers=keyed, max_models=max_models)
+            print(f"Incremental run: {len(sample_models)} of {len(self.catalog)} models due for benchmarking.")
+            return sample_models
+        if budget is not None:
+            # The adaptive sampler decides which models get calls
+            return self.catalog
         # Strategic sampling: Top 10 + 10 random + specific known value models
         top_models = self.catalog.head(10)
-        random_models = self.catalog.sample(min(10, len(self.catalog)))
+        random_models = self.catalog.sample(min(10, len(self.catalog)), random_state=self.seed)
         known_value = self.catalog[self.catalog['model_id'].str.contains('flash|mini|70b|llama-3.1', case=False)].head(10)
-        
-        sample_models = pd.concat([top_models, random_models, known_value]).drop_duplicates()
-        
-        for _, row in sample_models.iterrows():
-            model_results = {"model_id": row['model_id'], "provider": row['provider']}
-            print(f"--- Benchmarking {row['model_id']} from {row['provider']} ---")
-            
-            for task in tasks:
-                if real and row['provider'] != 'Ollama (Local)': # Real benchmarks for cloud
-                    res = self.execute_real_benchmark(row['provider'], row['model_id'], task['prompt'])
-                    if res:
-                        # Simple evaluation: In production, use another LLM to score content
-                        score = 1.0 if len(res['content']) > 10 else 0.5 
-                        model_results[f"{task['name']}_score"] = score
-                        model_results["avg_speed"] = res['tokens_per_sec']
-                        continue
-                
-                # Fallback to simulated for local or failures
-                res = self.run_benchmark_task(row['provider'], row['model_id'], task['prompt'], task['name'])
-                model_results[f"{task['name']}_score"] = res['score']
-                model_results["avg_speed"] = res['tokens_per_sec']
-                
+        return pd.concat([top_models, random_models, known_value]).drop_duplicates()
+
+    def _dispatch_real(self, sample_rows: List[Dict], tasks: List[Dict], keyed: Set[str],
+                       scheduler: Optional[BenchmarkScheduler], streaming: bool, cache_mode: str,
+                       scorer: Optional[BatchScorer], trial_options: Dict, budget: Optional[int],
+                       top_k: int) -> Tuple[Dict, List[Dict]]:
+        """
+        Fan the keyed models' (model, task) calls out over the scheduler, with fixed
+        trials or an adaptive `budget`. Returns {(provider, model_id, item): (runs, scores)}
+        and the sample rows to report this run (keyed models the budget never reached drop out;
+        benchmark_all keeps their previous results).
+        """
+        scheduler = scheduler or self.make_scheduler()
+        # One budget for the whole run, however many rounds it takes
+        scheduler.start_run()
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=scheduler.max_workers, pool_maxsize=scheduler.max_workers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        call = self.execute_streaming_benchmark if streaming else self.execute_real_benchmark
+
+        cache = None
+        if cache_mode != "off":
+            cache = self.response_cache = self.response_cache or ResponseCache()
+        cache_hits = itertools.count()
+        samples = {}
+
+        def one_call(row, task):
+            # Trials of a pair are numbered across rounds, so each is its own cache entry
+            sample = samples.setdefault((row['provider'], row['model_id'], _task_id(task)), itertools.count())
+            max_tokens = task.get('max_tokens', MAX_TOKENS)
+            key = None
+            if cache is not None:
+                params = {"max_tokens": max_tokens, "stream": streaming, "sample": next(sample)}
+                key = ResponseCache.key(row['provider'], row['model_id'], task['prompt'], params)
+                if cache_mode == "reuse":
+                    cached = cache.get(key)
+                    if cached is not None:
+                        next(cache_hits)
+                        count("response_cache_hits_total", provider=row['provider'])
+                        # Its timings are the original call's, not a new measurement
+                        return {**cached, "cached": True}
+            result = scheduler.call(row['provider'], lambda: call(row['provider'], row['model_id'], task['prompt'],
+                                                                 session=session, max_tokens=max_tokens))
+            if key is not None and result is not None:
+                cache.put(key, row['provider'], row['model_id'], result)
+            return result
+
+        # A shared scorer stays open for its owner; our own is closed when the fetches are done
+        if scorer is None:
+            scorer = scoring = BatchScorer()
+        else:
+            scoring = contextlib.nullcontext()
+        with scoring:
+            if budget is None:
+                # Don't spend rate-limit tokens on providers that can't answer.
+                real_pairs = [(row, task) for row in sample_rows if row['provider'] in keyed for task in tasks]
+                real_results, run_stats = self._run_fixed_trials(real_pairs, scheduler, scorer, one_call, **trial_options)
+            else:
+                real_results, run_stats = self._run_adaptive(
+                    [row for row in sample_rows if row['provider'] in keyed], tasks, scheduler, scorer, one_call, budget, top_k)
+                # Keyed models the budget didn't reach keep their previous results
+                pulled_models = {k[:2] for k in real_results}
+                sample_rows = [row for row in sample_rows
+                               if row['provider'] not in keyed or (row['provider'], row['model_id']) in pulled_models]
+        session.close()
+        stats = {**run_stats, "cache_hits": next(cache_hits)}
+        print(f"Scheduler: {stats['calls']} calls ({stats['retries']} retries, {stats['failed']} failed, "
+              f"{stats['skipped']} skipped) in {stats['elapsed']}s = {stats['requests_per_sec']} req/s, "
+              f"{stats['cache_hits']} cached responses")
+        self.last_run_stats = stats
+        return real_results, sample_rows
+
+    @staticmethod
+    def _run_fixed_trials(real_pairs: List[Tuple[Dict, Dict]], scheduler: BenchmarkScheduler, scorer: BatchScorer,
+                          one_call: Callable, trials: int, warmup: int, min_trials: int,
+                          ci_rel_width: Optional[float]) -> Tuple[Dict, Dict]:
+        """Every pair gets `warmup` + up to `trials` calls; answers are scored while other pairs are fetched."""
+        def measure(row, task):
+            runs = run_trials(lambda: one_call(row, task), warmup=warmup, trials=trials, min_trials=min_trials,
+                              ci_rel_width=ci_rel_width)
+            # Queued for the scoring pool; this thread goes on to the next pair
+            return runs, [scorer.submit(r.get('content'), task.get('scorer')) for r in runs]
+
+        print(f"Dispatching {len(real_pairs)} benchmark pairs x {trials} trials (+{warmup} warm-up)...")
+        outputs = scheduler.fan_out([lambda r=row, t=task: measure(r, t) for row, task in real_pairs])
+        scorer.flush()
+        real_results = {}
+        # A job that raised comes back as None
+        for (row, task), (runs, scores) in zip(real_pairs, (o or ([], []) for o in outputs)):
+            if runs:
+                real_results[(row['provider'], row['model_id'], _task_id(task))] = (runs, [f.result() for f in scores])
+        return real_results, dict(scheduler.stats)
+
+    def _run_adaptive(self, real_rows: List[Dict], tasks: List[Dict], scheduler: BenchmarkScheduler,
+                      scorer: BatchScorer, one_call: Callable, budget: int, top_k: int) -> Tuple[Dict, Dict]:
+        """Spend `budget` calls in AdaptiveSampler rounds; writes the sampling report."""
+        def pull(row, task):
+            run = one_call(row, task)
+            return run, scorer.submit(run.get('content'), task.get('scorer')) if run else None
+
+        sampler = AdaptiveSampler(real_rows, calls_per_pull=len(tasks), budget=budget, top_k=top_k,
+                                  seed=self.seed, prior=self._quality_prior())
+        print(f"Adaptive sampling: {budget} calls over {len(real_rows)} models (top-{sampler.top_k})...")
+        real_results = {}
+        for batch in iter(sampler.next_batch, []):
+            jobs = [(row, task) for row in batch for task in tasks]
+            outputs = scheduler.fan_out([lambda r=row, t=task: pull(r, t) for row, task in jobs])
+            # Scores decide the next round, so don't leave a partial batch queued
+            scorer.flush()
+            pulled = {}
+            for (row, task), (run, future) in zip(jobs, (o or (None, None) for o in outputs)):
+                scores = pulled.setdefault((row['provider'], row['model_id']), [])
+                if run is None:
+                    continue
+                value = future.result()
+                runs, task_scores = real_results.setdefault((row['provider'], row['model_id'], _task_id(task)), ([], []))
+                runs.append(run)
+                task_scores.append(value)
+                if value is not None:
+                    scores.append(value)
+            for row in batch:
+                sampler.update(row, pulled[(row['provider'], row['model_id'])])
+            point = sampler.snapshot()
+            print(f"  round {point['round']}: {point['calls']} calls, top-{sampler.top_k} stability "
+                  f"{point['stability']}, {point['ambiguous']} models ambiguous")
+        self.last_sampling_report = sampler.report()
+        if self.sampling_report_path:
+            os.makedirs(os.path.dirname(self.sampling_report_path) or ".", exist_ok=True)
+            with open(self.sampling_report_path, "w") as f:
+                json.dump(self.last_sampling_report, f, indent=2)
+        return real_results, dict(scheduler.stats)
+
+    def _assemble_row(self, row: Dict, tasks: List[Dict], real_results: Dict, streaming: bool,
+                      with_trials: bool) -> Tuple[Dict, List, bool]:
+        """
+        One model's results row from its real runs, simulating the tasks that got none.
+        Returns the row, the (task, run) pairs measured and whether every task was simulated.
+        Cache replays count for scores; timings come from the other runs when there are any.
+        """
+        model_results = {"model_id": row['model_id'], "provider": row['provider']}
+        print(f"--- Benchmarking {row['model_id']} from {row['provider']} ---")
+        measured = []
+        fell_back = 0
+
+        category_scores = {}
+        for task in tasks:
+            runs, scores = real_results.get((row['provider'], row['model_id'], _task_id(task)), ([], []))
+            if runs:
+                scored = [s for s in scores if s is not None]
+                if scored:
+                    category_scores.setdefault(task['name'], []).append(float(np.mean(scored)))
+                measured.extend((task, r) for r in runs)
+                continue
+
+            # Fallback to simulated for local or failures
+            res = self.run_benchmark_task(row['provider'], row['model_id'], task['prompt'], task['name'])
+            if task.get('scorer'):
+                category_scores.setdefault(task['name'], []).append(res['score'])
+            measured.append((task, res))
+            fell_back += 1
+        for name, item_scores in category_scores.items():
+            model_results[f"{name}_score"] = round(float(np.mean(item_scores)), 4)
+
+        # A model answered only from the cache keeps the timings of the calls that were cached
+        timed = _timed(measured)
+        # Average speed across every task and trial, not just the last task run.
+        model_results["avg_speed"] = round(float(np.mean([r['tokens_per_sec'] for _, r in timed])), 2)
+        model_results.update(throughput_curves(timed))
+        if with_trials:
+            model_results.update(summarize_trials([r for _, r in timed]))
+
+        # Latency metrics only exist for streamed calls; averaged over the tasks that streamed.
+        if streaming:
+            streamed = [r for _, r in timed if 'ttft' in r]
+            for col, key in [("avg_ttft", "ttft"), ("itl_p50", "itl_p50"), ("itl_p90", "itl_p90"),
+                             ("itl_p99", "itl_p99"), ("decode_tps", "decode_tps"), ("avg_latency", "latency")]:
+                vals = [r[key] for r in streamed if r.get(key) is not None]
+                model_results[col] = round(float(np.mean(vals)), 4) if vals else None
+        # Simulated only if no task got a real answer; a partial fallback is recorded per task
+        return model_results, measured, fell_back == len(tasks)
+
+    @staticmethod
+    def _trial_rows(row: Dict, tasks: List[Dict], measured: List) -> List[Dict]:
+        """Raw per-trial rows for the trials file; cache replays aren't trials."""
+        rows = []
+        for task in tasks:
+            task_runs = [r for t, r in measured if t is task and not r.get('cached')]
+            rows.extend(
+                {"model_id": row['model_id'], "provider": row['provider'], "task": task['name'],
+                 "item": _task_id(task), "context_tier": task.get('context_tier', 'short'),
+                 "trial": i, "latency": r['latency'], "tokens_per_sec": r['tokens_per_sec']}
+                for i, r in enumerate(task_runs)
+            )
+        return rows
+
+    @staticmethod
+    def _task_rows(tasks: List[Dict], measured: List, model_results: Dict) -> List[Dict]:
+        """Per-category results for the ResultsStore."""
+        task_rows = []
+        for name in dict.fromkeys(task['name'] for task in tasks):
+            task_runs = [r for _, r in _timed([(t, r) for t, r in measured if t['name'] == name])]
+            task_rows.append({
+                "task": name,
+                "score": model_results.get(f"{name}_score"),
+                "latency": float(np.mean([r['latency'] for r in task_runs])),
+                "tokens_per_sec": float(np.mean([r['tokens_per_sec'] for r in task_runs])),
+                "simulated": 'content' not in task_runs[0]
+            })
+        return task_rows
+
+    def _with_previous(self, df: pd.DataFrame, keys: Set[Tuple[str, str]]) -> pd.DataFrame:
+        """`df` plus the previous results file's rows for the (provider, model_id) `keys`."""
+        previous = read_frame(self.results_path)
+        if previous is None or previous.empty:
+            return df
+        kept = previous[[key in keys for key in zip(previous['provider'], previous['model_id'])]]
+        print(f"Keeping previous results for {len(kept)} models the sampler didn't reach.")
+        return pd.concat([df, kept], ignore_index=True)
+
+    def benchmark_all(self, real: bool = False, scheduler: Optional[BenchmarkScheduler] = None, streaming: bool = False,
+                      trials: int = 1, warmup: int = 0, min_trials: int = 3, ci_rel_width: Optional[float] = 0.1,
+                      incremental: bool = True, store: Optional[ResultsStore] = None, ttl_days: float = 7.0,
+                      max_models: Optional[int] = None, cache_mode: str = "reuse", tasks: Optional[List[Dict]] = None,
+                      suite: str = "daily", budget: Optional[int] = None, top_k: int = 10,
+                      scorer: Optional[BatchScorer] = None):
+        """
+        Benchmark a sample of the catalog. With trials > 1 each real (model, task) pair gets
+        `warmup` discarded calls plus up to `trials` measured ones, stopping early once the
+        throughput CI is within `ci_rel_width`; latency percentiles, throughput mean/stddev
+        and bootstrap CIs are added per model and raw trials go to `trials_path` (and its CSV export).
+
+        In incremental mode only models that are new, older than `ttl_days`, repriced, or
+        (for real runs) only ever simulated are benchmarked; results are appended to the
+        ResultsStore and benchmark_results.parquet (plus its CSV export) is rebuilt from
+        the latest row per model.
+
+        Real responses go through the ResponseCache: "reuse" answers repeated requests
+        from it without an API call (rescoring, engine changes), "refresh" always calls
+        and stores the fresh response (timing runs), "off" bypasses it. Each trial of a
+        (model, task) pair is its own cache entry, so a replay keeps the trial spread.
+        Replayed answers are scored, but their timings aren't new measurements: they are
+        left out of the trials file and `last_measured` (change detection), and only
+        fill a model's timing columns when it got no fresh call.
+
+        Real answers are scored by each task's declared `scorer` in a process pool while
+        other pairs are still being fetched (a BatchScorer of its own, or `scorer` if given,
+        which is left open). `<category>_score` is the mean over the category's items and
+        trials; items without a scorer only contribute throughput.
+
+        Tasks default to the `suite` sample of the TaskRegistry (config/tasks/*.jsonl):
+        "daily" takes one item per (category, context tier, output tier) stratum in the
+        short/4k context and small output tiers, "weekly" every item. Real runs also get per-tier throughput curves:
+        tps_ctx_<tier> / tps_out_<tier> (and ttft_ctx_<tier> when streaming).
+
+        With a call `budget`, real models are not given a fixed number of trials: an
+        AdaptiveSampler spends the budget in rounds on the models whose top-`top_k`
+        value rank or Pareto status is still uncertain (all catalog models in
+        non-incremental mode, the due ones otherwise), starting from the previous
+        results as a prior. Keyed models it never pulls keep their previous results.
+        The per-round top-k stability vs. calls spent goes to `last_sampling_report`
+        and `sampling_report_path`.
+        """
+        if cache_mode not in CACHE_MODES:
+            raise ValueError(f"cache_mode must be one of {CACHE_MODES}, got {cache_mode!r}")
+        if tasks is None:
+            tasks = TaskRegistry().suite(suite, seed=self.seed)
+        keyed = self._keyed_providers(real)
+        if incremental:
+            store = store or ResultsStore()
+        sample_rows = self._sample_models(incremental, store, ttl_days, keyed, max_models, budget).to_dict('records')
+
+        # Real calls for keyed providers; local models and failed/skipped calls fall back to simulation
+        real_results = {}
+        unpulled = set()
+        if keyed:
+            trial_options = {"trials": trials, "warmup": warmup, "min_trials": min_trials, "ci_rel_width": ci_rel_width}
+            sampled = {(row['provider'], row['model_id']) for row in sample_rows}
+            real_results, sample_rows = self._dispatch_real(sample_rows, tasks, keyed, scheduler, streaming, cache_mode,
+                                                            scorer, trial_options, budget, top_k)
+            unpulled = sampled - {(row['provider'], row['model_id']) for row in sample_rows}
+
+        results = []
+        fresh = []
+        trial_rows = []
+        with_trials = trials > 1 or budget is not None
+        for row in sample_rows:
+            model_results, measured, simulated = self._assemble_row(row, tasks, real_results, streaming, with_trials)
             results.append(model_results)
-            
+            if any('content' in r and not r.get('cached') for _, r in measured):
+                fresh.append(model_results)
+            if with_trials:
+                trial_rows.extend(self._trial_rows(row, tasks, measured))
+            if incremental:
+                store.record(model_results, self._task_rows(tasks, measured, model_results),
+                             {"input": row.get('input'), "output": row.get('output')}, simulated)
+
         df = pd.DataFrame(results)
-        df.to_csv("data/benchmark_results.csv", index=False)
+        self.last_measured = pd.DataFrame(fresh)
+        if incremental:
+            # Publish the latest measurement for every catalog model, not just today's batch.
+            df = store.latest_results(self.catalog)
+        elif unpulled:
+            df = self._with_previous(df, unpulled)
+        write_frame(df, self.results_path, csv_path=self.results_csv)
+        if trial_rows:
+            write_frame(pd.DataFrame(trial_rows), self.trials_path, csv_path=self.trials_csv)
         print(f"Benchmarks completed for {len(df)} models.")
         return df
 
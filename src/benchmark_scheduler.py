@@ -0,0 +1,177 @@
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from instrumentation import count, observe
+
+# HTTP statuses worth retrying: rate limited or transient server errors.
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class RetryableError(Exception):
+    """Raised by a job when the provider answered with a retryable status."""
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` requests/sec with bursts up to `capacity`."""
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, deadline: Optional[float] = None) -> bool:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait_for = (1 - self.tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait_for > deadline:
+                return False
+            time.sleep(wait_for)
+
+
+class BenchmarkScheduler:
+    """
+    Fans benchmark jobs out over a worker pool while respecting per-provider
+    rate limits and concurrency caps, retrying 429/5xx with exponential backoff,
+    and stopping once the global run budget (wall time or call count) is spent.
+    A run lasts from `start_run` to the next one and may span several fan_outs.
+    """
+    def __init__(self, max_workers: int = 16, default_rps: float = 2.0, default_concurrency: int = 4,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 20.0,
+                 budget_seconds: Optional[float] = None, max_calls: Optional[int] = None,
+                 provider_limits: Optional[Dict[str, Dict]] = None):
+        self.max_workers = max_workers
+        self.default_rps = default_rps
+        self.default_concurrency = default_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.budget_seconds = budget_seconds
+        self.max_calls = max_calls
+        # {provider_name: {"rate_limit_rps": float, "max_concurrency": int}}
+        self.provider_limits = provider_limits or {}
+        self._buckets = {}
+        self._slots = {}
+        self._lock = threading.Lock()
+        self._started = None
+        self._deadline = None
+        self.stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict:
+        return {"calls": 0, "retries": 0, "succeeded": 0, "failed": 0, "skipped": 0, "elapsed": 0.0, "requests_per_sec": 0.0}
+
+    def start_run(self):
+        """Clear the counters and start the budget clock; later fan_outs share this run's budget."""
+        with self._lock:
+            self.stats = self._empty_stats()
+            self._started = time.monotonic()
+            self._deadline = self._started + self.budget_seconds if self.budget_seconds is not None else None
+
+    def _limits_for(self, provider: str) -> Tuple[TokenBucket, threading.Semaphore]:
+        with self._lock:
+            if provider not in self._buckets:
+                limits = self.provider_limits.get(provider, {})
+                self._buckets[provider] = TokenBucket(limits.get('rate_limit_rps', self.default_rps))
+                self._slots[provider] = threading.Semaphore(limits.get('max_concurrency', self.default_concurrency))
+            return self._buckets[provider], self._slots[provider]
+
+    def _take_call(self) -> bool:
+        """Reserve one call against the global budget."""
+        with self._lock:
+            if self._deadline is not None and time.monotonic() >= self._deadline:
+                return False
+            if self.max_calls is not None and self.stats["calls"] >= self.max_calls:
+                return False
+            self.stats["calls"] += 1
+            return True
+
+    def _bump(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def call(self, provider: str, fn: Callable):
+        """
+        Make one rate-limited call for `provider`, retrying retryable failures.
+        Returns fn's result, or None if it failed (any other exception counts as a
+        failure without a retry) or the budget ran out.
+        """
+        bucket, slot = self._limits_for(provider)
+        for attempt in range(self.max_retries + 1):
+            waited = time.monotonic()
+            if not bucket.acquire(self._deadline) or not self._take_call():
+                self._bump("skipped")
+                count("scheduler_skipped_total", provider=provider)
+                return None
+            observe("rate_limit_wait_seconds", time.monotonic() - waited, provider=provider)
+            try:
+                with slot:
+                    result = fn()
+            except RetryableError as e:
+                if attempt == self.max_retries:
+                    break
+                self._bump("retries")
+                count("http_retries_total", provider=provider, status=e.status)
+                delay = e.retry_after if e.retry_after is not None else self.backoff_base * (2 ** attempt)
+                delay = min(self.backoff_max, delay) * (1 + random.random() * 0.25)
+                if self._deadline is not None and time.monotonic() + delay > self._deadline:
+                    break
+                time.sleep(delay)
+                continue
+            except Exception as e:
+                print(f"Benchmark call to {provider} failed: {e}")
+                break
+            if result is None:
+                break
+            self._bump("succeeded")
+            return result
+        self._bump("failed")
+        count("scheduler_failed_total", provider=provider)
+        return None
+
+    def fan_out(self, fns: List[Callable]) -> List:
+        """
+        Run arbitrary callables in the worker pool under the current run's budget
+        (a run is started here if none was). Callables are expected to go through
+        `call` for each HTTP request; one that raises anyway yields None instead of
+        aborting the run. Stats accumulate over the run.
+        """
+        if self._started is None:
+            self.start_run()
+
+        if fns:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(fns))) as pool:
+                futures = [pool.submit(fn) for fn in fns]
+                results = []
+                for f in futures:
+                    try:
+                        results.append(f.result())
+                    except Exception as e:
+                        print(f"Benchmark job failed: {e}")
+                        results.append(None)
+        else:
+            results = []
+
+        self.stats["elapsed"] = round(time.monotonic() - self._started, 3)
+        if self.stats["elapsed"] > 0:
+            self.stats["requests_per_sec"] = round(self.stats["calls"] / self.stats["elapsed"], 2)
+        return results
+
+    def run(self, jobs: List[Tuple[str, Callable]]) -> List:
+        """
+        Run (provider, fn) jobs concurrently. Returns results in job order;
+        failed or budget-skipped jobs yield None.
+        """
+        return self.fan_out([lambda p=provider, f=fn: self.call(p, f) for provider, fn in jobs])
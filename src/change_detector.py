@@ -0,0 +1,281 @@
+import os
+import json
+import math
+import sqlite3
+import contextlib
+import argparse
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+import pandas as pd
+import requests
+from instrumentation import count
+from schema import CATALOG_PATH, BENCHMARK_PATH, read_frame
+
+STATE_DB = "data/changes/detector.sqlite"
+ALERTS_PATH = "data/changes/alerts.jsonl"
+# POST alert batches here as JSON when set (e.g. a local webhook receiver).
+WEBHOOK_ENV = "MODELRADAR_ALERT_WEBHOOK"
+
+# Benchmark metrics followed per model: column -> True if higher is better.
+# "quality" is the mean of the row's <category>_score columns.
+TRACKED_METRICS = {"avg_speed": True, "decode_tps": True, "avg_latency": False, "avg_ttft": False,
+                   "latency_p90": False, "quality": True}
+PRICE_COLUMNS = ["input", "output"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS detector_state (
+    provider TEXT NOT NULL,
+    model_id TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    mean REAL NOT NULL,
+    var REAL NOT NULL,
+    cusum_pos REAL NOT NULL,
+    cusum_neg REAL NOT NULL,
+    last REAL NOT NULL,
+    updated TEXT NOT NULL,
+    PRIMARY KEY (provider, model_id, metric)
+);
+"""
+
+# Scout and benchmark branches of the pipeline append from parallel threads
+_ALERTS_LOCK = threading.Lock()
+
+State = Tuple[int, float, float, float, float, float]  # n, mean, var, cusum_pos, cusum_neg, last
+
+
+class ChangeDetector:
+    """
+    Incremental change detection over scans and benchmark results. Each
+    (provider, model, metric) keeps one row of rolling state in SQLite: an EWMA mean
+    and variance (weight `alpha`, or 1/n while n is small) and a two-sided CUSUM of the standardized residuals,
+    so a new observation is checked in O(1) without reading the history.
+
+    Alerts:
+      price_change   input/output price differs from the last scan by more than `price_tolerance`
+      new_model      a model appears for a provider that was seen before
+      model_removed  a model is missing from `removal_misses` consecutive live listings of its
+                     provider; fallback listings (models_suggested after a failed call) are skipped
+      jump           a benchmark metric is (1 + jump)x above or below its EWMA (e.g. latency doubled)
+      drift          the CUSUM passes `cusum_h` after `warmup` observations (a sustained shift)
+
+    Alerts are appended to `alerts_path` (JSONL) and, if `webhook_url` (or
+    MODELRADAR_ALERT_WEBHOOK) is set, POSTed there as {"alerts": [...]}.
+    """
+    def __init__(self, db_path: str = STATE_DB, alerts_path: str = ALERTS_PATH, webhook_url: Optional[str] = None,
+                 alpha: float = 0.1, cusum_k: float = 0.5, cusum_h: float = 8.0, jump: float = 1.0,
+                 price_tolerance: float = 0.001, warmup: int = 5, min_rel_sd: float = 0.05, removal_misses: int = 2):
+        self.db_path = db_path
+        self.alerts_path = alerts_path
+        self.webhook_url = webhook_url or os.getenv(WEBHOOK_ENV)
+        self.alpha = alpha
+        self.cusum_k = cusum_k
+        self.cusum_h = cusum_h
+        self.jump = jump
+        self.price_tolerance = price_tolerance
+        self.warmup = warmup
+        # Floor on the standard deviation, relative to the mean, until the variance estimate settles
+        self.min_rel_sd = min_rel_sd
+        self.removal_misses = removal_misses
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """One transaction (committed, or rolled back on error) on a connection closed afterwards."""
+        with contextlib.closing(sqlite3.connect(self.db_path, timeout=30)) as conn, conn:
+            yield conn
+
+    def _load(self, conn: sqlite3.Connection, provider: str) -> Dict[Tuple[str, str], State]:
+        rows = conn.execute(
+            "SELECT model_id, metric, n, mean, var, cusum_pos, cusum_neg, last FROM detector_state WHERE provider = ?",
+            (provider,)
+        ).fetchall()
+        return {(r[0], r[1]): tuple(r[2:]) for r in rows}
+
+    def _save(self, conn: sqlite3.Connection, provider: str, updates: Dict[Tuple[str, str], State], now: str):
+        conn.executemany(
+            "INSERT OR REPLACE INTO detector_state VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(provider, model, metric, *state, now) for (model, metric), state in updates.items()]
+        )
+
+    @staticmethod
+    def _alert(kind: str, provider: str, model: str, now: str, **fields) -> Dict:
+        return {"time": now, "kind": kind, "provider": provider, "model_id": model, **fields}
+
+    def _step(self, state: Optional[State], x: float) -> Tuple[State, Optional[Dict]]:
+        """Fold one observation into (n, mean, var, cusum+, cusum-, last); returns the new state and any change."""
+        if state is None:
+            return (1, x, 0.0, 0.0, 0.0, x), None
+        n, mean, var, pos, neg, _ = state
+        diff = x - mean
+        sd = max(math.sqrt(var), abs(mean) * self.min_rel_sd, 1e-9)
+        z = diff / sd
+        pos = max(0.0, pos + z - self.cusum_k)
+        neg = max(0.0, neg - z - self.cusum_k)
+
+        change = None
+        ratio = x / mean if mean else (1.0 if x == 0 else math.inf)
+        if ratio >= 1 + self.jump or ratio <= 1 / (1 + self.jump):
+            change = {"kind": "jump"}
+        elif n >= self.warmup and max(pos, neg) > self.cusum_h:
+            change = {"kind": "drift", "cusum": round(max(pos, neg), 3)}
+        if change:
+            change.update({"value": round(x, 6), "baseline": round(mean, 6), "change_pct": round(diff / mean * 100, 2) if mean else None,
+                           "direction": "up" if diff > 0 else "down"})
+            pos = neg = 0.0
+
+        if change and change["kind"] == "drift":
+            # A sustained shift: the new level is the baseline from here on
+            mean = x
+        else:
+            # Residuals are capped at 3 sd so a one-off spike barely moves the baseline or inflates the variance
+            step = min(max(diff, -3 * sd), 3 * sd)
+            # Early on, weight like a running mean/variance so the estimate settles quickly
+            alpha = max(self.alpha, 1.0 / (n + 1))
+            mean += alpha * step
+            var = (1 - alpha) * (var + alpha * step * step)
+        return (n + 1, mean, var, pos, neg, x), change
+
+    def observe_catalog(self, catalog: pd.DataFrame, timestamp: Optional[str] = None) -> List[Dict]:
+        """
+        Compare a provider scan (one or more providers' full listings) with the stored
+        prices; emits price_change / new_model / model_removed alerts.
+        """
+        now = timestamp or datetime.now(timezone.utc).isoformat(timespec='seconds')
+        if catalog is None or catalog.empty:
+            return []
+        alerts = []
+        with self._connect() as conn:
+            for provider, listing in catalog.groupby('provider', observed=True, sort=False):
+                provider = str(provider)
+                state = self._load(conn, provider)
+                # A failed or fallback listing (models_suggested) says nothing about what the provider
+                # still serves: only prices are compared
+                live = 'listing_source' not in listing.columns or (listing['listing_source'] == "api").all()
+                known = {model for model, metric in state if metric == "listed"}
+                back = []
+                updates = {}
+                seen = set()
+                for row in listing[['model_id', *PRICE_COLUMNS]].itertuples(index=False):
+                    model = str(row.model_id)
+                    seen.add(model)
+                    if live and model not in known:
+                        # Nothing known about the provider yet (first scan): record without alerting
+                        if known:
+                            alerts.append(self._alert("new_model", provider, model, now,
+                                                      input=_num(row.input), output=_num(row.output)))
+                        updates[(model, "listed")] = (1, 1.0, 0.0, 0.0, 0.0, 1.0)
+                    elif live and (model, "missed") in state:
+                        back.append(model)
+                    for col in PRICE_COLUMNS:
+                        price = _num(getattr(row, col))
+                        if price is None:
+                            continue
+                        key = (model, f"price_{col}")
+                        previous = state.get(key)
+                        if previous is not None:
+                            last = previous[5]
+                            if abs(price - last) <= self.price_tolerance * max(abs(last), 1e-9):
+                                continue
+                            alerts.append(self._alert(
+                                "price_change", provider, model, now, metric=col, value=round(price, 6), baseline=last,
+                                change_pct=round((price - last) / last * 100, 2) if last else None,
+                                direction="up" if price > last else "down", better=price < last))
+                        # Prices are compared with the last listed one; n counts distinct prices
+                        updates[key] = ((previous[0] if previous else 0) + 1, price, 0.0, 0.0, 0.0, price)
+                gone = []
+                for model in sorted(known - seen) if live else []:
+                    # "missed" state: n = consecutive live listings without the model
+                    misses = state.get((model, "missed"), (0,))[0] + 1
+                    if misses >= self.removal_misses:
+                        gone.append(model)
+                        alerts.append(self._alert("model_removed", provider, model, now, missed_scans=misses))
+                    else:
+                        updates[(model, "missed")] = (misses, 0.0, 0.0, 0.0, 0.0, 0.0)
+                if back:
+                    conn.executemany("DELETE FROM detector_state WHERE provider = ? AND model_id = ? AND metric = 'missed'",
+                                     [(provider, m) for m in back])
+                if gone:
+                    conn.executemany("DELETE FROM detector_state WHERE provider = ? AND model_id = ?",
+                                     [(provider, m) for m in gone])
+                self._save(conn, provider, updates, now)
+        self.emit(alerts)
+        return alerts
+
+    def observe_benchmarks(self, results: pd.DataFrame, timestamp: Optional[str] = None) -> List[Dict]:
+        """
+        Fold freshly measured benchmark rows (not re-published old ones) into each
+        model's rolling statistics; emits jump / drift alerts.
+        """
+        now = timestamp or datetime.now(timezone.utc).isoformat(timespec='seconds')
+        if results is None or results.empty:
+            return []
+        results = results.copy()
+        score_cols = [c for c in results.columns if c.endswith("_score")]
+        if score_cols:
+            results['quality'] = results[score_cols].astype(float).mean(axis=1)
+        metrics = [m for m in TRACKED_METRICS if m in results.columns]
+        alerts = []
+        with self._connect() as conn:
+            for provider, rows in results.groupby('provider', observed=True, sort=False):
+                provider = str(provider)
+                state = self._load(conn, provider)
+                updates = {}
+                for row in rows[['model_id', *metrics]].to_dict('records'):
+                    model = str(row['model_id'])
+                    for metric in metrics:
+                        value = _num(row[metric])
+                        if value is None:
+                            continue
+                        new_state, change = self._step(state.get((model, metric)), value)
+                        updates[(model, metric)] = new_state
+                        if change:
+                            worse = (change["direction"] == "down") == TRACKED_METRICS[metric]
+                            alerts.append(self._alert(change.pop("kind"), provider, model, now, metric=metric,
+                                                      better=not worse, **change))
+                self._save(conn, provider, updates, now)
+        self.emit(alerts)
+        return alerts
+
+    def emit(self, alerts: List[Dict]):
+        if not alerts:
+            return
+        for alert in alerts:
+            count("change_alerts_total", kind=alert["kind"], provider=alert["provider"])
+        lines = "".join(json.dumps(a, default=float) + "\n" for a in alerts)
+        os.makedirs(os.path.dirname(self.alerts_path) or ".", exist_ok=True)
+        with _ALERTS_LOCK:
+            with open(self.alerts_path, "a") as f:
+                f.write(lines)
+        print(f"Change detector: {len(alerts)} alert(s) -> {self.alerts_path}")
+        if self.webhook_url:
+            try:
+                requests.post(self.webhook_url, json={"alerts": alerts}, timeout=5)
+            except requests.RequestException as e:
+                print(f"Alert webhook failed: {e}")
+
+
+def _num(value) -> Optional[float]:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check a scan (and optionally fresh benchmark results) for changes.")
+    parser.add_argument("--catalog", default=CATALOG_PATH)
+    parser.add_argument("--benchmarks", help=f"Fresh benchmark results to fold in (e.g. {BENCHMARK_PATH} right after "
+                                             "a non-incremental run); each call counts as new observations.")
+    parser.add_argument("--webhook", help=f"POST alerts to this URL (default: ${WEBHOOK_ENV}).")
+    args = parser.parse_args()
+    detector = ChangeDetector(webhook_url=args.webhook)
+    alerts = detector.observe_catalog(read_frame(args.catalog))
+    if args.benchmarks:
+        alerts += detector.observe_benchmarks(read_frame(args.benchmarks))
+    for alert in alerts:
+        print(json.dumps(alert, default=float))
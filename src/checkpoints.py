@@ -0,0 +1,67 @@
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+
+def file_digest(path: str) -> Optional[str]:
+    """sha1 of a file's contents, or None if it doesn't exist."""
+    if not os.path.exists(path):
+        return None
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class NodeCheckpoints:
+    """
+    Per-node pipeline checkpoints in one JSON file.
+
+    A node's fingerprint hashes the contents of its input files plus any extra
+    parameters. If a node finished with the same fingerprint and its outputs are still
+    on disk unchanged, it can be skipped; since every finished node is recorded as
+    soon as it completes, a crashed run resumes from the last good node.
+    """
+    def __init__(self, path: str = "data/pipeline/checkpoints.json"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                self._entries = json.load(f)
+
+    @staticmethod
+    def fingerprint(inputs: Iterable[str] = (), extra: Optional[Dict] = None) -> str:
+        payload = {"files": {p: file_digest(p) for p in sorted(inputs)}, "extra": extra or {}}
+        return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def is_fresh(self, node: str, fingerprint: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(node)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return False
+        return all(file_digest(p) == digest for p, digest in entry["outputs"].items())
+
+    def save(self, node: str, fingerprint: str, outputs: List[str], seconds: float):
+        entry = {
+            "fingerprint": fingerprint,
+            "outputs": {p: file_digest(p) for p in outputs},
+            "seconds": round(seconds, 3),
+            "finished_at": datetime.now().isoformat(timespec='seconds'),
+        }
+        with self._lock:
+            self._entries[node] = entry
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path + ".tmp", 'w') as f:
+                json.dump(self._entries, f, indent=2, sort_keys=True)
+            os.replace(self.path + ".tmp", self.path)
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
@@ -1,39 +1,178 @@
 import pandas as pd
 import json
 import os
+import hashlib
 from datetime import datetime
+from typing import Dict, Optional
+from ranking_artifact import RANKINGS_ARTIFACT, load_rankings
+from instrumentation import timed
+from intelligence_engine import arbitrage_masks
+from schema import widen
+
+# Relative price move that counts as a price change in the changelog
+PRICE_TOLERANCE = 1e-9
+# Rows converted to dicts at a time when indexing the rankings
+INDEX_CHUNK = 65536
+
+
+def _atomic_write(path: str, text: str):
+    """Write via a temp file and rename so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def _digest(obj) -> str:
+    return hashlib.sha1(json.dumps(obj, sort_keys=True, default=float).encode()).hexdigest()
+
 
 class DaaSGenerator:
-    def __init__(self, rankings_path: str = "data/model_rankings.csv", output_path: str = "data/live_intel.json"):
+    """
+    Builds data/live_intel.json from the rankings.
+
+    In incremental mode (the default) the feed carries a content hash that ignores
+    generated_at, and nothing is rewritten when neither it nor any model in the
+    per-model index changed, so generated_at only moves when the data does. Each real change also updates three sidecar files:
+    live_intel_index.json (per-model hash, rank and price, used to diff the next run),
+    live_intel_delta.json (the latest change set, for pollers) and
+    live_intel_changelog.jsonl (every change set, one per line).
+    """
+    def __init__(self, rankings_path: str = RANKINGS_ARTIFACT, output_path: str = "data/live_intel.json",
+                 incremental: bool = True):
         self.rankings_path = rankings_path
         self.output_path = output_path
+        self.incremental = incremental
+        base = os.path.splitext(output_path)[0]
+        self.index_path = base + "_index.json"
+        self.delta_path = base + "_delta.json"
+        self.changelog_path = base + "_changelog.jsonl"
 
-    def generate_feed(self):
-        if not os.path.exists(self.rankings_path):
-            print(f"Error: {self.rankings_path} not found.")
-            return False
-            
-        df = pd.read_csv(self.rankings_path)
-        
-        # Structure the data for a professional API feed
-        intel_feed = {
+    def build_feed(self, df: pd.DataFrame) -> dict:
+        """The feed document for a rankings frame; shared by generate_feed and the feed server."""
+        # Structure the data for a professional API feed; same thresholds as IntelligenceEngine.detect_arbitrage
+        high_perf, high_speed = arbitrage_masks(df)
+        return {
             "metadata": {
                 "generated_at": datetime.now().isoformat(),
                 "total_models_scanned": len(df),
                 "license": "ModelRadar Commercial-DaaS-v1"
             },
-            "top_value_models": df.head(10).to_dict('records'),
+            "top_value_models": widen(df.head(10)).to_dict('records'),
             "arbitrage_alerts": {
-                "high_performance": df[(df['avg_perf'] > 0.8) & (df['avg_cost'] < 0.5)].to_dict('records'),
-                "high_speed": df[(df['avg_speed'] > 100) & (df['avg_cost'] < 0.1)].to_dict('records')
+                "high_performance": widen(df[high_perf]).to_dict('records'),
+                "high_speed": widen(df[high_speed]).to_dict('records')
             }
         }
-        
-        os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
-        with open(self.output_path, 'w') as f:
-            json.dump(intel_feed, f, indent=4)
-            
-        print(f"DaaS Feed generated at {self.output_path}")
+
+    @staticmethod
+    def content_hash(feed: dict) -> str:
+        """Hash of the feed content, excluding generation metadata."""
+        metadata = {k: v for k, v in feed["metadata"].items() if k not in ("generated_at", "content_hash")}
+        return _digest({**feed, "metadata": metadata})
+
+    @staticmethod
+    def model_index(df: pd.DataFrame) -> Dict[str, Dict]:
+        """{provider/model_id: {hash, rank, input, output}} in ranking order (rank 1 = best)."""
+        index = {}
+        rank = 0
+        # Records are built a chunk at a time so the whole catalog is never held as dicts
+        for start in range(0, len(df), INDEX_CHUNK):
+            for record in widen(df.iloc[start:start + INDEX_CHUNK]).to_dict('records'):
+                rank += 1
+                key = f"{record['provider']}/{record['model_id']}"
+                if key in index:
+                    continue
+                index[key] = {
+                    "hash": _digest(record),
+                    "rank": rank,
+                    "input": record.get('input'),
+                    "output": record.get('output'),
+                }
+        return index
+
+    @staticmethod
+    def diff_index(previous: Dict[str, Dict], current: Dict[str, Dict]) -> Dict:
+        """Models added, removed, repriced, moved in rank, or otherwise updated."""
+        def price_moved(a, b):
+            if a is None or b is None or a != a or b != b:
+                return (a is None or a != a) != (b is None or b != b)
+            return abs(a - b) > PRICE_TOLERANCE * max(1.0, abs(a))
+
+        changes = {"added": [], "removed": [], "price_changed": [], "rank_moved": [], "updated": []}
+        for key, entry in current.items():
+            old = previous.get(key)
+            if old is None:
+                changes["added"].append({"model": key, "rank": entry["rank"]})
+                continue
+            if old["hash"] == entry["hash"] and old["rank"] == entry["rank"]:
+                continue
+            repriced = price_moved(old.get("input"), entry.get("input")) or price_moved(old.get("output"), entry.get("output"))
+            if repriced:
+                changes["price_changed"].append({
+                    "model": key,
+                    "input": [old.get("input"), entry.get("input")],
+                    "output": [old.get("output"), entry.get("output")],
+                })
+            if old["rank"] != entry["rank"]:
+                changes["rank_moved"].append({"model": key, "from": old["rank"], "to": entry["rank"]})
+            if old["hash"] != entry["hash"] and not repriced:
+                changes["updated"].append({"model": key})
+        changes["removed"] = [{"model": key} for key in previous if key not in current]
+        return changes
+
+    def _load_json(self, path: str) -> Optional[dict]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (ValueError, OSError):
+            return None
+
+    @timed("feed.generate")
+    def generate_feed(self):
+        df = load_rankings(self.rankings_path)
+        if df is None:
+            print(f"Error: {self.rankings_path} not found.")
+            return False
+
+        intel_feed = self.build_feed(df)
+        if not self.incremental:
+            _atomic_write(self.output_path, json.dumps(intel_feed, indent=4))
+            print(f"DaaS Feed generated at {self.output_path}")
+            return True
+
+        content_hash = self.content_hash(intel_feed)
+        previous_feed = self._load_json(self.output_path) or {}
+        previous_hash = previous_feed.get("metadata", {}).get("content_hash")
+        # The feed hash only covers the top models and alerts; the per-model index catches
+        # repricing, rank moves and removals anywhere in the rankings
+        index = self.model_index(df)
+        previous_index = self._load_json(self.index_path)
+        changes = self.diff_index((previous_index or {}).get("models", {}), index)
+        if previous_hash == content_hash and previous_index is not None and not any(changes.values()):
+            print(f"DaaS Feed unchanged ({content_hash[:12]}); {self.output_path} left as is.")
+            return True
+
+        intel_feed["metadata"]["content_hash"] = content_hash
+        delta = {
+            "generated_at": intel_feed["metadata"]["generated_at"],
+            "content_hash": content_hash,
+            "previous_hash": previous_hash,
+            **changes,
+        }
+
+        # The feed is written last: its content_hash marks the run as complete
+        _atomic_write(self.index_path, json.dumps({"content_hash": content_hash, "models": index}, indent=1, default=float))
+        _atomic_write(self.delta_path, json.dumps(delta, indent=4, default=float))
+        with open(self.changelog_path, 'a') as f:
+            f.write(json.dumps(delta, default=float) + "\n")
+        _atomic_write(self.output_path, json.dumps(intel_feed, indent=4))
+
+        summary = ", ".join(f"{len(delta[k])} {k.replace('_', ' ')}" for k in ("added", "removed", "price_changed", "rank_moved", "updated"))
+        print(f"DaaS Feed generated at {self.output_path} ({summary})")
         return True
 
 if __name__ == "__main__":
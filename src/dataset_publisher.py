@@ -1,26 +1,138 @@
 import pandas as pd
 import os
-from datetime import datetime
+import json
+import glob
+import time
+import random
+import asyncio
+from datetime import datetime, date, timezone
+from typing import Dict, List, Optional
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from ranking_artifact import load_rankings
+from history import IntelHistory, HISTORY_DIR, MANIFEST_NAME, KEY_COLUMNS, load_manifest
+from hub_client import DEFAULT_CHUNK_SIZE, HUB_ENDPOINT_ENV, file_sha256, hub_from_env
+from benchmark_scheduler import RetryableError
+from instrumentation import count, timed
+from schema import widen
+
+# Files that make up the published dataset, relative to data_dir
+PUBLISH_PATTERNS = ["model_intel_*.parquet", os.path.join(HISTORY_DIR, "**", "*.parquet"), os.path.join(HISTORY_DIR, MANIFEST_NAME)]
+# What has been published where: {"repo": ..., "files": {path: {"sha256", "size", "mtime_ns", "published"}}}
+PUBLISH_MANIFEST = "publish_manifest.json"
+# Copy of the manifest kept in the dataset repo, so a fresh checkout knows what is already there
+REMOTE_MANIFEST = "_publish_manifest.json"
 
 class DatasetPublisher:
     def __init__(self, data_dir: str = "data"):
         self.data_dir = data_dir
 
+    @timed("publish.prepare_parquet")
     def prepare_parquet(self):
-        rankings_path = os.path.join(self.data_dir, "model_rankings.csv")
-        if not os.path.exists(rankings_path):
+        df = load_rankings(os.path.join(self.data_dir, "model_rankings.arrow"),
+                           csv_path=os.path.join(self.data_dir, "model_rankings.csv"))
+        if df is None:
             print("No rankings found to publish.")
             return None
         
-        df = pd.read_csv(rankings_path)
         timestamp = datetime.now().strftime("%Y-%m-%d")
         filename = f"model_intel_{timestamp}.parquet"
         publish_path = os.path.join(self.data_dir, filename)
         
-        df.to_parquet(publish_path, index=False)
+        # Plain strings/float64, so daily snapshots keep one schema for history compaction
+        widen(df).to_parquet(publish_path, index=False)
         print(f"Parquet dataset prepared: {publish_path}")
         return publish_path
 
+    @timed("publish.compact_history")
+    def compact_history(self, include_current_month: bool = False, remove_daily: bool = False,
+                        row_group_size: int = 65536) -> List[str]:
+        """
+        Roll daily model_intel_*.parquet snapshots into monthly Hive-style partitions
+        (history/year=YYYY/month=MM/part-0.parquet) sorted by provider, model_id.
+
+        Consecutive days on which a model's row is unchanged collapse into one row
+        spanning snapshot_date..last_seen; runs never cross a month, so each partition
+        is self-contained and re-compacting a month only rewrites that month. The
+        current month is left to the daily append path unless include_current_month.
+        Returns the partition paths written.
+        """
+        history = IntelHistory(self.data_dir)
+        manifest = load_manifest(self.data_dir)
+        this_month = date.today().strftime("%Y-%m")
+
+        by_month: Dict[str, List] = {}
+        for day, path in history.snapshots():
+            month = day.strftime("%Y-%m")
+            if month == this_month and not include_current_month:
+                continue
+            by_month.setdefault(month, []).append((day, path))
+
+        written = []
+        for month, snaps in sorted(by_month.items()):
+            entry = manifest["months"].get(month)
+            tables = []
+            if entry:
+                tables.append(pq.read_table(os.path.join(self.data_dir, entry["path"])))
+            for day, path in snaps:
+                t = pq.read_table(path)
+                day_col = pa.array([day] * t.num_rows, pa.date32())
+                tables.append(t.append_column("snapshot_date", day_col).append_column("last_seen", day_col))
+
+            dates = sorted({day for day, _ in snaps} | {date.fromisoformat(d) for d in (entry or {}).get("dates", [])})
+            runs = self._collapse_runs(pa.concat_tables(tables, promote_options="default"), dates)
+
+            year, mon = month.split("-")
+            rel_path = os.path.join(HISTORY_DIR, f"year={year}", f"month={mon}", "part-0.parquet")
+            out_path = os.path.join(self.data_dir, rel_path)
+            os.makedirs(os.path.dirname(out_path), exist_ok=True)
+            tmp_path = out_path + ".tmp"
+            pq.write_table(
+                runs, tmp_path, row_group_size=row_group_size, write_statistics=True,
+                sorting_columns=[pq.SortingColumn(runs.schema.get_field_index(c)) for c in KEY_COLUMNS + ["snapshot_date"]]
+            )
+            os.replace(tmp_path, out_path)
+
+            manifest["months"][month] = {"path": rel_path, "dates": [d.isoformat() for d in dates], "rows": runs.num_rows}
+            written.append(out_path)
+            print(f"Compacted {len(snaps)} daily snapshots into {rel_path} ({runs.num_rows} rows).")
+
+        if written:
+            manifest_path = os.path.join(self.data_dir, HISTORY_DIR, MANIFEST_NAME)
+            with open(manifest_path + ".tmp", 'w') as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+            os.replace(manifest_path + ".tmp", manifest_path)
+            if remove_daily:
+                for snaps in by_month.values():
+                    for _, path in snaps:
+                        os.remove(path)
+        return written
+
+    @staticmethod
+    def _collapse_runs(table: pa.Table, dates: List[date]) -> pa.Table:
+        """Merge rows that continue an unchanged run (same values, adjacent snapshot days)."""
+        table = table.sort_by([(c, "ascending") for c in KEY_COLUMNS + ["snapshot_date"]])
+        df = table.to_pandas()
+        ordinal = {d: i for i, d in enumerate(dates)}
+        start_ord = df["snapshot_date"].map(ordinal).to_numpy()
+        end_ord = df["last_seen"].map(ordinal).to_numpy()
+
+        value_cols = [c for c in df.columns if c not in KEY_COLUMNS + ["snapshot_date", "last_seen"]]
+        prev = df.shift()
+        same_key = (df[KEY_COLUMNS] == prev[KEY_COLUMNS]).all(axis=1).to_numpy()
+        same_values = ((df[value_cols] == prev[value_cols]) | (df[value_cols].isna() & prev[value_cols].isna())).all(axis=1).to_numpy()
+        adjacent = np.r_[False, start_ord[1:] == end_ord[:-1] + 1]
+        run_id = np.cumsum(~(same_key & same_values & adjacent))
+
+        # Take the first row of each run from the Arrow table so column types are kept as written
+        first_rows = np.flatnonzero(np.r_[True, run_id[1:] != run_id[:-1]])
+        last_seen = df.groupby(run_id, sort=False)["last_seen"].max().to_numpy()
+        runs = table.take(pa.array(first_rows))
+        idx = runs.schema.get_field_index("last_seen")
+        return runs.set_column(idx, "last_seen", pa.array(last_seen, pa.date32()))
+
+    @timed("publish.upload")
     def publish_to_hf(self, file_path: str, repo_id: str):
         """
         Uploads the dataset to Hugging Face Datasets.
@@ -48,10 +160,152 @@ class DatasetPublisher:
             print(f"HF Upload failed: {e}")
             return False
 
+    def _load_publish_manifest(self, repo_id: str, hub) -> Dict:
+        path = os.path.join(self.data_dir, PUBLISH_MANIFEST)
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get("repo") == repo_id:
+                return manifest
+        remote = hub.fetch(REMOTE_MANIFEST)
+        if remote:
+            manifest = json.loads(remote)
+            print(f"Using the published manifest from {repo_id} ({len(manifest.get('files', {}))} files).")
+            # Local mtimes are unknown, so every file is re-hashed once against it
+            for entry in manifest.get("files", {}).values():
+                entry.pop("mtime_ns", None)
+            return manifest
+        return {"repo": repo_id, "files": {}}
+
+    def _save_publish_manifest(self, manifest: Dict):
+        path = os.path.join(self.data_dir, PUBLISH_MANIFEST)
+        with open(path + ".tmp", 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(path + ".tmp", path)
+
+    def local_files(self, known: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+        """
+        {relative path: {"sha256", "size", "mtime_ns"}} for the files in PUBLISH_PATTERNS.
+        A file whose size and mtime match its `known` entry keeps that hash instead of
+        being read again, so an unchanged history costs one stat() per file.
+        """
+        known = known or {}
+        files = {}
+        for pattern in PUBLISH_PATTERNS:
+            for full in glob.glob(os.path.join(self.data_dir, pattern), recursive=True):
+                rel = os.path.relpath(full, self.data_dir).replace(os.sep, "/")
+                st = os.stat(full)
+                entry = known.get(rel)
+                if entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+                    sha256 = entry["sha256"]
+                else:
+                    sha256 = file_sha256(full)
+                files[rel] = {"sha256": sha256, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        return files
+
+    @timed("publish.dataset")
+    def publish(self, repo_id: str, hub=None, concurrency: int = 4, max_retries: int = 5, backoff_base: float = 0.5,
+                chunk_size: int = DEFAULT_CHUNK_SIZE, delete_missing: bool = False) -> Dict:
+        """
+        Publish the history dataset (daily snapshots, monthly partitions, compaction
+        manifest) to `repo_id`, uploading only files that are new or whose content hash
+        differs from the publish manifest, so the cost follows the daily delta rather than
+        the size of the history. Files are sent `concurrency` at a time over `hub`
+        (hub_client.HttpHub or HfHub; by default chosen by hub_from_env). Retryable
+        failures back off exponentially and, on hubs with resumable uploads, continue from
+        the bytes already received. Files dropped locally (daily snapshots rolled into a
+        month) are only deleted remotely if `delete_missing` is set.
+
+        The manifest (data/publish_manifest.json, mirrored to the repo) is rewritten after
+        every completed file, so an interrupted run picks up where it stopped and
+        re-running after success transfers nothing.
+        """
+        hub = hub or hub_from_env(repo_id)
+        return asyncio.run(self._publish(repo_id, hub, concurrency, max_retries, backoff_base, chunk_size, delete_missing))
+
+    async def _publish(self, repo_id: str, hub, concurrency: int, max_retries: int, backoff_base: float,
+                       chunk_size: int, delete_missing: bool) -> Dict:
+        start = time.monotonic()
+        manifest = self._load_publish_manifest(repo_id, hub)
+        published = manifest["files"]
+        local = await asyncio.to_thread(self.local_files, published)
+        changed = sorted(p for p, f in local.items() if published.get(p, {}).get("sha256") != f["sha256"])
+        removed = sorted(set(published) - set(local)) if delete_missing else []
+        # Metadata-only refresh (e.g. new mtimes after a checkout) for files already published
+        for path, info in local.items():
+            if path in published and path not in changed:
+                published[path].update(info)
+
+        stats = {"files": len(local), "uploaded": 0, "deleted": 0, "unchanged": len(local) - len(changed),
+                 "failed": [], "bytes_sent": 0, "retries": 0}
+        slots = asyncio.Semaphore(concurrency)
+
+        async def with_retries(label: str, fn, *args):
+            for attempt in range(max_retries + 1):
+                try:
+                    return await asyncio.to_thread(fn, *args)
+                except RetryableError as e:
+                    if attempt == max_retries:
+                        raise
+                    stats["retries"] += 1
+                    count("publish_retries_total", status=e.status)
+                    delay = e.retry_after if e.retry_after is not None else backoff_base * (2 ** attempt)
+                    print(f"Publish {label}: {e}, retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay * (1 + random.random() * 0.25))
+
+        async def upload(path: str):
+            info = local[path]
+            async with slots:
+                try:
+                    result = await with_retries(path, hub.upload, os.path.join(self.data_dir, path), path,
+                                                info["sha256"], info["size"], chunk_size)
+                except Exception as e:
+                    print(f"Publish {path} failed: {e}")
+                    stats["failed"].append(path)
+                    return
+            stats["uploaded"] += 1
+            stats["bytes_sent"] += result["sent"]
+            published[path] = {**info, "published": datetime.now(timezone.utc).isoformat(timespec='seconds')}
+            self._save_publish_manifest(manifest)
+
+        async def delete(path: str):
+            async with slots:
+                try:
+                    await with_retries(path, hub.delete, path)
+                except Exception as e:
+                    print(f"Removing {path} failed: {e}")
+                    stats["failed"].append(path)
+                    return
+            stats["deleted"] += 1
+            published.pop(path, None)
+            self._save_publish_manifest(manifest)
+
+        await asyncio.gather(*(upload(p) for p in changed), *(delete(p) for p in removed))
+        manifest["repo"] = repo_id
+        self._save_publish_manifest(manifest)
+        if changed or removed:
+            try:
+                await with_retries(REMOTE_MANIFEST, self._upload_manifest, hub)
+            except Exception as e:
+                print(f"Publishing {REMOTE_MANIFEST} failed: {e}")
+        stats["seconds"] = round(time.monotonic() - start, 3)
+        print(f"Published to {repo_id}: {stats['uploaded']} uploaded, {stats['deleted']} deleted, "
+              f"{stats['unchanged']} unchanged, {len(stats['failed'])} failed ({stats['bytes_sent']:,} bytes, {stats['seconds']}s).")
+        return stats
+
+    def _upload_manifest(self, hub):
+        path = os.path.join(self.data_dir, PUBLISH_MANIFEST)
+        hub.upload(path, REMOTE_MANIFEST, file_sha256(path), os.path.getsize(path))
+
+
 if __name__ == "__main__":
     publisher = DatasetPublisher()
-    path = publisher.prepare_parquet()
-    if path:
-        # Default repo if not specified via env
-        repo = os.getenv("HF_REPO_ID", "your-username/model-radar-intelligence")
-        publisher.publish_to_hf(path, repo_id=repo)
+    publisher.prepare_parquet()
+    # Roll finished months into data/history; daily snapshots are kept (see modelradar publish --prune-daily)
+    publisher.compact_history()
+    # Default repo if not specified via env
+    repo = os.getenv("HF_REPO_ID", "your-username/model-radar-intelligence")
+    if os.getenv("HUGGINGFACE_TOKEN") or os.getenv(HUB_ENDPOINT_ENV):
+        publisher.publish(repo)
+    else:
+        print("HUGGINGFACE_TOKEN not found. Skipping upload.")
@@ -0,0 +1,236 @@
+import os
+import re
+import json
+import time
+import random
+import shutil
+import hashlib
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from hub_client import HUB_ENDPOINT_ENV, file_sha256
+
+ROUTE = re.compile(r"^/api/datasets/(?P<repo>[^/]+/[^/]+)/(?P<kind>uploads|files)(?:/(?P<rest>.*))?$")
+
+
+class FakeHub:
+    """
+    Local dataset hub implementing the resumable upload protocol of hub_client.HttpHub,
+    for offline publishing tests. Files live under `root/<owner>/<name>/<path>`; partial
+    uploads under `root/.uploads/`, keyed by (repo, path, sha256), so a client (or this
+    server) can restart mid-file and continue from the stored offset.
+
+    `fail_rate` is the share of chunk PUTs that keep only the first half of the chunk
+    and answer 503, like a dropped connection (seeded by `seed`).
+    """
+    def __init__(self, root: Optional[str] = None, host: str = "127.0.0.1", port: int = 0,
+                 fail_rate: float = 0.0, seed: int = 0):
+        self.root = root or tempfile.mkdtemp(prefix="fake_hub_")
+        self.host = host
+        self.port = port
+        self.fail_rate = fail_rate
+        self._rng = random.Random(seed)
+        self._uploads: Dict[str, Dict] = {}
+        self._hashes: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "chunks": 0, "bytes_received": 0, "failures": 0, "resumes": 0, "commits": 0, "deletes": 0}
+        self.httpd = None
+        self._thread = None
+        os.makedirs(os.path.join(self.root, ".uploads"), exist_ok=True)
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def _bump(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    def _file(self, repo: str, path: str) -> str:
+        full = os.path.normpath(os.path.join(self.root, repo, path))
+        if not full.startswith(os.path.join(self.root, repo) + os.sep):
+            raise ValueError(f"path escapes the repo: {path}")
+        return full
+
+    def _stored_sha(self, full: str) -> Optional[str]:
+        if not os.path.exists(full):
+            return None
+        with self._lock:
+            if full not in self._hashes:
+                self._hashes[full] = file_sha256(full)
+            return self._hashes[full]
+
+    def files(self, repo: str) -> Dict[str, str]:
+        """path -> sha256 of every file stored for `repo`."""
+        base = os.path.join(self.root, repo)
+        out = {}
+        for folder, _, names in os.walk(base):
+            for name in names:
+                full = os.path.join(folder, name)
+                out[os.path.relpath(full, base).replace(os.sep, "/")] = self._stored_sha(full)
+        return out
+
+    def make_handler(self):
+        hub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _json(self, status: int, payload: Dict):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+            def _route(self):
+                hub._bump("requests")
+                match = ROUTE.match(self.path.split("?")[0])
+                if not match:
+                    return None
+                return match.group("repo"), match.group("kind"), match.group("rest") or ""
+
+            def do_GET(self):
+                route = self._route()
+                if not route or route[1] != "files":
+                    return self._json(404, {"error": "not found"})
+                full = hub._file(route[0], route[2])
+                if not os.path.isfile(full):
+                    return self._json(404, {"error": "not found"})
+                with open(full, "rb") as f:
+                    data = f.read()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_DELETE(self):
+                route = self._route()
+                if not route or route[1] != "files":
+                    return self._json(404, {"error": "not found"})
+                full = hub._file(route[0], route[2])
+                if not os.path.isfile(full):
+                    return self._json(404, {"error": "not found"})
+                os.remove(full)
+                with hub._lock:
+                    hub._hashes.pop(full, None)
+                hub._bump("deletes")
+                self._json(200, {"deleted": route[2]})
+
+            def do_POST(self):
+                route = self._route()
+                body = self._body()
+                if not route or route[1] != "uploads":
+                    return self._json(404, {"error": "not found"})
+                repo, _, rest = route
+                if not rest:
+                    return self._open(repo, json.loads(body or b"{}"))
+                upload_id, _, action = rest.partition("/")
+                if action != "commit" or upload_id not in hub._uploads:
+                    return self._json(404, {"error": "unknown upload"})
+                return self._commit(upload_id)
+
+            def _open(self, repo: str, request: Dict):
+                path, size, sha256 = request.get("path"), request.get("size"), request.get("sha256")
+                if not path or size is None or not sha256:
+                    return self._json(400, {"error": "path, size and sha256 are required"})
+                full = hub._file(repo, path)
+                upload_id = hashlib.sha1(f"{repo}:{path}:{sha256}".encode()).hexdigest()[:16]
+                if hub._stored_sha(full) == sha256:
+                    return self._json(200, {"upload_id": upload_id, "offset": size, "complete": True})
+                part = os.path.join(hub.root, ".uploads", upload_id + ".part")
+                offset = os.path.getsize(part) if os.path.exists(part) else 0
+                if offset:
+                    hub._bump("resumes")
+                with hub._lock:
+                    hub._uploads[upload_id] = {"repo": repo, "path": path, "size": int(size), "sha256": sha256, "part": part}
+                self._json(200, {"upload_id": upload_id, "offset": offset, "complete": False})
+
+            def do_PUT(self):
+                route = self._route()
+                data = self._body()
+                if not route or route[1] != "uploads" or route[2] not in hub._uploads:
+                    return self._json(404, {"error": "unknown upload"})
+                upload = hub._uploads[route[2]]
+                match = re.match(r"bytes (\d+)-(\d+)/(\d+)", self.headers.get("Content-Range", ""))
+                if not match or int(match.group(2)) - int(match.group(1)) + 1 != len(data):
+                    return self._json(400, {"error": "bad Content-Range"})
+                start = int(match.group(1))
+                with hub._lock:
+                    offset = os.path.getsize(upload["part"]) if os.path.exists(upload["part"]) else 0
+                    if start != offset:
+                        return self._json(409, {"offset": offset})
+                    failed = hub._rng.random() < hub.fail_rate
+                    if failed:
+                        data = data[:len(data) // 2]
+                    with open(upload["part"], "ab") as f:
+                        f.write(data)
+                    hub.stats["chunks"] += 1
+                    hub.stats["bytes_received"] += len(data)
+                if failed:
+                    hub._bump("failures")
+                    return self._json(503, {"error": "simulated dropped connection"})
+                self._json(200, {"offset": offset + len(data)})
+
+            def _commit(self, upload_id: str):
+                upload = hub._uploads[upload_id]
+                part = upload["part"]
+                if not os.path.exists(part) or os.path.getsize(part) != upload["size"]:
+                    return self._json(409, {"offset": os.path.getsize(part) if os.path.exists(part) else 0})
+                digest = file_sha256(part)
+                if digest != upload["sha256"]:
+                    os.remove(part)
+                    return self._json(422, {"error": "sha256 mismatch, upload discarded"})
+                full = hub._file(upload["repo"], upload["path"])
+                os.makedirs(os.path.dirname(full), exist_ok=True)
+                os.replace(part, full)
+                with hub._lock:
+                    hub._hashes[full] = digest
+                    hub._uploads.pop(upload_id, None)
+                    hub.stats["commits"] += 1
+                self._json(200, {"path": upload["path"], "sha256": digest})
+
+        return Handler
+
+    def start(self) -> "FakeHub":
+        """Serve in a background thread; `port` is filled in if it was 0."""
+        self.httpd = ThreadingHTTPServer((self.host, self.port), self.make_handler())
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, remove: bool = False):
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+        if remove:
+            shutil.rmtree(self.root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local dataset hub for offline publishing.")
+    parser.add_argument("--root", help="Storage directory (default: a temp dir).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of chunk uploads cut off with a 503.")
+    args = parser.parse_args()
+    hub = FakeHub(root=args.root, host=args.host, port=args.port, fail_rate=args.fail_rate).start()
+    print(f"Fake hub at {hub.endpoint} (storage: {hub.root}); set {HUB_ENDPOINT_ENV}={hub.endpoint}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        hub.stop()
@@ -0,0 +1,311 @@
+import os
+import json
+import gzip
+import time
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+import numpy as np
+import pandas as pd
+from daas_feed import DaaSGenerator
+from ranking_artifact import RANKINGS_ARTIFACT, RANKINGS_CSV, load_rankings
+from schema import widen
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; clients asking for br get gzip instead
+    brotli = None
+
+# Feed versions kept for ?since= deltas; older tokens get the full model list.
+DELTA_HISTORY = 32
+QUERY_CACHE_SIZE = 1024
+
+
+def _dumps(obj) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), allow_nan=False).encode()
+
+
+def _json_safe(obj):
+    """Replace NaN/inf and numpy scalars so the payload is strict JSON."""
+    if isinstance(obj, dict):
+        return {k: _json_safe(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_json_safe(v) for v in obj]
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if isinstance(obj, float) and not np.isfinite(obj):
+        return None
+    return obj
+
+
+def _records(df: pd.DataFrame) -> List[Dict]:
+    """JSON-safe records (NaN -> null) in ranking order."""
+    return _json_safe(widen(df).to_dict('records'))
+
+
+class Body:
+    """One response payload with its gzip/brotli encodings and ETag computed up front."""
+    __slots__ = ("raw", "gzip", "br", "etag")
+
+    def __init__(self, payload):
+        self.raw = _dumps(payload)
+        self.etag = '"' + hashlib.sha1(self.raw).hexdigest()[:20] + '"'
+        self.gzip = gzip.compress(self.raw, compresslevel=6, mtime=0)
+        self.br = brotli.compress(self.raw, quality=9) if brotli is not None else None
+
+    def encoded(self, accept_encoding: str) -> Tuple[bytes, Optional[str], str]:
+        """(bytes, Content-Encoding, ETag) for the client's Accept-Encoding."""
+        if self.br is not None and "br" in accept_encoding:
+            return self.br, "br", self.etag[:-1] + '-br"'
+        if "gzip" in accept_encoding:
+            return self.gzip, "gzip", self.etag[:-1] + '-gz"'
+        return self.raw, None, self.etag
+
+
+class FeedState:
+    """
+    Immutable snapshot of one rankings version: precomputed bodies for the full feed,
+    plus a provider/perf index for filtered queries. The server swaps whole states on
+    reload, so request threads never see a half-built one.
+    """
+    def __init__(self, df: pd.DataFrame, generator: DaaSGenerator, previous: Optional["FeedState"] = None):
+        records = _records(df)
+        self.keys = [f"{r['provider']}/{r['model_id']}" for r in records]
+        self.records = records
+        self.record_hashes = {k: hashlib.sha1(_dumps(r)).hexdigest() for k, r in zip(self.keys, records)}
+        self.version = hashlib.sha1("".join(sorted(self.record_hashes.values())).encode()).hexdigest()[:16]
+
+        feed = generator.build_feed(df)
+        feed["metadata"]["version"] = self.version
+        self.feed = Body(_json_safe(feed))
+        self.health = Body({"version": self.version, "models": len(records)})
+
+        # Filter index: rows bucketed per provider and ordered by avg_perf
+        self.perf = pd.to_numeric(df['avg_perf'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        self.cost = pd.to_numeric(df['avg_cost'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        self.by_provider: Dict[str, np.ndarray] = {
+            p.lower(): idx for p, idx in df.groupby(df['provider'].astype(str), sort=False).indices.items()
+        }
+        ranked = ~np.isnan(self.perf)
+        self.perf_order = np.flatnonzero(ranked)[np.argsort(self.perf[ranked], kind='stable')]
+        self.perf_sorted = self.perf[self.perf_order]
+
+        # Record hashes of earlier versions, newest last, for ?since= deltas
+        history = OrderedDict(previous.history) if previous is not None else OrderedDict()
+        history.pop(self.version, None)
+        history[self.version] = self.record_hashes
+        while len(history) > DELTA_HISTORY:
+            history.popitem(last=False)
+        self.history = history
+
+        self._queries: "OrderedDict[Tuple, Body]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, key: Tuple, build) -> Body:
+        with self._lock:
+            body = self._queries.get(key)
+            if body is not None:
+                self._queries.move_to_end(key)
+                return body
+        body = Body(build())
+        with self._lock:
+            self._queries[key] = body
+            if len(self._queries) > QUERY_CACHE_SIZE:
+                self._queries.popitem(last=False)
+        return body
+
+    def models(self, provider: Optional[str], min_perf: Optional[float], max_cost: Optional[float],
+               limit: Optional[int]) -> Body:
+        """Models matching every given filter, in ranking order. Raises ValueError for bad filters."""
+        if limit is not None and limit < 0:
+            raise ValueError("limit must be >= 0")
+        for name, value in (("min_perf", min_perf), ("max_cost", max_cost)):
+            # NaN would match nothing (and never hit the query cache)
+            if value is not None and np.isnan(value):
+                raise ValueError(f"{name} must be a number")
+
+        def build():
+            if provider is not None:
+                rows = self.by_provider.get(provider.lower(), np.empty(0, dtype=np.intp))
+                if min_perf is not None:
+                    rows = rows[self.perf[rows] >= min_perf]
+            elif min_perf is not None:
+                rows = self.perf_order[np.searchsorted(self.perf_sorted, min_perf, side='left'):]
+            else:
+                rows = np.arange(len(self.records))
+            if max_cost is not None:
+                rows = rows[self.cost[rows] <= max_cost]
+            rows = np.sort(rows)
+            if limit is not None:
+                rows = rows[:limit]
+            return {"version": self.version, "count": int(len(rows)), "models": [self.records[i] for i in rows]}
+        return self._cached(("models", provider and provider.lower(), min_perf, max_cost, limit), build)
+
+    def delta(self, since: str) -> Body:
+        """Models added or changed since version `since`, plus removed keys."""
+        def build():
+            old = self.history.get(since)
+            if old is None:
+                return {"since": since, "version": self.version, "full": True,
+                        "changed": self.records, "removed": []}
+            changed = [r for k, r in zip(self.keys, self.records) if old.get(k) != self.record_hashes[k]]
+            removed = [k for k in old if k not in self.record_hashes]
+            return {"since": since, "version": self.version, "full": False, "changed": changed, "removed": removed}
+        return self._cached(("delta", since), build)
+
+
+class FeedServer:
+    """
+    Local DaaS endpoint over the shared ranking artifact.
+
+        GET /feed                                   the live_intel.json document
+        GET /models?provider=&min_perf=&max_cost=&limit=
+        GET /delta?since=<version>                  models changed since a feed version
+        GET /health
+
+    Bodies are compact JSON, precompressed once per version (gzip, and brotli when
+    installed) and served with strong ETags; If-None-Match answers 304. The rankings
+    file is re-checked at most every `reload_interval` seconds.
+    """
+    def __init__(self, rankings_path: str = RANKINGS_ARTIFACT, csv_path: str = RANKINGS_CSV,
+                 host: str = "127.0.0.1", port: int = 8080, reload_interval: float = 1.0):
+        self.rankings_path = rankings_path
+        self.csv_path = csv_path
+        self.host = host
+        self.port = port
+        self.reload_interval = reload_interval
+        self.generator = DaaSGenerator(rankings_path=rankings_path)
+        self.state: Optional[FeedState] = None
+        self._file_key = None
+        self._checked = 0.0
+        self._reload_lock = threading.Lock()
+        self.httpd = None
+        self.reload(force=True)
+
+    def _source_key(self):
+        key = []
+        for path in (self.rankings_path, self.csv_path):
+            try:
+                st = os.stat(path)
+                key.append((st.st_mtime_ns, st.st_size))
+            except (FileNotFoundError, TypeError):
+                key.append(None)
+        return tuple(key)
+
+    def reload(self, force: bool = False) -> Optional[FeedState]:
+        """Rebuild the state if the rankings file changed since the last check."""
+        now = time.monotonic()
+        if not force and now - self._checked < self.reload_interval:
+            return self.state
+        with self._reload_lock:
+            if not force and now - self._checked < self.reload_interval:
+                return self.state
+            self._checked = now
+            key = self._source_key()
+            if key == self._file_key and self.state is not None:
+                return self.state
+            df = load_rankings(self.rankings_path, self.csv_path)
+            if df is None:
+                print(f"Feed server: {self.rankings_path} not found.")
+                return self.state
+            state = FeedState(df, self.generator, previous=self.state)
+            self.state, self._file_key = state, key
+            print(f"Feed server: loaded {len(state.records)} models, version {state.version}")
+            return state
+
+    def make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without this Nagle stalls keep-alive clients ~40ms
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                state = server.reload()
+                if state is None:
+                    return self._error(503, "rankings not available")
+                url = urlsplit(self.path)
+                query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                try:
+                    if url.path in ("/feed", "/live_intel.json", "/"):
+                        body = state.feed
+                    elif url.path == "/models":
+                        body = state.models(
+                            query.get("provider"),
+                            float(query["min_perf"]) if "min_perf" in query else None,
+                            float(query["max_cost"]) if "max_cost" in query else None,
+                            int(query["limit"]) if "limit" in query else None,
+                        )
+                    elif url.path == "/delta":
+                        if "since" not in query:
+                            return self._error(400, "missing ?since=<version>")
+                        body = state.delta(query["since"])
+                    elif url.path == "/health":
+                        body = state.health
+                    else:
+                        return self._error(404, "not found")
+                except ValueError as e:
+                    return self._error(400, str(e))
+                self._send(body)
+
+            def _send(self, body: Body):
+                payload, encoding, etag = body.encoded(self.headers.get("Accept-Encoding", ""))
+                inm = self.headers.get("If-None-Match")
+                if inm and (inm.strip() == "*" or etag in [t.strip() for t in inm.split(",")]):
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Vary", "Accept-Encoding")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("ETag", etag)
+                self.send_header("Vary", "Accept-Encoding")
+                self.send_header("Cache-Control", "public, max-age=60")
+                if encoding:
+                    self.send_header("Content-Encoding", encoding)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _error(self, status: int, message: str):
+                payload = _dumps({"error": message})
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    def serve_forever(self):
+        self.httpd = ThreadingHTTPServer((self.host, self.port), self.make_handler())
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        print(f"DaaS feed server listening on http://{self.host}:{self.port}")
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+
+    def shutdown(self):
+        if self.httpd is not None:
+            self.httpd.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the ModelRadar DaaS feed locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--rankings", default=RANKINGS_ARTIFACT)
+    args = parser.parse_args()
+    FeedServer(rankings_path=args.rankings, host=args.host, port=args.port).serve_forever()
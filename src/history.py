@@ -0,0 +1,213 @@
+import os
+import re
+import json
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+from instrumentation import timed
+
+SNAPSHOT_PATTERN = re.compile(r"^model_intel_(\d{4}-\d{2}-\d{2})\.parquet$")
+HISTORY_DIR = "history"
+MANIFEST_NAME = "_manifest.json"
+KEY_COLUMNS = ["provider", "model_id"]
+
+
+def _as_date(value) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+def _date_scalar(value: date) -> pa.Scalar:
+    return pa.scalar(value, pa.date32())
+
+
+def load_manifest(data_dir: str) -> Dict:
+    """Compaction manifest: {"months": {"YYYY-MM": {"path": ..., "dates": [...]}}}."""
+    path = os.path.join(data_dir, HISTORY_DIR, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {"months": {}}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+class IntelHistory:
+    """
+    Lazy query layer over ModelRadar history.
+
+    History lives in two places: monthly Hive-style partitions under data/history
+    (written by DatasetPublisher.compact_history, one row per unchanged run of a
+    model with snapshot_date..last_seen) and daily data/model_intel_YYYY-MM-DD.parquet
+    snapshots not yet compacted. Both are exposed as one pyarrow dataset whose
+    fragments carry date-range partition expressions, so date windows prune files
+    before any footer is read and projections/filters are pushed into the scan.
+    """
+    def __init__(self, data_dir: str = "data"):
+        self.data_dir = data_dir
+        self._listing_key = None
+        self._daily: List[Tuple[date, str]] = []
+        self._compacted: List[Tuple[date, date, str]] = []
+        self._dates: List[date] = []
+        self._schema = None
+
+    def _refresh(self):
+        history_dir = os.path.join(self.data_dir, HISTORY_DIR)
+        manifest_path = os.path.join(history_dir, MANIFEST_NAME)
+        key = (
+            os.stat(self.data_dir).st_mtime_ns if os.path.isdir(self.data_dir) else None,
+            os.stat(manifest_path).st_mtime_ns if os.path.exists(manifest_path) else None,
+        )
+        if key == self._listing_key:
+            return
+
+        compacted, covered = [], set()
+        for month in load_manifest(self.data_dir)["months"].values():
+            dates = sorted(date.fromisoformat(d) for d in month["dates"])
+            covered.update(dates)
+            compacted.append((dates[0], dates[-1], os.path.join(self.data_dir, month["path"])))
+
+        daily = []
+        if os.path.isdir(self.data_dir):
+            for name in os.listdir(self.data_dir):
+                match = SNAPSHOT_PATTERN.match(name)
+                if match:
+                    day = date.fromisoformat(match.group(1))
+                    # Daily files already rolled into a partition would be double counted
+                    if day not in covered:
+                        daily.append((day, os.path.join(self.data_dir, name)))
+
+        self._compacted = sorted(compacted)
+        self._daily = sorted(daily)
+        self._dates = sorted(covered | {d for d, _ in daily})
+        self._schema = None
+        self._listing_key = key
+
+    def snapshots(self) -> List[Tuple[date, str]]:
+        """(snapshot_date, path) for every daily snapshot not yet compacted, oldest first."""
+        self._refresh()
+        return self._daily
+
+    def snapshot_dates(self) -> List[date]:
+        """Every date with history, compacted or not."""
+        self._refresh()
+        return self._dates
+
+    def schema(self) -> pa.Schema:
+        """Newest compacted and daily schemas unified, plus the snapshot_date/last_seen columns."""
+        self._refresh()
+        if self._schema is None:
+            newest = [pq.read_schema(files[-1][-1]) for files in (self._compacted, self._daily) if files]
+            base = pa.unify_schemas(newest, promote_options="permissive") if newest else pa.schema([])
+            for name in ("snapshot_date", "last_seen"):
+                if name not in base.names:
+                    base = base.append(pa.field(name, pa.date32()))
+            self._schema = base
+        return self._schema
+
+    def dataset(self, start=None, end=None) -> Optional[ds.Dataset]:
+        """Dataset over the history overlapping [start, end]; other files are never opened."""
+        self._refresh()
+        start, end = _as_date(start), _as_date(end)
+        paths, partitions = [], []
+        for first, last, path in self._compacted:
+            if (start is None or last >= start) and (end is None or first <= end):
+                paths.append(path)
+                partitions.append(
+                    (ds.field("snapshot_date") >= _date_scalar(first)) & (ds.field("snapshot_date") <= _date_scalar(last)) &
+                    (ds.field("last_seen") >= _date_scalar(first)) & (ds.field("last_seen") <= _date_scalar(last))
+                )
+        for day, path in self._daily:
+            if (start is None or day >= start) and (end is None or day <= end):
+                paths.append(path)
+                partitions.append((ds.field("snapshot_date") == _date_scalar(day)) & (ds.field("last_seen") == _date_scalar(day)))
+        if not paths:
+            return None
+        return ds.FileSystemDataset.from_paths(
+            paths,
+            schema=self.schema(),
+            format=ds.ParquetFileFormat(),
+            filesystem=pafs.LocalFileSystem(),
+            partitions=partitions,
+        )
+
+    @timed("history.scan")
+    def scan(self, columns: Sequence[str], filter: Optional[ds.Expression] = None,
+             start=None, end=None) -> pd.DataFrame:
+        """
+        Project `columns` from every row valid at some point in [start, end].
+        snapshot_date and last_seen are always included.
+        """
+        columns = ["snapshot_date", "last_seen"] + [c for c in columns if c not in ("snapshot_date", "last_seen")]
+        dataset = self.dataset(start, end)
+        if dataset is None:
+            return pd.DataFrame(columns=columns)
+        start, end = _as_date(start), _as_date(end)
+        window = []
+        if start is not None:
+            window.append(ds.field("last_seen") >= _date_scalar(start))
+        if end is not None:
+            window.append(ds.field("snapshot_date") <= _date_scalar(end))
+        for expr in window:
+            filter = expr if filter is None else filter & expr
+        columns = [c for c in columns if c in dataset.schema.names]
+        return dataset.to_table(columns=columns, filter=filter).to_pandas()
+
+    def as_of(self, day, columns: Sequence[str]) -> pd.DataFrame:
+        """State of every model on snapshot `day`."""
+        day = _as_date(day)
+        expr = (ds.field("snapshot_date") <= _date_scalar(day)) & (ds.field("last_seen") >= _date_scalar(day))
+        return self.scan(columns, filter=expr, start=day, end=day)
+
+    def trajectory(self, model_id: str, provider: Optional[str] = None,
+                   metrics: Iterable[str] = ("avg_cost", "avg_perf", "value_score"),
+                   start=None, end=None) -> pd.DataFrame:
+        """
+        Metrics for one model, oldest first. Each row holds from snapshot_date
+        through last_seen (a single day for uncompacted snapshots).
+        """
+        expr = ds.field("model_id") == model_id
+        if provider is not None:
+            expr = expr & (ds.field("provider") == provider)
+        df = self.scan(KEY_COLUMNS + list(metrics), filter=expr, start=start, end=end)
+        return df.sort_values(["provider", "snapshot_date"]).reset_index(drop=True)
+
+    def price_drops(self, start=None, end=None, top: int = 20, metric: str = "avg_cost") -> pd.DataFrame:
+        """Largest decreases in `metric` between consecutive observations of the same model."""
+        df = self.scan(KEY_COLUMNS + [metric], start=start, end=end)
+        if df.empty:
+            return df
+        df = df.sort_values(KEY_COLUMNS + ["snapshot_date"])
+        prev = df.groupby(KEY_COLUMNS, sort=False)[[metric, "last_seen"]].shift()
+        df["previous"] = prev[metric]
+        df["previous_date"] = prev["last_seen"]
+        df["change"] = df[metric] - df["previous"]
+        df["pct_change"] = df["change"] / df["previous"].where(df["previous"] != 0)
+        drops = df[df["change"] < 0]
+        if start is not None:
+            drops = drops[drops["snapshot_date"] >= _as_date(start)]
+        drops = drops.sort_values("change")
+        return drops.head(top).reset_index(drop=True)
+
+    def rank_changes(self, start=None, end=None, metric: str = "value_score", top: int = 20) -> pd.DataFrame:
+        """
+        Rank by `metric` on the first and last snapshot of the window and report movers.
+        Positive rank_change means the model moved up. Only those two days are read.
+        """
+        start, end = _as_date(start), _as_date(end)
+        days = [d for d in self.snapshot_dates() if (start is None or d >= start) and (end is None or d <= end)]
+        if len(days) < 2:
+            return pd.DataFrame()
+        ranked = []
+        for day in (days[0], days[-1]):
+            df = self.as_of(day, KEY_COLUMNS + [metric])[KEY_COLUMNS + [metric]]
+            df["rank"] = df[metric].rank(ascending=False, method="min")
+            ranked.append(df)
+
+        moved = ranked[0].merge(ranked[1], on=KEY_COLUMNS, suffixes=("_start", "_end"))
+        moved["rank_change"] = moved["rank_start"] - moved["rank_end"]
+        moved = moved.reindex(moved["rank_change"].abs().sort_values(ascending=False).index)
+        return moved.head(top).reset_index(drop=True)
@@ -0,0 +1,132 @@
+import os
+import hashlib
+from typing import Dict, Optional
+import requests
+from benchmark_scheduler import RetryableError, RETRYABLE_STATUS
+
+# Point publishing at a hub speaking the resumable upload protocol below (e.g. fake_hub.py)
+# instead of Hugging Face.
+HUB_ENDPOINT_ENV = "MODELRADAR_HUB_ENDPOINT"
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def file_sha256(path: str, block: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for data in iter(lambda: f.read(block), b""):
+            digest.update(data)
+    return digest.hexdigest()
+
+
+class HttpHub:
+    """
+    Client for a dataset hub with resumable chunked uploads:
+
+        POST   /api/datasets/<repo>/uploads               {"path", "size", "sha256"} -> {"upload_id", "offset", "complete"}
+        PUT    /api/datasets/<repo>/uploads/<id>          Content-Range: bytes a-b/size -> {"offset"} (409 + offset if misaligned)
+        POST   /api/datasets/<repo>/uploads/<id>/commit   -> {"path", "sha256"}
+        GET    /api/datasets/<repo>/files/<path>          -> file bytes (404 if absent)
+        DELETE /api/datasets/<repo>/files/<path>
+
+    Opening an upload returns the bytes the hub already holds for that (path, sha256),
+    so calling `upload` again after a failure resumes at that offset instead of resending
+    the file; a file already stored with that hash is complete without any transfer.
+    429/5xx raise RetryableError for the caller to back off and call again.
+    """
+    def __init__(self, endpoint: str, repo_id: str, token: Optional[str] = None, timeout: float = 60.0):
+        self.base = f"{endpoint.rstrip('/')}/api/datasets/{repo_id}"
+        self.repo_id = repo_id
+        self.timeout = timeout
+        self.session = requests.Session()
+        token = token or os.getenv("HUGGINGFACE_TOKEN")
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def _check(self, response: requests.Response, ok=(200,)) -> requests.Response:
+        if response.status_code in RETRYABLE_STATUS:
+            retry_after = response.headers.get("Retry-After")
+            raise RetryableError(response.status_code, float(retry_after) if retry_after else None)
+        if response.status_code not in ok:
+            raise RuntimeError(f"{response.request.method} {response.url}: HTTP {response.status_code} {response.text[:200]}")
+        return response
+
+    def fetch(self, path: str) -> Optional[bytes]:
+        response = self._check(self.session.get(f"{self.base}/files/{path}", timeout=self.timeout), ok=(200, 404))
+        return response.content if response.status_code == 200 else None
+
+    def delete(self, path: str):
+        self._check(self.session.delete(f"{self.base}/files/{path}", timeout=self.timeout), ok=(200, 204, 404))
+
+    def upload(self, local_path: str, path_in_repo: str, sha256: str, size: int,
+               chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
+        """Upload (or resume) one file; returns {"sent": bytes transferred by this call, "resumed_at": offset}."""
+        opened = self._check(self.session.post(f"{self.base}/uploads", json={"path": path_in_repo, "size": size, "sha256": sha256},
+                                               timeout=self.timeout)).json()
+        offset = resumed_at = int(opened["offset"])
+        if opened.get("complete"):
+            return {"sent": 0, "resumed_at": resumed_at}
+        url = f"{self.base}/uploads/{opened['upload_id']}"
+        with open(local_path, "rb") as f:
+            while offset < size:
+                f.seek(offset)
+                chunk = f.read(chunk_size)
+                response = self._check(self.session.put(
+                    url, data=chunk, timeout=self.timeout,
+                    headers={"Content-Range": f"bytes {offset}-{offset + len(chunk) - 1}/{size}",
+                             "Content-Type": "application/octet-stream"}), ok=(200, 409))
+                # 409: the hub holds a different number of bytes (e.g. an earlier PUT landed); continue from there
+                offset = int(response.json()["offset"])
+        self._check(self.session.post(f"{url}/commit", timeout=self.timeout))
+        return {"sent": size - resumed_at, "resumed_at": resumed_at}
+
+
+class HfHub:
+    """
+    The same interface over Hugging Face Datasets. `upload_file` does its own LFS
+    multipart transfer; a retried upload starts the file over. Commit conflicts from
+    concurrent uploads (409/412) are retried like 429/5xx.
+    """
+    def __init__(self, repo_id: str, token: Optional[str] = None):
+        from huggingface_hub import HfApi
+        self.repo_id = repo_id
+        self.token = token or os.getenv("HUGGINGFACE_TOKEN")
+        self.api = HfApi(token=self.token)
+
+    def _call(self, fn, **kwargs):
+        from huggingface_hub.utils import HfHubHTTPError
+        try:
+            return fn(repo_id=self.repo_id, repo_type="dataset", **kwargs)
+        except HfHubHTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status in RETRYABLE_STATUS or status in (409, 412):
+                raise RetryableError(status) from e
+            raise
+
+    def fetch(self, path: str) -> Optional[bytes]:
+        from huggingface_hub import hf_hub_download
+        from huggingface_hub.utils import EntryNotFoundError, RepositoryNotFoundError
+        try:
+            local = self._call(hf_hub_download, filename=path, token=self.token)
+        except (EntryNotFoundError, RepositoryNotFoundError):
+            return None
+        with open(local, "rb") as f:
+            return f.read()
+
+    def delete(self, path: str):
+        from huggingface_hub.utils import EntryNotFoundError
+        try:
+            self._call(self.api.delete_file, path_in_repo=path, commit_message=f"Remove {path}")
+        except EntryNotFoundError:
+            pass
+
+    def upload(self, local_path: str, path_in_repo: str, sha256: str, size: int,
+               chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
+        self._call(self.api.upload_file, path_or_fileobj=local_path, path_in_repo=path_in_repo,
+                   commit_message=f"Publish {path_in_repo}")
+        return {"sent": size, "resumed_at": 0}
+
+
+def hub_from_env(repo_id: str):
+    """HttpHub at $MODELRADAR_HUB_ENDPOINT if set, otherwise Hugging Face."""
+    endpoint = os.getenv(HUB_ENDPOINT_ENV)
+    return HttpHub(endpoint, repo_id) if endpoint else HfHub(repo_id)
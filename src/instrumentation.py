@@ -0,0 +1,272 @@
+import os
+import json
+import time
+import threading
+import functools
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple
+
+# Upper bounds (seconds) for latency histograms; the last bucket is +Inf.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Individual spans kept for the run timeline; aggregates are always complete.
+MAX_SPANS = 10000
+PROFILE_DIR = "data/pipeline/profiles"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _NoopSpan:
+    """Returned by span() while instrumentation is off, so disabled call sites cost one check."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **labels):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    __slots__ = ("metrics", "name", "labels", "start")
+
+    def __init__(self, metrics: "Metrics", name: str, labels: Dict):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics._finish_span(self, time.perf_counter() - self.start, exc_type is not None)
+        return False
+
+    def set(self, **labels):
+        """Attach labels known only inside the span (e.g. an HTTP status)."""
+        self.labels.update(labels)
+
+
+class Metrics:
+    """
+    In-process run metrics: timed spans, counters and latency histograms, all keyed by
+    name + labels. Thread-safe; disabled by default (MODELRADAR_METRICS=1 or enable()),
+    in which case span/count/observe return immediately.
+    """
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self, enabled: bool = True):
+        self.enabled = enabled
+
+    def reset(self):
+        with self._lock:
+            self._t0 = time.perf_counter()
+            self._started_at = time.time()
+            self._counters: Dict[Tuple[str, LabelKey], float] = {}
+            self._histograms: Dict[Tuple[str, LabelKey], list] = {}
+            self._span_stats: Dict[Tuple[str, LabelKey], list] = {}
+            self._spans = []
+
+    # --- recording -------------------------------------------------------
+    def span(self, name: str, **labels):
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, labels)
+
+    def timed(self, name: str) -> Callable:
+        """Decorator form of span()."""
+        def wrap(fn):
+            @functools.wraps(fn)
+            def inner(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with Span(self, name, {}):
+                    return fn(*args, **kwargs)
+            return inner
+        return wrap
+
+    def count(self, name: str, value: float = 1.0, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = [[0] * (len(LATENCY_BUCKETS) + 1), 0.0, 0]
+            i = 0
+            while i < len(LATENCY_BUCKETS) and value > LATENCY_BUCKETS[i]:
+                i += 1
+            hist[0][i] += 1
+            hist[1] += value
+            hist[2] += 1
+
+    def record_http(self, stage: str, provider: str, status, seconds: float, nbytes: int = 0):
+        """One HTTP exchange: request/byte counters and the per-provider latency histogram."""
+        if not self.enabled:
+            return
+        self.count("http_requests_total", stage=stage, provider=provider, status=status)
+        if nbytes:
+            self.count("http_response_bytes_total", nbytes, stage=stage, provider=provider)
+        self.observe("http_latency_seconds", seconds, stage=stage, provider=provider)
+
+    def _finish_span(self, span: Span, seconds: float, failed: bool):
+        key = (span.name, _label_key(span.labels))
+        with self._lock:
+            stats = self._span_stats.get(key)
+            if stats is None:
+                stats = self._span_stats[key] = [0, 0.0, 0.0, 0]
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+            stats[3] += int(failed)
+            if len(self._spans) < MAX_SPANS:
+                self._spans.append({
+                    "name": span.name, "labels": dict(span.labels), "thread": threading.current_thread().name,
+                    "start": round(span.start - self._t0, 6), "seconds": round(seconds, 6), "error": failed,
+                })
+
+    # --- export ----------------------------------------------------------
+    def report(self) -> Dict:
+        """JSON-serialisable snapshot of everything recorded so far."""
+        with self._lock:
+            return {
+                "started_at": self._started_at,
+                "elapsed": round(time.perf_counter() - self._t0, 3),
+                "spans": [
+                    {"name": n, "labels": dict(l), "count": s[0], "total_seconds": round(s[1], 6),
+                     "max_seconds": round(s[2], 6), "errors": s[3]}
+                    for (n, l), s in sorted(self._span_stats.items(), key=lambda kv: -kv[1][1])
+                ],
+                "counters": [{"name": n, "labels": dict(l), "value": v} for (n, l), v in sorted(self._counters.items())],
+                "histograms": [
+                    {"name": n, "labels": dict(l), "buckets": list(LATENCY_BUCKETS) + ["+Inf"], "counts": list(h[0]),
+                     "sum": round(h[1], 6), "count": h[2]}
+                    for (n, l), h in sorted(self._histograms.items())
+                ],
+                "timeline": list(self._spans),
+            }
+
+    def prometheus(self, prefix: str = "modelradar_") -> str:
+        """Prometheus text exposition format (counters, histograms, span summaries)."""
+        def fmt(labels: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+            return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, labels), value in sorted(self._counters.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {prefix}{name} counter")
+                    typed.add(name)
+                lines.append(f"{prefix}{name}{fmt(labels)} {int(value) if value.is_integer() else value}")
+            for (name, labels), (counts, total, n) in sorted(self._histograms.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {prefix}{name} histogram")
+                    typed.add(name)
+                cumulative = 0
+                for bound, c in zip(list(LATENCY_BUCKETS) + ["+Inf"], counts):
+                    cumulative += c
+                    lines.append(f"{prefix}{name}_bucket{fmt(labels, (('le', str(bound)),))} {cumulative}")
+                lines.append(f"{prefix}{name}_sum{fmt(labels)} {total:.6f}")
+                lines.append(f"{prefix}{name}_count{fmt(labels)} {n}")
+            if self._span_stats:
+                lines.append(f"# TYPE {prefix}span_seconds summary")
+                for (name, labels), (n, total, _, _) in sorted(self._span_stats.items()):
+                    key = (("span", name),) + labels
+                    lines.append(f"{prefix}span_seconds_sum{fmt(key)} {total:.6f}")
+                    lines.append(f"{prefix}span_seconds_count{fmt(key)} {n}")
+                lines.append(f"# TYPE {prefix}span_seconds_max gauge")
+                for (name, labels), (_, _, longest, _) in sorted(self._span_stats.items()):
+                    lines.append(f"{prefix}span_seconds_max{fmt((('span', name),) + labels)} {longest:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, json_path: str = "data/pipeline/metrics.json", prom_path: Optional[str] = "data/pipeline/metrics.prom"):
+        os.makedirs(os.path.dirname(json_path) or ".", exist_ok=True)
+        with open(json_path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        if prom_path:
+            with open(prom_path, 'w') as f:
+                f.write(self.prometheus())
+        print(f"Metrics written to {json_path}" + (f" and {prom_path}" if prom_path else ""))
+
+
+METRICS = Metrics(enabled=os.getenv("MODELRADAR_METRICS", "") not in ("", "0", "false"))
+span = METRICS.span
+count = METRICS.count
+observe = METRICS.observe
+record_http = METRICS.record_http
+timed = METRICS.timed
+
+
+@contextmanager
+def profiled(name: str, mode: Optional[str] = None, out_dir: str = PROFILE_DIR):
+    """
+    Opt-in profiler around one block (an orchestrator node). `mode` (or MODELRADAR_PROFILE)
+    is "cprofile" -> <out_dir>/<name>.prof, or "pyinstrument" -> <out_dir>/<name>.html.
+    Only one profiler can hook the interpreter at a time; concurrent nodes run unprofiled.
+    """
+    mode = (mode or os.getenv("MODELRADAR_PROFILE") or "").lower()
+    if not mode:
+        yield
+        return
+
+    os.makedirs(out_dir, exist_ok=True)
+    if mode == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("pyinstrument not installed; profiling with cProfile instead.")
+            mode = "cprofile"
+    if mode == "pyinstrument":
+        profiler = Profiler()
+        try:
+            profiler.start()
+        except RuntimeError as e:
+            print(f"Not profiling {name}: {e}")
+            yield
+            return
+        try:
+            yield
+        finally:
+            profiler.stop()
+            with open(os.path.join(out_dir, f"{name}.html"), 'w') as f:
+                f.write(profiler.output_html())
+        return
+
+    import cProfile
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        print(f"Not profiling {name}: {e}")
+        yield
+        return
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(os.path.join(out_dir, f"{name}.prof"))
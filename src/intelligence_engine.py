@@ -1,22 +1,224 @@
 import pandas as pd
-import os
-from typing import Dict
+import numpy as np
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+from ranking_artifact import write_rankings, load_rankings
+from instrumentation import span
+from schema import CATALOG_PATH, BENCHMARK_PATH, compact, read_frame, widen
+from task_registry import CONTEXT_TIERS
+
+# Default objectives for the Pareto frontier: column -> True if higher is better.
+PARETO_OBJECTIVES = {"avg_perf": True, "avg_cost": False, "avg_speed": True}
+# First latency column present joins the objectives (lower is better).
+LATENCY_COLUMNS = ["latency_p90", "avg_latency", "avg_ttft"]
+
+# Weighted scoring profiles per workload: column -> weight. Cost/latency weights reward being low.
+SCORING_PROFILES = {
+    "balanced": {"avg_perf": 0.5, "avg_cost": 0.3, "avg_speed": 0.2},
+    "coding": {"Coding_score": 0.6, "avg_cost": 0.25, "avg_speed": 0.15},
+    "math": {"Math_score": 0.6, "avg_cost": 0.3, "avg_speed": 0.1},
+    "reasoning": {"Reasoning_score": 0.6, "avg_cost": 0.3, "avg_speed": 0.1},
+    "realtime": {"avg_perf": 0.3, "avg_speed": 0.3, "latency_p90": 0.3, "avg_cost": 0.1},
+}
+
+# Arbitrage alerts (detect_arbitrage and the feed): good-enough quality or speed below a price ceiling.
+HIGH_PERF_MIN = 0.6
+HIGH_PERF_MAX_COST = 2.00
+HIGH_SPEED_MIN = 50
+HIGH_SPEED_MAX_COST = 1.00
+
+
+def _as_minimization(df: pd.DataFrame, objectives: Dict[str, bool]) -> np.ndarray:
+    """
+    Stack objectives as columns to minimize; missing values become the worst possible
+    (inf), so such a row is still on the frontier if nothing matches it on the rest.
+    """
+    cols = []
+    for col, higher_is_better in objectives.items():
+        values = df[col].to_numpy(dtype=float)
+        values = -values if higher_is_better else values
+        cols.append(np.where(np.isnan(values), np.inf, values))
+    return np.column_stack(cols) if cols else np.empty((len(df), 0))
+
+
+def pareto_front_2d(points: np.ndarray) -> np.ndarray:
+    """Non-dominated mask for two minimized objectives. O(n log n)."""
+    n = len(points)
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+    order = np.lexsort((points[:, 1], points[:, 0]))
+    x, y = points[order, 0], points[order, 1]
+    # A point survives if it has the lowest y of its x-run and beats every point with smaller x.
+    # The first run has no such points, which matters when its y is inf (a missing objective).
+    run_start = np.maximum.accumulate(np.where(np.r_[True, x[1:] != x[:-1]], np.arange(n), 0))
+    best_before = np.r_[np.inf, np.minimum.accumulate(y)[:-1]]
+    mask_sorted = (y == y[run_start]) & ((y < best_before[run_start]) | (run_start == 0))
+    mask = np.zeros(n, dtype=bool)
+    mask[order] = mask_sorted
+    return mask
+
+
+def pareto_front_3d(points: np.ndarray) -> np.ndarray:
+    """
+    Non-dominated mask for three minimized objectives. O(n log n): sweep the first
+    objective while keeping a staircase of the best (second, third) trade-offs seen.
+    """
+    n = len(points)
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+    # Identical points never dominate each other; solve on the distinct ones.
+    uniq, inverse = np.unique(points, axis=0, return_inverse=True)
+    order = np.lexsort((uniq[:, 2], uniq[:, 1], uniq[:, 0]))
+    stair_b: List[float] = []  # second objective, ascending
+    stair_c: List[float] = []  # third objective, descending along the staircase
+    keep = np.zeros(len(uniq), dtype=bool)
+    for i in order:
+        b, c = uniq[i, 1], uniq[i, 2]
+        # Among seen points with second objective <= b, the best third objective is the last one.
+        k = bisect_right(stair_b, b)
+        if k and stair_c[k - 1] <= c:
+            continue
+        keep[i] = True
+        # Drop staircase points this one dominates (b' >= b and c' >= c), then insert it.
+        lo = bisect_left(stair_b, b)
+        hi = lo
+        while hi < len(stair_b) and stair_c[hi] >= c:
+            hi += 1
+        stair_b[lo:hi] = [b]
+        stair_c[lo:hi] = [c]
+    return keep[inverse.ravel()]
+
+
+def _dominated_by(candidates: np.ndarray, block: np.ndarray) -> np.ndarray:
+    """For each row of `block`, whether any row of `candidates` dominates it."""
+    le = np.ones((len(block), len(candidates)), dtype=bool)
+    lt = np.zeros((len(block), len(candidates)), dtype=bool)
+    for j in range(block.shape[1]):
+        b, c = block[:, j, None], candidates[None, :, j]
+        le &= c <= b
+        lt |= c < b
+    return (le & lt).any(axis=1)
+
+
+def pareto_front(points: np.ndarray, chunk: int = 256) -> np.ndarray:
+    """Non-dominated mask for any number of minimized objectives."""
+    n, k = points.shape
+    if k == 1:
+        return points[:, 0] == points[:, 0].min() if n else np.zeros(0, dtype=bool)
+    if k == 2:
+        return pareto_front_2d(points)
+    if k == 3:
+        return pareto_front_3d(points)
+    # General case: sort-filter-skyline. Sorting by the sum of per-objective ranks means a
+    # point can only be dominated by points before it, so each block is checked against the
+    # frontier found so far and then against its own earlier survivors.
+    ranks = np.column_stack([np.unique(points[:, j], return_inverse=True)[1].ravel() for j in range(k)])
+    order = np.argsort(ranks.sum(axis=1), kind="stable")
+    mask = np.zeros(n, dtype=bool)
+    front = np.empty((0, k))
+    for start in range(0, n, chunk):
+        idx = order[start:start + chunk]
+        block = points[idx]
+        if len(front):
+            survivors = ~_dominated_by(front, block)
+            idx, block = idx[survivors], block[survivors]
+        if len(block):
+            survivors = ~_dominated_by(block, block)
+            idx, block = idx[survivors], block[survivors]
+        mask[idx] = True
+        front = np.vstack([front, block])
+    return mask
+
+
+def dominance_counts_2d(points: np.ndarray) -> np.ndarray:
+    """
+    For two minimized objectives, how many points dominate each point
+    (no worse on both, better on at least one). O(n log n): in (x, y) order, count
+    the earlier points with y <= y_i by bottom-up merge sort over the rank-compressed
+    second objective, one stable NumPy sort per level.
+    """
+    n = len(points)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    order = np.lexsort((points[:, 1], points[:, 0]))
+    xs, ys = points[order, 0], points[order, 1]
+    ry = np.unique(ys, return_inverse=True)[1].ravel().astype(np.int64)
+    pos = np.arange(n)
+    below = np.zeros(n, dtype=np.int64)
+    # Positions (in x order) sorted by ry within each run of `width`
+    runs = pos.copy()
+    width = 1
+    while width < n:
+        pair = pos // (2 * width)
+        # Stable: on equal y the left run's points come first, so they count as <= y
+        perm = np.argsort(pair * n + ry[runs], kind="stable")
+        from_right = (perm // width) % 2 == 1
+        # A right-run point's merged offset minus its offset in its own run = left-run points with y <= its y
+        below[runs[perm[from_right]]] += (pos - pair * 2 * width)[from_right] - (perm[from_right] % width)
+        runs = runs[perm]
+        width *= 2
+    # Earlier exact duplicates are counted in `below` but don't dominate
+    same = np.r_[False, (xs[1:] == xs[:-1]) & (ys[1:] == ys[:-1])]
+    run_start = np.maximum.accumulate(np.where(same, 0, pos))
+    counts = np.empty(n, dtype=np.int64)
+    counts[order] = below - (pos - run_start)
+    return counts
+
+
+def arbitrage_masks(df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+    """Row masks for the high-performance and high-speed arbitrage deals in a rankings frame."""
+    # 1. High Performance Arbitrage: models that offer good utility for very cheap.
+    high_perf = (df['avg_perf'] > HIGH_PERF_MIN) & (df['avg_cost'] < HIGH_PERF_MAX_COST)
+    # 2. Speed Arbitrage: "Free" level speeds for production workloads.
+    # With multi-trial data, require the CI lower bound to clear the bar, not one noisy sample.
+    speed = df['speed_ci_low'].fillna(df['avg_speed']) if 'speed_ci_low' in df.columns else df['avg_speed']
+    high_speed = (speed > HIGH_SPEED_MIN) & (df['avg_cost'] < HIGH_SPEED_MAX_COST)
+    return high_perf, high_speed
+
+
+def profile_scores(df: pd.DataFrame, profile: Dict[str, float]) -> pd.Series:
+    """Weighted sum of percentile-ranked metrics (1.0 = best) for one scoring profile."""
+    total = pd.Series(0.0, index=df.index)
+    weight_sum = 0.0
+    for col, weight in profile.items():
+        if col not in df.columns:
+            continue
+        higher_is_better = col not in IntelligenceEngine.LOWER_IS_BETTER
+        total += weight * df[col].rank(pct=True, ascending=higher_is_better).fillna(0.0)
+        weight_sum += weight
+    return total / weight_sum if weight_sum else total
+
 
 class IntelligenceEngine:
-    def __init__(self, catalog_path: str = "data/provider_catalog.csv", benchmark_path: str = "data/benchmark_results.csv"):
+    def __init__(self, catalog_path: str = CATALOG_PATH, benchmark_path: str = BENCHMARK_PATH):
         self.catalog_path = catalog_path
         self.benchmark_path = benchmark_path
 
-    def calculate_rankings(self):
-        if not os.path.exists(self.catalog_path) or not os.path.exists(self.benchmark_path):
+    # Metrics where lower is better; ranking by these sorts ascending.
+    LOWER_IS_BETTER = {"avg_cost", "avg_ttft", "itl_p50", "itl_p90", "itl_p99", "avg_latency",
+                       "latency_p50", "latency_p90", "latency_p99", "latency_p90_ci_high",
+                       *(f"ttft_ctx_{tier}" for tier in CONTEXT_TIERS)}
+
+    def calculate_rankings(self, sort_by: str = "value_score"):
+        """
+        Merge pricing with benchmarks and rank. Streaming latency columns
+        (avg_ttft, itl_p50/p90/p99, decode_tps, avg_latency) and multi-trial
+        distributions (latency_p50/p90/p99, speed_mean/std, CIs) pass through when
+        present, so `sort_by` can be any of them as well as value_score or a profile_<name>
+        score. Pareto frontier membership and dominance counts are added as columns.
+        """
+        with span("engine.read_inputs"):
+            catalog = read_frame(self.catalog_path, columns=['model_id', 'provider', 'input', 'output'])
+            benchmarks = read_frame(self.benchmark_path)
+        if catalog is None or benchmarks is None:
             print("Missing data files for ranking.")
             return None
         
-        catalog = pd.read_csv(self.catalog_path)
-        benchmarks = pd.read_csv(self.benchmark_path)
-        
         # Merge catalog (pricing) with benchmarks (performance)
-        df = pd.merge(benchmarks, catalog[['model_id', 'provider', 'input', 'output']], on=['model_id', 'provider'])
+        with span("engine.merge"):
+            df = pd.merge(benchmarks, catalog, on=['model_id', 'provider'])
+            # The two inputs carry different category sets, so the merged keys come back as strings
+            df = compact(df)
         
         # Value Score = (Avg Performance Score) / (Cost per 1M tokens)
         # Normalize performance: (Coding + Math + Reasoning) / 3
@@ -29,36 +231,69 @@ class IntelligenceEngine:
         # Value score: High is better. (Perf / Cost)
         # Avoid division by zero
         df['value_score'] = df['avg_perf'] / (df['avg_cost'] + 0.0001)
+
+        # Multi-objective view: frontier membership, dominance and per-workload profiles
+        with span("engine.pareto"):
+            df = compact(self.add_pareto_columns(df))
         
-        # Rank by Value Score
-        df = df.sort_values(by='value_score', ascending=False)
+        # Rank by Value Score (or the requested metric; unmeasured models sort last)
+        if sort_by not in df.columns:
+            print(f"Unknown ranking metric '{sort_by}', falling back to value_score.")
+            sort_by = 'value_score'
+        df = df.sort_values(by=sort_by, ascending=sort_by in self.LOWER_IS_BETTER, na_position='last')
         
-        df.to_csv("data/model_rankings.csv", index=False)
+        with span("engine.write"):
+            write_rankings(df)
         print("Intelligence Engine: Rankings recalculated.")
         return df
 
+    def add_pareto_columns(self, df: pd.DataFrame, profiles: Optional[Dict[str, Dict[str, float]]] = None) -> pd.DataFrame:
+        """
+        Add pareto_perf_cost / dominated_by (perf vs cost), pareto_front over perf, cost,
+        speed and the first available latency column, and a profile_<name> score per
+        scoring profile.
+        """
+        perf_cost = _as_minimization(df, {"avg_perf": True, "avg_cost": False})
+        df['pareto_perf_cost'] = pareto_front_2d(perf_cost)
+        df['dominated_by'] = dominance_counts_2d(perf_cost)
+
+        objectives = {c: hib for c, hib in PARETO_OBJECTIVES.items() if c in df.columns}
+        latency_col = next((c for c in LATENCY_COLUMNS if c in df.columns and df[c].notna().any()), None)
+        if latency_col:
+            objectives[latency_col] = False
+        df['pareto_front'] = pareto_front(_as_minimization(df, objectives))
+
+        for name, profile in (profiles or SCORING_PROFILES).items():
+            df[f'profile_{name}'] = profile_scores(df, profile)
+        return df
+
     def detect_arbitrage(self):
         """Find models that perform like top-tier but cost significantly less."""
-        if not os.path.exists("data/model_rankings.csv"):
-            self.calculate_rankings()
-            
-        df = pd.read_csv("data/model_rankings.csv")
-        
-        # 1. High Performance Arbitrage: Perf > 0.6 (relaxed), Cost < $2.00
-        # These are models that offer good utility for very cheap.
-        high_perf_deals = df[(df['avg_perf'] > 0.6) & (df['avg_cost'] < 2.00)]
+        df = load_rankings()
+        if df is None:
+            df = self.calculate_rankings()
+        if df is None:
+            return {"value_kings": [], "speed_demons": [], "pareto_frontier": []}
         
-        # 2. Speed Arbitrage: Speed > 50 t/s, Cost < $1.00
-        # These are "Free" level speeds for production workloads.
-        speed_deals = df[(df['avg_speed'] > 50) & (df['avg_cost'] < 1.0)]
+        high_perf, high_speed = arbitrage_masks(df)
+        high_perf_deals = df[high_perf]
+        speed_deals = df[high_speed]
+
+        # 3. Pareto frontier: nothing else is at least as good on every objective.
+        frontier = df[df['pareto_front']] if 'pareto_front' in df.columns else df.iloc[0:0]
         
         return {
-            "value_kings": high_perf_deals.to_dict('records'),
-            "speed_demons": speed_deals.to_dict('records')
+            "value_kings": widen(high_perf_deals).to_dict('records'),
+            "speed_demons": widen(speed_deals).to_dict('records'),
+            "pareto_frontier": widen(frontier).to_dict('records')
         }
 
 if __name__ == "__main__":
     engine = IntelligenceEngine()
     engine.calculate_rankings()
     deals = engine.detect_arbitrage()
-    print(f"Top Arbitrage Opportunity: {deals.iloc[0]['model_id']} from {deals.iloc[0]['provider']}")
+    if deals["value_kings"]:
+        top = deals["value_kings"][0]
+        print(f"Top Arbitrage Opportunity: {top['model_id']} from {top['provider']}")
+    else:
+        print("No arbitrage opportunities found.")
@@ -1,54 +1,280 @@
 import os
-from typing import TypedDict, List
-from langgraph.graph import StateGraph, END
+import re
+import sys
+import glob
+import json
+import time
+import operator
+import argparse
+from datetime import date
+from typing import Annotated, Callable, Dict, List, Optional, Tuple, TypedDict
+import pandas as pd
+from langgraph.graph import StateGraph, START, END
 
 # Import our agents
 from provider_tracker import ProviderScout
 from auto_benchmarker import AutoBenchmarker
 from intelligence_engine import IntelligenceEngine
+from daas_feed import DaaSGenerator
+from dataset_publisher import DatasetPublisher
+from results_store import ResultsStore
+from response_cache import ResponseCache, CACHE_MODES
+from change_detector import ChangeDetector
+from task_registry import SUITES, TASKS_DIR
+from provider_config import PROVIDERS_CONFIG
+from scoring import BatchScorer
+from checkpoints import NodeCheckpoints
+from ranking_artifact import RANKINGS_ARTIFACT, RANKINGS_CSV
+from instrumentation import METRICS, count, span, profiled
+from schema import CATALOG_PATH, CATALOG_CSV, BENCHMARK_PATH, BENCHMARK_CSV, read_frame, write_frame
 
-class AgentState(TypedDict):
+SHARD_DIR = "data/shards"
+RUN_REPORT = "data/pipeline/last_run.json"
+# Provider listings change slowly; a scout shard is reused for this long before re-fetching.
+SCOUT_TTL_HOURS = 12
+
+
+def _merge_dicts(a: Dict, b: Dict) -> Dict:
+    return {**a, **b}
+
+
+class AgentState(TypedDict, total=False):
     step: str
     catalog_ready: bool
     benchmarks_ready: bool
     rankings_ready: bool
+    # Filled in concurrently by the per-provider branches
+    timings: Annotated[Dict[str, float], _merge_dicts]
+    skipped: Annotated[List[str], operator.add]
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+def _has_key(provider_name: str) -> bool:
+    return bool(os.getenv(f"{provider_name.upper().replace(' ', '_')}_API_KEY"))
 
-def run_scout(state: AgentState):
-    print("--- 1. RUNNING SCOUT ---")
+
+def _read_shard(path: str) -> pd.DataFrame:
+    df = read_frame(path)
+    return df if df is not None else pd.DataFrame()
+
+
+def checkpointed(name: str, checkpoints: NodeCheckpoints, inputs: Callable[[], Tuple[List[str], Dict]],
+                 outputs: List[str], run: Callable[[], None], update: Optional[Dict] = None, force: bool = False):
+    """
+    Wrap a pipeline step as a graph node that is skipped when its input fingerprint
+    matches the last successful run and its outputs are untouched. Records wall time.
+    """
+    def node(state: AgentState):
+        start = time.time()
+        files, extra = inputs()
+        if not force and checkpoints.is_fresh(name, checkpoints.fingerprint(files, extra)):
+            print(f"--- {name}: inputs unchanged, skipped ---")
+            count("pipeline_nodes_skipped_total")
+            return {**(update or {}), "timings": {name: round(time.time() - start, 3)}, "skipped": [name]}
+
+        print(f"--- RUNNING {name} ---")
+        with span("node", node=name), profiled(name):
+            run()
+        elapsed = time.time() - start
+        # Fingerprint after the run: a step may settle its own inputs (e.g. nothing left due)
+        files, extra = inputs()
+        checkpoints.save(name, checkpoints.fingerprint(files, extra), outputs, elapsed)
+        return {**(update or {}), "timings": {name: round(elapsed, 3)}}
+    return node
+
+
+def build_pipeline(force: bool = False, publish: bool = True, checkpoints: Optional[NodeCheckpoints] = None,
+                   cache_mode: str = "reuse", suite: str = "daily", budget: Optional[int] = None,
+                   prune_daily: bool = False, scorer: Optional[BatchScorer] = None, max_models: Optional[int] = None):
+    """
+    scout_<provider> -> benchmark_<provider> run as parallel branches per provider,
+    then merge -> engine -> (feed, publish). Every node is checkpointed.
+    `cache_mode` and the task `suite` are passed to AutoBenchmarker.benchmark_all; a
+    call `budget` is split evenly over the keyed providers' adaptive samplers, and so is
+    `max_models`, the cap on models benchmarked with real calls per run (the rest stay due).
+    Compacted daily snapshots are deleted (locally and on the hub) only with `prune_daily`.
+    The benchmark branches share one scoring pool, `scorer` (run_pipeline closes it).
+    """
+    checkpoints = checkpoints or NodeCheckpoints()
     scout = ProviderScout()
-    scout.run_scan()
-    return {"step": "benchmark", "catalog_ready": True}
+    store = ResultsStore()
+    responses = ResponseCache() if cache_mode != "off" else None
+    # One process pool for every branch instead of one per provider; it only starts if a branch scores
+    scorer = scorer or BatchScorer()
+    # Price/latency changes are alerted as each shard lands, not after the merge
+    detector = ChangeDetector()
+    os.makedirs(SHARD_DIR, exist_ok=True)
+    keyed = [p for p in scout.providers if _has_key(p['name'])]
+    shard_budget = budget // max(len(keyed), 1) if budget is not None else None
+    shard_max_models = max(1, max_models // max(len(keyed), 1)) if max_models is not None else None
 
-def run_benchmark(state: AgentState):
-    print("--- 2. RUNNING BENCHMARKER ---")
-    benchmarker = AutoBenchmarker()
-    # If API keys are present, do real benchmarking
-    has_keys = any(os.getenv(f"{p['provider'].upper().replace(' ', '_')}_API_KEY") for p in benchmarker.catalog.to_dict('records'))
-    benchmarker.benchmark_all(real=has_keys)
-    return {"step": "rank", "benchmarks_ready": True}
+    workflow = StateGraph(AgentState)
+    shard_nodes = []
+    shards = []
+    for provider in scout.providers:
+        slug = _slug(provider['name'])
+        catalog_shard = os.path.join(SHARD_DIR, f"catalog_{slug}.parquet")
+        bench_shard = os.path.join(SHARD_DIR, f"benchmark_{slug}.parquet")
+        trials_shard = os.path.join(SHARD_DIR, f"trials_{slug}.parquet")
+        sampling_report = os.path.join(SHARD_DIR, f"sampling_{slug}.json")
+        shards.append((catalog_shard, bench_shard))
+        real = _has_key(provider['name'])
 
-def run_engine(state: AgentState):
-    print("--- 3. RUNNING INTELLIGENCE ENGINE ---")
-    engine = IntelligenceEngine()
-    engine.calculate_rankings()
-    return {"step": "complete", "rankings_ready": True}
+        def scout_inputs(provider=provider):
+            bucket = int(time.time() // (SCOUT_TTL_HOURS * 3600))
+            return ["config/pricing.yaml"], {"provider": provider, "bucket": bucket}
 
-# Build the graph
-workflow = StateGraph(AgentState)
+        def run_scout(provider=provider, path=catalog_shard):
+            df = scout.scan_provider(provider)
+            write_frame(df, path)
+            print(f"{provider['name']}: {len(df)} models.")
+            detector.observe_catalog(df)
 
-workflow.add_node("scout", run_scout)
-workflow.add_node("benchmark", run_benchmark)
-workflow.add_node("engine", run_engine)
+        def bench_inputs(path=catalog_shard, real=real):
+            catalog = _read_shard(path)
+            due = []
+            if not catalog.empty:
+                due_rows = store.select_due(catalog, real_providers={catalog['provider'].iloc[0]} if real else None,
+                                            max_models=shard_max_models if real else None)
+                due = sorted(due_rows['model_id'].astype(str))
+            task_files = sorted(glob.glob(os.path.join(TASKS_DIR, "*.jsonl")))
+            return [path, PROVIDERS_CONFIG, *task_files], {"real": real, "due": due, "suite": suite, "budget": shard_budget}
 
-workflow.set_entry_point("scout")
-workflow.add_edge("scout", "benchmark")
-workflow.add_edge("benchmark", "engine")
-workflow.add_edge("engine", END)
+        def run_bench(path=catalog_shard, out=bench_shard, trials=trials_shard, real=real, report=sampling_report):
+            benchmarker = AutoBenchmarker(catalog_path=path, results_path=out, trials_path=trials, results_csv=None,
+                                          trials_csv=None, response_cache=responses, sampling_report_path=report)
+            if benchmarker.catalog.empty:
+                write_frame(pd.DataFrame(), out)
+                return
+            benchmarker.benchmark_all(real=real, store=store, cache_mode=cache_mode, suite=suite,
+                                      budget=shard_budget if real else None, scorer=scorer,
+                                      max_models=shard_max_models if real else None)
+            detector.observe_benchmarks(benchmarker.last_measured)
 
-app = workflow.compile()
+        workflow.add_node(f"scout_{slug}", checkpointed(f"scout_{slug}", checkpoints, scout_inputs, [catalog_shard], run_scout, force=force))
+        workflow.add_node(f"benchmark_{slug}", checkpointed(f"benchmark_{slug}", checkpoints, bench_inputs, [bench_shard], run_bench, force=force))
+        workflow.add_edge(START, f"scout_{slug}")
+        workflow.add_edge(f"scout_{slug}", f"benchmark_{slug}")
+        shard_nodes.append(f"benchmark_{slug}")
 
-if __name__ == "__main__":
+    def run_merge():
+        catalog = pd.concat([_read_shard(c) for c, _ in shards], ignore_index=True)
+        benchmarks = pd.concat([_read_shard(b) for _, b in shards], ignore_index=True)
+        write_frame(catalog, CATALOG_PATH, csv_path=CATALOG_CSV)
+        write_frame(benchmarks, BENCHMARK_PATH, csv_path=BENCHMARK_CSV)
+        print(f"Merged {len(shards)} shards: {len(catalog)} catalog rows, {len(benchmarks)} benchmark rows.")
+
+    def run_engine():
+        IntelligenceEngine(CATALOG_PATH, BENCHMARK_PATH).calculate_rankings()
+
+    def run_feed():
+        DaaSGenerator().generate_feed()
+
+    today = date.today().isoformat()
+    publish_path = os.path.join("data", f"model_intel_{today}.parquet")
+    repo = os.getenv("HF_REPO_ID")
+
+    def run_publish():
+        publisher = DatasetPublisher()
+        publisher.prepare_parquet()
+        # Roll finished months into data/history; their daily files are only removed with prune_daily
+        publisher.compact_history(remove_daily=prune_daily)
+        if repo:
+            # Only files new or changed since the last publish are uploaded
+            publisher.publish(repo, delete_missing=prune_daily)
+
+    shard_files = [p for pair in shards for p in pair]
+    workflow.add_node("merge", checkpointed(
+        "merge", checkpoints, lambda: (shard_files, {}), [CATALOG_PATH, BENCHMARK_PATH, CATALOG_CSV, BENCHMARK_CSV], run_merge,
+        update={"step": "rank", "catalog_ready": True, "benchmarks_ready": True}, force=force))
+    workflow.add_node("engine", checkpointed(
+        "engine", checkpoints, lambda: ([CATALOG_PATH, BENCHMARK_PATH], {}), [RANKINGS_ARTIFACT, RANKINGS_CSV], run_engine,
+        update={"step": "complete", "rankings_ready": True}, force=force))
+    workflow.add_node("feed", checkpointed(
+        "feed", checkpoints, lambda: ([RANKINGS_ARTIFACT], {}), ["data/live_intel.json"], run_feed, force=force))
+
+    if shard_nodes:
+        workflow.add_edge(shard_nodes, "merge")
+    else:
+        workflow.add_edge(START, "merge")
+    workflow.add_edge("merge", "engine")
+    workflow.add_edge("engine", "feed")
+    workflow.add_edge("feed", END)
+    if publish:
+        workflow.add_node("publish", checkpointed(
+            "publish", checkpoints, lambda: ([RANKINGS_ARTIFACT], {"date": today, "repo": repo, "prune_daily": prune_daily}), [publish_path],
+            run_publish, force=force))
+        workflow.add_edge("engine", "publish")
+        workflow.add_edge("publish", END)
+    return workflow.compile()
+
+
+def run_pipeline(force: bool = False, publish: bool = True, cache_mode: str = "reuse", suite: str = "daily",
+                 budget: Optional[int] = None, prune_daily: bool = False,
+                 max_models: Optional[int] = None) -> Optional[Dict]:
+    """Build and run the whole graph once; returns the final state, or None if a node failed."""
     print("Starting ModelRadar Pipeline...")
-    inputs = {"step": "start", "catalog_ready": False, "benchmarks_ready": False, "rankings_ready": False}
-    for output in app.stream(inputs):
-        print(output)
+    scorer = BatchScorer()
+    app = build_pipeline(force=force, publish=publish, cache_mode=cache_mode, suite=suite, budget=budget,
+                         prune_daily=prune_daily, scorer=scorer, max_models=max_models)
+    inputs = {"step": "start", "catalog_ready": False, "benchmarks_ready": False, "rankings_ready": False,
+              "timings": {}, "skipped": []}
+    start = time.time()
+    try:
+        with scorer:
+            final = app.invoke(inputs)
+    except Exception as e:
+        print(f"Pipeline failed: {e}. Completed nodes are checkpointed; rerun to resume.")
+        if METRICS.enabled:
+            METRICS.write()
+        return None
+    report(final, time.time() - start)
+    if METRICS.enabled:
+        METRICS.write()
+    return final
+
+
+def report(state: Dict, wall: float, path: str = RUN_REPORT):
+    """Print per-node wall time and save it alongside the checkpoints."""
+    timings = state.get("timings", {})
+    skipped = set(state.get("skipped", []))
+    print("\n--- Node wall time ---")
+    for name, seconds in sorted(timings.items(), key=lambda kv: -kv[1]):
+        print(f"{name:<32} {seconds:8.2f}s{'  (skipped)' if name in skipped else ''}")
+    print(f"{'total (wall)':<32} {wall:8.2f}s")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({"wall_seconds": round(wall, 3), "nodes": timings, "skipped": sorted(skipped)}, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the ModelRadar pipeline.")
+    parser.add_argument("--force", action="store_true", help="Ignore checkpoints and rerun every node.")
+    parser.add_argument("--no-publish", action="store_true", help="Skip the parquet/Hugging Face publish node.")
+    parser.add_argument("--prune-daily", action="store_true",
+                        help="Delete daily snapshots once compacted into a monthly partition, locally and on the hub.")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Record spans/counters/histograms to data/pipeline/metrics.json and metrics.prom.")
+    parser.add_argument("--profile", choices=["cprofile", "pyinstrument"],
+                        help="Profile each node that runs into data/pipeline/profiles/.")
+    parser.add_argument("--response-cache", choices=CACHE_MODES, default="reuse",
+                        help="Reuse cached API responses (default), refresh them for timing runs, or bypass the cache.")
+    parser.add_argument("--suite", choices=sorted(SUITES), default="daily",
+                        help="Benchmark task sample: one item per category/tier stratum up to 4k context (daily) or every item (weekly).")
+    parser.add_argument("--budget", type=int,
+                        help="Daily API call budget for adaptive sampling (split over keyed providers) instead of fixed trials.")
+    parser.add_argument("--max-models", type=int,
+                        help="Most models benchmarked with real calls per run (split over keyed providers); the rest stay due.")
+    args = parser.parse_args()
+
+    if args.metrics:
+        METRICS.enable()
+    if args.profile:
+        os.environ["MODELRADAR_PROFILE"] = args.profile
+    final = run_pipeline(force=args.force, publish=not args.no_publish, cache_mode=args.response_cache,
+                         suite=args.suite, budget=args.budget, prune_daily=args.prune_daily, max_models=args.max_models)
+    if final is None:
+        sys.exit(1)
@@ -0,0 +1,168 @@
+"""
+Single entry point for the pipeline stages:
+
+    python src/modelradar.py {scan,bench,rank,feed,publish,all} [options]
+
+Each stage imports its modules when it runs, so `--help` or `rank` never loads
+langgraph, the benchmark scheduler or huggingface_hub. Stages are plain functions
+returning their result, so the dashboard (or a notebook) calls them in-process with
+run_stage() instead of starting a new interpreter per stage.
+"""
+import os
+import sys
+import time
+import argparse
+from typing import Callable, Dict, List, Optional
+from instrumentation import METRICS, profiled, span
+# Standard library only, so cheap enough to import up front for the argument choices
+from response_cache import CACHE_MODES
+from task_registry import SUITES
+
+STAGES = ("scan", "bench", "rank", "feed", "publish", "all")
+PRUNE_HELP = "Delete daily snapshots once compacted into a monthly partition, locally and on the hub."
+
+
+def scan(config_path: Optional[str] = None):
+    """Scan every provider into the catalog and check it for price / listing changes."""
+    from provider_tracker import ProviderScout
+    from change_detector import ChangeDetector
+    scout = ProviderScout(config_path) if config_path else ProviderScout()
+    catalog = scout.run_scan()
+    ChangeDetector().observe_catalog(catalog)
+    return catalog
+
+
+def bench(real: bool = True, suite: str = "daily", budget: Optional[int] = None, trials: int = 1,
+          cache_mode: str = "reuse", max_models: Optional[int] = None):
+    """Benchmark due models in the catalog (at most max_models); real calls only go to providers with an API key."""
+    from auto_benchmarker import AutoBenchmarker
+    from change_detector import ChangeDetector
+    benchmarker = AutoBenchmarker()
+    results = benchmarker.benchmark_all(real=real, suite=suite, budget=budget, trials=trials, cache_mode=cache_mode,
+                                       max_models=max_models)
+    ChangeDetector().observe_benchmarks(benchmarker.last_measured)
+    return results
+
+
+def rank():
+    from intelligence_engine import IntelligenceEngine
+    from schema import CATALOG_PATH, BENCHMARK_PATH
+    return IntelligenceEngine(CATALOG_PATH, BENCHMARK_PATH).calculate_rankings()
+
+
+def feed():
+    from daas_feed import DaaSGenerator
+    return DaaSGenerator().generate_feed()
+
+
+def publish(repo_id: Optional[str] = None, prune_daily: bool = False):
+    """
+    Snapshot today's rankings, compact finished months and upload the delta (if a hub is
+    configured). Compacted daily snapshots are deleted, locally and remotely, only with prune_daily.
+    """
+    from dataset_publisher import DatasetPublisher
+    from hub_client import HUB_ENDPOINT_ENV
+    publisher = DatasetPublisher()
+    publisher.prepare_parquet()
+    publisher.compact_history(remove_daily=prune_daily)
+    repo_id = repo_id or os.getenv("HF_REPO_ID")
+    if not repo_id or not (os.getenv("HUGGINGFACE_TOKEN") or os.getenv(HUB_ENDPOINT_ENV)):
+        print("No HF_REPO_ID / HUGGINGFACE_TOKEN (or hub endpoint). Skipping upload.")
+        return None
+    return publisher.publish(repo_id, delete_missing=prune_daily)
+
+
+def run_all(force: bool = False, publish: bool = True, cache_mode: str = "reuse", suite: str = "daily",
+            budget: Optional[int] = None, prune_daily: bool = False, max_models: Optional[int] = None):
+    """The checkpointed LangGraph pipeline (scan and bench per provider in parallel, then rank, feed, publish)."""
+    from langgraph_orchestrator import run_pipeline
+    final = run_pipeline(force=force, publish=publish, cache_mode=cache_mode, suite=suite, budget=budget,
+                         prune_daily=prune_daily, max_models=max_models)
+    if final is None:
+        raise RuntimeError("Pipeline failed; completed nodes are checkpointed, rerun to resume.")
+    return final
+
+
+STAGE_FUNCTIONS: Dict[str, Callable] = {"scan": scan, "bench": bench, "rank": rank, "feed": feed, "publish": publish,
+                                        "all": run_all}
+
+
+def run_stage(name: str, **kwargs):
+    """Run one stage in this process (span + optional profile like an orchestrator node); returns its result."""
+    if name not in STAGE_FUNCTIONS:
+        raise ValueError(f"Unknown stage '{name}', expected one of {STAGES}")
+    start = time.time()
+    with span("cli.stage", stage=name), profiled(name):
+        result = STAGE_FUNCTIONS[name](**kwargs)
+    print(f"--- {name} finished in {time.time() - start:.2f}s ---")
+    return result
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="modelradar", description="ModelRadar pipeline stages.")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Record spans/counters/histograms to data/pipeline/metrics.json and metrics.prom.")
+    parser.add_argument("--profile", choices=["cprofile", "pyinstrument"], help="Profile the stage into data/pipeline/profiles/.")
+    sub = parser.add_subparsers(dest="stage", required=True)
+
+    scan_p = sub.add_parser("scan", help="Scan providers into data/provider_catalog.parquet.")
+    scan_p.add_argument("--config", help="Providers file (default: config/providers.yaml).")
+
+    def bench_options(p: argparse.ArgumentParser):
+        p.add_argument("--suite", choices=sorted(SUITES), default="daily",
+                       help="Task sample: one item per category/tier stratum up to 4k context (daily) or every item (weekly).")
+        p.add_argument("--budget", type=int, help="API call budget for adaptive sampling instead of fixed trials.")
+        p.add_argument("--response-cache", choices=CACHE_MODES, default="reuse",
+                       help="Reuse cached API responses (default), refresh them for timing runs, or bypass the cache.")
+        p.add_argument("--max-models", type=int,
+                       help="Most models to benchmark per run (real ones, split over keyed providers, for all); "
+                            "the rest stay due for later runs, new models first.")
+
+    bench_p = sub.add_parser("bench", help="Benchmark due models from the catalog.")
+    bench_options(bench_p)
+    bench_p.add_argument("--simulated", action="store_true", help="No real API calls, even for providers with keys.")
+    bench_p.add_argument("--trials", type=int, default=1)
+
+    sub.add_parser("rank", help="Rank the catalog and benchmark results.")
+    sub.add_parser("feed", help="Write data/live_intel.json from the rankings.")
+    publish_p = sub.add_parser("publish", help="Snapshot, compact and upload new or changed history files.")
+    publish_p.add_argument("--repo", help="Dataset repo (default: $HF_REPO_ID).")
+    publish_p.add_argument("--prune-daily", action="store_true", help=PRUNE_HELP)
+
+    all_p = sub.add_parser("all", help="Run the whole checkpointed pipeline.")
+    bench_options(all_p)
+    all_p.add_argument("--force", action="store_true", help="Ignore checkpoints and rerun every node.")
+    all_p.add_argument("--no-publish", action="store_true", help="Skip the publish node.")
+    all_p.add_argument("--prune-daily", action="store_true", help=PRUNE_HELP)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.metrics:
+        METRICS.enable()
+    if args.profile:
+        os.environ["MODELRADAR_PROFILE"] = args.profile
+    kwargs = {
+        "scan": lambda: {"config_path": args.config},
+        "bench": lambda: {"real": not args.simulated, "suite": args.suite, "budget": args.budget, "trials": args.trials,
+                          "cache_mode": args.response_cache, "max_models": args.max_models},
+        "publish": lambda: {"repo_id": args.repo, "prune_daily": args.prune_daily},
+        "all": lambda: {"force": args.force, "publish": not args.no_publish, "cache_mode": args.response_cache,
+                        "suite": args.suite, "budget": args.budget, "prune_daily": args.prune_daily,
+                        "max_models": args.max_models},
+    }.get(args.stage, dict)()
+    try:
+        run_stage(args.stage, **kwargs)
+    except Exception as e:
+        print(f"{args.stage} failed: {e}")
+        return 1
+    finally:
+        # The pipeline writes its own metrics
+        if METRICS.enabled and args.stage != "all":
+            METRICS.write()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
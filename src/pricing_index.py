@@ -0,0 +1,107 @@
+import os
+import random
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+import yaml
+import pandas as pd
+
+# abs path -> ((mtime_ns, size), index); an edited pricing file is recompiled on the next load
+_INDEX_CACHE: Dict[str, Tuple[Tuple[int, int], "PricingIndex"]] = {}
+_INDEX_CACHE_LOCK = threading.Lock()
+
+
+def normalize_model_id(model_id: str) -> str:
+    return str(model_id).strip().lower()
+
+
+class PricingIndex:
+    """
+    Pricing table compiled once into an Aho-Corasick automaton over normalized keys.
+    A lookup is a single pass over the model ID that reports every key it contains;
+    the longest one wins. Results carry provenance: exact, fuzzy or estimated.
+    """
+    def __init__(self, pricing: Dict[str, Dict]):
+        self.prices = {normalize_model_id(k): (float(v['input']), float(v['output'])) for k, v in pricing.items()}
+        self._build(list(self.prices))
+
+    @classmethod
+    def load(cls, path: str = "config/pricing.yaml") -> "PricingIndex":
+        """Load and compile a pricing file, reusing the compiled index while the file is unchanged."""
+        key_path = os.path.abspath(path)
+        st = os.stat(key_path)
+        version = (st.st_mtime_ns, st.st_size)
+        with _INDEX_CACHE_LOCK:
+            cached = _INDEX_CACHE.get(key_path)
+            if cached and cached[0] == version:
+                return cached[1]
+        with open(key_path, 'r') as f:
+            index = cls(yaml.safe_load(f).get('pricing', {}))
+        with _INDEX_CACHE_LOCK:
+            _INDEX_CACHE[key_path] = (version, index)
+        return index
+
+    def _build(self, keys: List[str]):
+        # goto[state] maps char -> state; out[state] is the longest key ending at state
+        self._goto = [{}]
+        self._fail = [0]
+        self._out: List[Optional[str]] = [None]
+        for key in keys:
+            state = 0
+            for ch in key:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(None)
+                state = nxt
+            self._out[state] = key
+
+        # Depth-1 states fail to the root; deeper ones follow their parent's fail chain.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                # Keep the longest key reachable through the fail chain
+                inherited = self._out[self._fail[nxt]]
+                if inherited and (self._out[nxt] is None or len(inherited) > len(self._out[nxt])):
+                    self._out[nxt] = inherited
+
+    def longest_match(self, normalized_id: str) -> Optional[str]:
+        goto, fail, out = self._goto, self._fail, self._out
+        state, best = 0, None
+        for ch in normalized_id:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            hit = out[state]
+            if hit and (best is None or len(hit) > len(best)):
+                best = hit
+        return best
+
+    def lookup(self, model_id: str) -> Tuple[float, float, str]:
+        """Return (input, output, source) with source one of exact/fuzzy/estimated."""
+        key = normalize_model_id(model_id)
+        if key in self.prices:
+            return self.prices[key] + ("exact",)
+        match = self.longest_match(key)
+        if match:
+            return self.prices[match] + ("fuzzy",)
+        # Deterministic per-model estimate; a private RNG leaves global random state alone.
+        base_price = random.Random(model_id).uniform(0.1, 5.0)
+        return round(base_price, 2), round(base_price * 1.5, 2), "estimated"
+
+    def lookup_many(self, model_ids: Iterable[str]) -> pd.DataFrame:
+        """Price a whole catalog column at once; each distinct ID is matched only once."""
+        ids = pd.Series(list(model_ids), dtype=object)
+        codes, uniques = pd.factorize(ids)
+        table = [self.lookup(m) for m in uniques]
+        frame = pd.DataFrame(table, columns=['input', 'output', 'pricing_source'])
+        return frame.iloc[codes].reset_index(drop=True) if len(codes) else frame
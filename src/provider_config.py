@@ -0,0 +1,75 @@
+import os
+import threading
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+PROVIDERS_CONFIG = "config/providers.yaml"
+
+_CACHE: Dict[str, Tuple[Tuple[int, int], "ProvidersConfig"]] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+class ProviderEntry(TypedDict, total=False):
+    name: str
+    api_base: str
+    type: str
+    free_tier: bool
+    models_suggested: List[str]
+    # Per-provider overrides: HTTP timeout for the scan, benchmark rate limit and concurrency
+    timeout: float
+    rate_limit_rps: float
+    max_concurrency: int
+
+
+class ProvidersConfig:
+    """
+    providers.yaml, parsed once per file version (mtime + size) and shared by the scout,
+    the benchmarker and the CLI; later loads cost one stat(). Entries stay plain dicts
+    (ProviderEntry) so existing `provider['name']` call sites keep working.
+    """
+    def __init__(self, providers: List[ProviderEntry], path: str = PROVIDERS_CONFIG):
+        self.path = path
+        self.providers = providers
+        self.by_name: Dict[str, ProviderEntry] = {p['name']: p for p in providers}
+
+    @staticmethod
+    def _validate(entries) -> List[ProviderEntry]:
+        providers = []
+        for n, entry in enumerate(entries or []):
+            if not isinstance(entry, dict) or not entry.get('name') or not entry.get('api_base'):
+                raise ValueError(f"providers[{n}] needs a name and an api_base")
+            if 'rate_limit_rps' in entry:
+                entry['rate_limit_rps'] = float(entry['rate_limit_rps'])
+            if 'max_concurrency' in entry:
+                entry['max_concurrency'] = int(entry['max_concurrency'])
+            if 'timeout' in entry:
+                entry['timeout'] = float(entry['timeout'])
+            entry.setdefault('models_suggested', [])
+            providers.append(entry)
+        return providers
+
+    @classmethod
+    def load(cls, path: str = PROVIDERS_CONFIG) -> "ProvidersConfig":
+        key_path = os.path.abspath(path)
+        st = os.stat(key_path)
+        version = (st.st_mtime_ns, st.st_size)
+        with _CACHE_LOCK:
+            cached = _CACHE.get(key_path)
+            if cached and cached[0] == version:
+                return cached[1]
+        import yaml
+        with open(key_path, 'r') as f:
+            raw = yaml.safe_load(f) or {}
+        try:
+            config = cls(cls._validate(raw.get('providers')), path)
+        except ValueError as e:
+            raise ValueError(f"{path}: {e}") from None
+        with _CACHE_LOCK:
+            _CACHE[key_path] = (version, config)
+        return config
+
+    def get(self, name: str) -> Optional[ProviderEntry]:
+        return self.by_name.get(name)
+
+    def limits(self) -> Dict[str, ProviderEntry]:
+        """Providers that set a benchmark rate limit or concurrency cap (for BenchmarkScheduler)."""
+        return {p['name']: p for p in self.providers if 'rate_limit_rps' in p or 'max_concurrency' in p}
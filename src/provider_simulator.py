@@ -0,0 +1,245 @@
+import re
+import json
+import zlib
+import math
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+import yaml
+from task_registry import TaskRegistry, TASKS_DIR
+
+SIMULATOR_CONFIG = "config/simulator.yaml"
+DEFAULT_PROFILE = {
+    "ttft_ms": 100.0,
+    "ttft_sigma": 0.25,
+    "tokens_per_sec": 100.0,
+    "max_completion_tokens": 48,
+    "error_rate": 0.0,
+    "rate_limit_rate": 0.0,
+    "retry_after": 1,
+    "drip_rate": 0.0,
+    "drip_ms": 250.0,
+    "accuracy": 0.9,
+    "prefill_tokens_per_sec": 50000.0,
+}
+
+FILLER = " lorem"
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def _tokens(text: str) -> List[str]:
+    """Whitespace-attached word pieces; stands in for a tokenizer."""
+    return re.findall(r"\s*\S+", text) or [text]
+
+
+class ProviderSimulator:
+    """
+    Local OpenAI-compatible server for offline benchmarking. Each configured provider
+    is served under /<slug>/v1 with GET /models and POST /chat/completions (plain or
+    SSE streaming). Per-model profiles set TTFT distribution, prefill and decode rates,
+    500/429 rates and slow-drip stalls. Correct answers are the task registry's
+    `reference` answers.
+
+    Every request's random draws come from Random("<seed>:<provider>:<model>:<prompt>:<n>"),
+    n counting earlier requests for the same model and prompt, so a run issuing the
+    same requests sees the same outcomes regardless of how threads interleave them.
+    """
+    def __init__(self, config: Optional[Dict] = None, config_path: str = SIMULATOR_CONFIG,
+                 host: str = "127.0.0.1", port: int = 0, seed: Optional[int] = None, tasks_dir: str = TASKS_DIR):
+        if config is None:
+            with open(config_path, 'r') as f:
+                config = yaml.safe_load(f)
+        self.config = config
+        self.seed = config.get("seed", 0) if seed is None else seed
+        self.host = host
+        self.port = port
+        self.providers: Dict[str, Dict] = {}
+        for provider in config.get("providers", []):
+            defaults = {**DEFAULT_PROFILE, **(provider.get("defaults") or {})}
+            models = {m["id"]: {**defaults, **{k: v for k, v in m.items() if k != "id"}} for m in provider.get("models", [])}
+            self.providers[_slug(provider["name"])] = {"name": provider["name"], "models": models}
+        # Correct answers for the benchmark items: (question, reference). Prompts end with the question.
+        self.answers = [(item["prompt"], item["reference"]) for item in TaskRegistry(tasks_dir).items if item.get("reference")]
+        self._counters: Dict[Tuple[str, str, int], int] = {}
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "rate_limited": 0, "errors": 0, "streams": 0}
+        self.httpd = None
+        self._thread = None
+
+    def api_base(self, provider_name: str) -> str:
+        return f"http://{self.host}:{self.port}/{_slug(provider_name)}/v1"
+
+    def providers_yaml(self) -> Dict:
+        """providers.yaml entries pointing at this server (for ProviderScout/AutoBenchmarker)."""
+        entries = []
+        for provider in self.config.get("providers", []):
+            entry = {"name": provider["name"], "api_base": self.api_base(provider["name"]), "type": "openai_compatible"}
+            for key in ("rate_limit_rps", "max_concurrency"):
+                if key in provider:
+                    entry[key] = provider[key]
+            entries.append(entry)
+        return {"providers": entries}
+
+    def _draw(self, slug: str, model: str, prompt: str) -> random.Random:
+        key = (slug, model, zlib.crc32(prompt.encode()))
+        with self._lock:
+            n = self._counters.get(key, 0)
+            self._counters[key] = n + 1
+            self.stats["requests"] += 1
+        return random.Random(f"{self.seed}:{slug}:{model}:{key[2]}:{n}")
+
+    def _bump(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _answer(self, prompt: str, correct: bool) -> str:
+        if correct:
+            for question, reference in self.answers:
+                if prompt.endswith(question):
+                    return reference
+            return "OK"
+        return "I don't know."
+
+    def make_handler(self):
+        sim = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _route(self) -> Tuple[Optional[Dict], str]:
+                parts = self.path.split("?")[0].strip("/").split("/")
+                if len(parts) < 3 or parts[1] != "v1":
+                    return None, ""
+                return sim.providers.get(parts[0]), "/".join(parts[2:])
+
+            def _json(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, str(v))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                provider, endpoint = self._route()
+                if provider is None or endpoint != "models":
+                    return self._json(404, {"error": {"message": "not found"}})
+                data = [{"id": m, "object": "model", "created": 0, "owned_by": provider["name"]} for m in provider["models"]]
+                self._json(200, {"object": "list", "data": data})
+
+            def do_POST(self):
+                provider, endpoint = self._route()
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    return self._json(400, {"error": {"message": "invalid JSON"}})
+                if provider is None or endpoint != "chat/completions":
+                    return self._json(404, {"error": {"message": "not found"}})
+                model = request.get("model")
+                profile = provider["models"].get(model)
+                if profile is None:
+                    return self._json(404, {"error": {"message": f"model {model} not found"}})
+
+                prompt = " ".join(str(m.get("content", "")) for m in request.get("messages", []))
+                rng = sim._draw(_slug(provider["name"]), model, prompt)
+                roll = rng.random()
+                if roll < profile["rate_limit_rate"]:
+                    sim._bump("rate_limited")
+                    return self._json(429, {"error": {"message": "rate limited"}}, {"Retry-After": profile["retry_after"]})
+                if roll < profile["rate_limit_rate"] + profile["error_rate"]:
+                    sim._bump("errors")
+                    return self._json(500, {"error": {"message": "simulated server error"}})
+
+                answer = sim._answer(prompt, rng.random() < profile["accuracy"])
+                tokens = _tokens(answer)
+                tokens += [FILLER] * max(0, int(profile["max_completion_tokens"]) - len(tokens))
+                if request.get("max_tokens"):
+                    tokens = tokens[:max(int(request["max_tokens"]), 1)]
+                prompt_tokens = len(_tokens(prompt))
+                ttft = profile["ttft_ms"] / 1000.0 * math.exp(rng.gauss(0.0, profile["ttft_sigma"]))
+                ttft += prompt_tokens / profile["prefill_tokens_per_sec"]
+                gap = 1.0 / profile["tokens_per_sec"]
+                stalls = [profile["drip_ms"] / 1000.0 if rng.random() < profile["drip_rate"] else 0.0 for _ in tokens]
+
+                if request.get("stream"):
+                    sim._bump("streams")
+                    return self._stream(model, tokens, ttft, gap, stalls, prompt_tokens)
+                time.sleep(ttft + gap * (len(tokens) - 1) + sum(stalls))
+                self._json(200, {
+                    "id": "chatcmpl-sim", "object": "chat.completion", "model": model,
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)}, "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(tokens),
+                              "total_tokens": prompt_tokens + len(tokens)},
+                })
+
+            def _chunk(self, data: bytes):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+
+            def _stream(self, model: str, tokens: List[str], ttft: float, gap: float, stalls: List[float], prompt_tokens: int):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                time.sleep(ttft)
+                for i, (token, stall) in enumerate(zip(tokens, stalls)):
+                    if i:
+                        time.sleep(gap + stall)
+                    event = {"id": "chatcmpl-sim", "object": "chat.completion.chunk", "model": model,
+                             "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]}
+                    self._chunk(b"data: " + json.dumps(event).encode() + b"\n\n")
+                usage = {"id": "chatcmpl-sim", "object": "chat.completion.chunk", "model": model, "choices": [],
+                         "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(tokens),
+                                   "total_tokens": prompt_tokens + len(tokens)}}
+                self._chunk(b"data: " + json.dumps(usage).encode() + b"\n\n")
+                self._chunk(b"data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+
+        return Handler
+
+    def start(self) -> "ProviderSimulator":
+        """Serve in a background thread; `port` is filled in if it was 0."""
+        self.httpd = ThreadingHTTPServer((self.host, self.port), self.make_handler())
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the simulated OpenAI-compatible providers.")
+    parser.add_argument("--config", default=SIMULATOR_CONFIG)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--tasks", default=TASKS_DIR, help="Task registry whose reference answers the models give.")
+    args = parser.parse_args()
+    sim = ProviderSimulator(config_path=args.config, host=args.host, port=args.port, seed=args.seed,
+                            tasks_dir=args.tasks).start()
+    for name in [p["name"] for p in sim.config.get("providers", [])]:
+        print(f"{name}: {sim.api_base(name)}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        sim.stop()
@@ -1,23 +1,57 @@
-import yaml
 import requests
 import os
-from typing import List, Dict
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter
 import pandas as pd
+from pricing_index import PricingIndex
+from provider_config import PROVIDERS_CONFIG, ProvidersConfig
+from instrumentation import span, record_http
+from schema import CATALOG_PATH, CATALOG_CSV, compact, write_frame
 
 class ProviderScout:
-    def __init__(self, config_path: str = "config/providers.yaml"):
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
-        self.providers = self.config.get('providers', [])
+    def __init__(self, config_path: str = PROVIDERS_CONFIG, pricing_path: str = "config/pricing.yaml",
+                 max_workers: int = 32, max_per_host: int = 4,
+                 host_timeout: float = 10.0, scan_deadline: float = 30.0):
+        self.config = ProvidersConfig.load(config_path)
+        self.providers = self.config.providers
+        self.pricing = PricingIndex.load(pricing_path)
+        # Concurrent scan limits. `timeout` on a provider entry overrides host_timeout.
+        self.max_workers = max_workers
+        # Concurrent connections per host; several providers can share one (e.g. local servers)
+        self.max_per_host = max_per_host
+        self.host_timeout = host_timeout
+        self.scan_deadline = scan_deadline
 
-    def fetch_openai_compatible_models(self, provider: Dict) -> List[Dict]:
+    def _make_session(self) -> requests.Session:
+        """Shared session so connections to the same host are pooled across providers."""
+        session = requests.Session()
+        # pool_block: a request over max_per_host waits for a free connection instead of
+        # opening an extra one that is discarded afterwards (which wouldn't limit anything)
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_per_host, pool_block=True)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def fetch_openai_compatible_models(self, provider: Dict, session: Optional[requests.Session] = None) -> List[Dict]:
         """Fetch models from OpenAI-compatible /models endpoint."""
         api_base = provider.get('api_base')
         api_key = os.getenv(f"{provider['name'].upper()}_API_KEY", "EMPTY")
+        http = session or requests
+        timeout = provider.get('timeout', self.host_timeout)
         
         try:
             headers = {"Authorization": f"Bearer {api_key}"}
-            response = requests.get(f"{api_base.rstrip('/')}/models", headers=headers, timeout=10)
+            with span("scout.fetch", provider=provider['name']):
+                start = time.perf_counter()
+                try:
+                    response = http.get(f"{api_base.rstrip('/')}/models", headers=headers, timeout=timeout)
+                except Exception:
+                    record_http("scout", provider['name'], "error", time.perf_counter() - start)
+                    raise
+                record_http("scout", provider['name'], response.status_code, time.perf_counter() - start, len(response.content))
             if response.status_code == 200:
                 models_data = response.json()
                 extracted = []
@@ -43,85 +77,84 @@ class ProviderScout:
 
     def get_pricing_estimate(self, model_id: str, provider_name: str) -> Dict:
         """
-        Hardcoded pricing for MVP. In Phase 2.1, this would scrape provider status pages.
-        Returns price per 1M tokens in USD.
+        Price per 1M tokens in USD from config/pricing.yaml (see PricingIndex).
+        In Phase 2.1, this would scrape provider status pages.
         """
-        pricing_data = {
-            # OpenAI
-            "gpt-4o": {"input": 2.50, "output": 10.00},
-            "gpt-4o-mini": {"input": 0.15, "output": 0.60},
-            "gpt-3.5-turbo": {"input": 0.50, "output": 1.50},
-            
-            # Groq
-            "llama-3.1-70b-versatile": {"input": 0.59, "output": 0.79},
-            "llama-3.1-8b-instant": {"input": 0.05, "output": 0.08},
-            "mixtral-8x7b-32768": {"input": 0.24, "output": 0.24},
-            "gemma2-9b-it": {"input": 0.20, "output": 0.20},
-            
-            # Google
-            "gemini-1.5-pro": {"input": 3.50, "output": 10.50},
-            "gemini-1.5-flash": {"input": 0.075, "output": 0.30},
-            
-            # DeepSeek
-            "deepseek-chat": {"input": 0.14, "output": 0.28},
-            "deepseek-coder": {"input": 0.14, "output": 0.28},
-            
-            # Mistral
-            "mistral-large-latest": {"input": 2.00, "output": 6.00},
-            "mistral-small-latest": {"input": 0.20, "output": 0.60},
-            "codestral-latest": {"input": 1.00, "output": 3.00},
-            
-            # OpenRouter / Aggregated
-            "seed-1.6": {"input": 0.10, "output": 0.10}, # Bytedance Seed
-            "minimax": {"input": 0.50, "output": 0.50},
-            "glm-4": {"input": 0.40, "output": 0.40},
-            "olmo": {"input": 0.20, "output": 0.20},
-            "qwen": {"input": 0.35, "output": 0.40},
-            "mimo": {"input": 0.15, "output": 0.15},
-            "trinity": {"input": 0.0, "output": 0.0},
-            "nemotron": {"input": 0.60, "output": 0.60},
-            "phi-3": {"input": 0.10, "output": 0.10},
-            
-            # Others (Aggregated estimates)
-            "claude-3-5-sonnet-20240620": {"input": 3.00, "output": 15.00},
-            "meta-llama/Llama-3-70b-chat-hf": {"input": 0.90, "output": 0.90},
-            "Qwen/Qwen2-72B-Instruct": {"input": 0.40, "output": 0.40},
-        }
-        # Fuzzy matching for model IDs (e.g., handles provider prefixes)
-        for key in pricing_data:
-            if key.lower() in model_id.lower():
-                return pricing_data[key]
-        
-        # Randomized fallback for "Simulated" feel if pricing unknown
-        import random
-        # Seed based on model name so it's consistent for the same model across runs
-        random.seed(model_id)
-        base_price = random.uniform(0.1, 5.0)
-        return {"input": round(base_price, 2), "output": round(base_price * 1.5, 2)}
+        input_price, output_price, source = self.pricing.lookup(model_id)
+        return {"input": input_price, "output": output_price, "pricing_source": source}
+
+    def _fetch_all_concurrent(self) -> List[List[Dict]]:
+        """
+        Fetch every provider's /models in a bounded thread pool.
+        Providers still pending when scan_deadline expires are treated as failed.
+        """
+        results = [[] for _ in self.providers]
+        if not self.providers:
+            return results
+
+        session = self._make_session()
+        pool = ThreadPoolExecutor(max_workers=min(self.max_workers, len(self.providers)))
+        futures = {}
+        try:
+            for i, provider in enumerate(self.providers):
+                print(f"Scanning {provider['name']}...")
+                futures[pool.submit(self.fetch_openai_compatible_models, provider, session)] = i
+
+            done, pending = wait(futures, timeout=self.scan_deadline)
+            for fut in done:
+                results[futures[fut]] = fut.result()
+            for fut in pending:
+                fut.cancel()
+                print(f"Scan deadline hit for {self.providers[futures[fut]]['name']}.")
+        finally:
+            # Don't block on stragglers past the deadline; their sockets time out on their own.
+            pool.shutdown(wait=False)
+            running = [f for f in futures if not f.done()]
+            if running:
+                # Their requests still use the session: close it once the last one returns
+                threading.Thread(target=lambda: (wait(running), session.close()), daemon=True).start()
+            else:
+                session.close()
+        return results
+
+    def _with_suggested(self, provider: Dict, models: List[Dict]) -> List[Dict]:
+        # For MVP, we use the suggested models if API call fails or for non-compatible ones.
+        # listing_source tells the change detector whether this is the provider's live listing.
+        if models:
+            return [{**m, "listing_source": "api"} for m in models]
+        return [{"provider": provider['name'], "model_id": m_id, "listing_source": "suggested"}
+                for m_id in provider.get('models_suggested', [])]
+
+    def _priced(self, models: List[Dict]) -> pd.DataFrame:
+        df = pd.DataFrame(models)
+        if not df.empty:
+            # Price the whole catalog in one pass
+            df = pd.concat([df, self.pricing.lookup_many(df['model_id'])], axis=1)
+        return compact(df)
+
+    def scan_provider(self, provider: Dict) -> pd.DataFrame:
+        """Priced catalog rows for one provider; used by the per-provider pipeline shards."""
+        return self._priced(self._with_suggested(provider, self.fetch_openai_compatible_models(provider)))
+
+    def run_scan(self, concurrent: bool = True):
+        start = time.time()
+        if concurrent:
+            fetched = self._fetch_all_concurrent()
+        else:
+            fetched = []
+            for provider in self.providers:
+                print(f"Scanning {provider['name']}...")
+                fetched.append(self.fetch_openai_compatible_models(provider))
 
-    def run_scan(self):
         all_models = []
-        for provider in self.providers:
-            print(f"Scanning {provider['name']}...")
-            # For MVP, we use the suggested models if API call fails or for non-compatible ones
-            models = self.fetch_openai_compatible_models(provider)
-            if not models:
-                for m_id in provider.get('models_suggested', []):
-                    models.append({
-                        "provider": provider['name'],
-                        "model_id": m_id
-                    })
-            
-            for m in models:
-                pricing = self.get_pricing_estimate(m['model_id'], provider['name'])
-                m.update(pricing)
-            
-            all_models.extend(models)
-        
-        df = pd.DataFrame(all_models)
-        os.makedirs("data", exist_ok=True)
-        df.to_csv("data/provider_catalog.csv", index=False)
-        print(f"Catalog saved with {len(df)} models.")
+        for provider, models in zip(self.providers, fetched):
+            all_models.extend(self._with_suggested(provider, models))
+
+        with span("scout.price"):
+            df = self._priced(all_models)
+        with span("io.write_catalog"):
+            write_frame(df, CATALOG_PATH, csv_path=CATALOG_CSV)
+        print(f"Catalog saved with {len(df)} models in {time.time() - start:.2f}s.")
         return df
 
 if __name__ == "__main__":
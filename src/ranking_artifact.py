@@ -0,0 +1,103 @@
+import os
+import threading
+from typing import Dict, Optional, Tuple
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from instrumentation import span, count
+from schema import compact, export_csv
+
+# Bump when the ranking columns change meaning; readers fall back to the CSV export on mismatch.
+ARTIFACT_VERSION = "1"
+RANKINGS_ARTIFACT = "data/model_rankings.arrow"
+RANKINGS_CSV = "data/model_rankings.csv"
+
+_CACHE: Dict[str, Tuple[Tuple[int, int], pd.DataFrame, Dict[str, str]]] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def write_rankings(df: pd.DataFrame, path: str = RANKINGS_ARTIFACT, csv_path: Optional[str] = RANKINGS_CSV) -> str:
+    """
+    Write the rankings as an uncompressed Arrow IPC (Feather v2) file so readers can
+    memory-map it, stamped with the artifact version. The CSV is kept as an export.
+    """
+    with span("io.write_rankings"):
+        _write(df, path, csv_path)
+    return path
+
+
+def _write(df: pd.DataFrame, path: str, csv_path: Optional[str]):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    # No timestamps: identical rankings give identical bytes
+    metadata[b"modelradar.artifact_version"] = ARTIFACT_VERSION.encode()
+    table = table.replace_schema_metadata(metadata)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+    if csv_path:
+        export_csv(table, csv_path)
+
+
+def _file_key(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def load_rankings(path: str = RANKINGS_ARTIFACT, csv_path: Optional[str] = RANKINGS_CSV) -> Optional[pd.DataFrame]:
+    """
+    Rankings shared by the engine, feed and dashboard. Parsed once per file version
+    (mtime + size); later calls cost one stat(). Falls back to the CSV export when
+    the artifact is missing or from another version, and reads `path` as CSV if it
+    names one. Returns None if nothing is found.
+
+    The returned frame is a shallow copy: add columns freely, but don't edit values in place.
+    """
+    if path and path.endswith(".csv"):
+        path, csv_path = None, path
+    for source in (path, csv_path):
+        key = _file_key(source) if source else None
+        if key is None:
+            continue
+        with _CACHE_LOCK:
+            cached = _CACHE.get(source)
+            if cached and cached[0] == key:
+                count("rankings_cache_hits_total")
+                return cached[1].copy(deep=False)
+
+        with span("io.load_rankings", format="csv" if source == csv_path else "arrow"):
+            df, meta = _read(source, arrow=source == path)
+        if df is None:
+            continue
+
+        with _CACHE_LOCK:
+            _CACHE[source] = (key, df, meta)
+        return df.copy(deep=False)
+    return None
+
+
+def _read(source: str, arrow: bool) -> Tuple[Optional[pd.DataFrame], Dict[str, str]]:
+    """Parse one rankings file; (None, meta) if the artifact is from another version."""
+    meta = {}
+    if arrow:
+        with pa.memory_map(source, 'r') as mapped:
+            table = pa.ipc.open_file(mapped).read_all()
+        meta = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items() if k.startswith(b"modelradar.")}
+        if meta.get("modelradar.artifact_version") != ARTIFACT_VERSION:
+            print(f"Ranking artifact {source} has version {meta.get('modelradar.artifact_version')}, "
+                  f"expected {ARTIFACT_VERSION}; using the CSV export.")
+            return None, meta
+        return table.to_pandas(), meta
+    return compact(pd.read_csv(source)), meta
+
+
+def rankings_metadata(path: str = RANKINGS_ARTIFACT) -> Dict[str, str]:
+    """Version metadata of the currently cached artifact (empty if not loaded)."""
+    load_rankings(path)
+    cached = _CACHE.get(path)
+    return dict(cached[2]) if cached else {}
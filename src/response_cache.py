@@ -0,0 +1,93 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import contextlib
+from typing import Dict, Iterator, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    model_id TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed);
+"""
+
+# How the benchmarker uses the cache: reuse cached responses, refresh them (always call,
+# then store; for timing runs), or off.
+CACHE_MODES = ("reuse", "refresh", "off")
+
+
+class ResponseCache:
+    """
+    On-disk cache of benchmark responses, content-addressed by a hash of
+    (provider, model, prompt, request params). Entries expire after `ttl_hours`; when
+    the stored bodies exceed `max_bytes` the least recently used ones are evicted.
+    """
+    def __init__(self, db_path: str = "data/cache/responses.sqlite", ttl_hours: float = 24.0,
+                 max_bytes: int = 64 * 2 ** 20):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Benchmark threads share the file; wait for each other's writes. The connection
+        # commits (or rolls back) and is closed when the block exits.
+        with contextlib.closing(sqlite3.connect(self.db_path, timeout=30)) as conn, conn:
+            yield conn
+
+    @staticmethod
+    def key(provider: str, model: str, prompt: str, params: Optional[Dict] = None) -> str:
+        payload = {"provider": provider, "model": model, "prompt": prompt, "params": params or {}}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Cached response, or None if missing or expired."""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT created, body FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[0] > self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        return json.loads(row[1])
+
+    def put(self, key: str, provider: str, model: str, response: Dict):
+        body = json.dumps(response, default=float)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         (key, provider, model, now, now, len(body), body))
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_seconds,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
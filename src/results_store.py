@@ -0,0 +1,145 @@
+import os
+import json
+import sqlite3
+import contextlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Set
+import pandas as pd
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS task_results (
+    provider TEXT NOT NULL,
+    model_id TEXT NOT NULL,
+    task TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    score REAL,
+    latency REAL,
+    tokens_per_sec REAL,
+    simulated INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (provider, model_id, task, timestamp)
+);
+CREATE TABLE IF NOT EXISTS model_results (
+    provider TEXT NOT NULL,
+    model_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    input REAL,
+    output REAL,
+    simulated INTEGER NOT NULL DEFAULT 0,
+    row_json TEXT NOT NULL,
+    PRIMARY KEY (provider, model_id, timestamp)
+);
+CREATE INDEX IF NOT EXISTS idx_model_latest ON model_results (provider, model_id, timestamp DESC);
+"""
+
+# Backoff before retrying a keyed model whose real calls all failed: doubles with each
+# failed run, up to the TTL. A little under a day, so a daily run retries a first failure.
+RETRY_HOURS = 20.0
+
+
+class ResultsStore:
+    """
+    Persistent SQLite history of benchmark results keyed by (provider, model_id, task, timestamp).
+    Lets benchmark_all schedule only models that are new, stale, or repriced.
+    """
+    def __init__(self, db_path: str = "data/benchmark_store.sqlite"):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """One transaction (committed, or rolled back on error) on a connection closed afterwards."""
+        with contextlib.closing(sqlite3.connect(self.db_path)) as conn, conn:
+            yield conn
+
+    def record(self, model_row: Dict, task_rows: List[Dict], pricing: Dict, simulated: bool,
+               timestamp: Optional[str] = None):
+        """Store one model's benchmark row (as written to benchmark_results.parquet) and its per-task results."""
+        ts = timestamp or datetime.now(timezone.utc).isoformat(timespec='seconds')
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO model_results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (model_row['provider'], model_row['model_id'], ts, pricing.get('input'), pricing.get('output'),
+                 int(simulated), json.dumps(model_row, default=float))
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO task_results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(model_row['provider'], model_row['model_id'], t['task'], ts, t.get('score'),
+                  t.get('latency'), t.get('tokens_per_sec'), int(t.get('simulated', simulated))) for t in task_rows]
+            )
+
+    def latest(self) -> pd.DataFrame:
+        """Most recent model_results entry per (provider, model_id)."""
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                """
+                SELECT m.provider, m.model_id, m.timestamp, m.input, m.output, m.simulated, m.row_json
+                FROM model_results m
+                JOIN (SELECT provider, model_id, MAX(timestamp) AS ts FROM model_results GROUP BY provider, model_id) l
+                  ON m.provider = l.provider AND m.model_id = l.model_id AND m.timestamp = l.ts
+                """,
+                conn
+            )
+
+    def failure_streaks(self) -> pd.DataFrame:
+        """Simulated (all real calls failed) runs per model since its last real measurement."""
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                """
+                SELECT m.provider, m.model_id, COUNT(*) AS failures
+                FROM model_results m
+                LEFT JOIN (SELECT provider, model_id, MAX(timestamp) AS ts FROM model_results
+                           WHERE simulated = 0 GROUP BY provider, model_id) r
+                  ON m.provider = r.provider AND m.model_id = r.model_id
+                WHERE m.simulated = 1 AND (r.ts IS NULL OR m.timestamp > r.ts)
+                GROUP BY m.provider, m.model_id
+                """,
+                conn
+            )
+
+    def select_due(self, catalog: pd.DataFrame, ttl_days: float = 7.0, real_providers: Optional[Set[str]] = None,
+                   max_models: Optional[int] = None, retry_hours: float = RETRY_HOURS) -> pd.DataFrame:
+        """
+        Catalog rows needing a benchmark: never measured, older than `ttl_days`, priced
+        differently from when last measured, or only simulated so far although their
+        provider is in `real_providers`. The last are retried with backoff: `retry_hours`
+        after the first simulated run, doubling with each one after it.
+        Ordered new first, then repriced, then oldest; at most `max_models` rows.
+        """
+        if catalog.empty:
+            return catalog
+        latest = self.latest().drop(columns=['row_json'])
+        catalog = catalog.drop_duplicates(subset=['provider', 'model_id'])
+        merged = catalog.merge(latest, on=['provider', 'model_id'], how='left', suffixes=('', '_stored'))
+
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=ttl_days)).isoformat(timespec='seconds')
+        is_new = merged['timestamp'].isna()
+        is_stale = ~is_new & (merged['timestamp'] < cutoff)
+        repriced = ~is_new & (
+            (merged['input'].fillna(-1).round(6) != merged['input_stored'].fillna(-1).round(6)) |
+            (merged['output'].fillna(-1).round(6) != merged['output_stored'].fillna(-1).round(6))
+        )
+        due = is_new | is_stale | repriced
+        if real_providers:
+            merged = merged.merge(self.failure_streaks(), on=['provider', 'model_id'], how='left')
+            backoff_hours = (retry_hours * 2.0 ** (merged['failures'].fillna(1) - 1)).clip(upper=ttl_days * 24)
+            retry_at = pd.to_datetime(merged['timestamp'], utc=True) + pd.to_timedelta(backoff_hours, unit='h')
+            due |= (merged['simulated'].fillna(0).astype(bool) & merged['provider'].isin(real_providers)
+                    & (retry_at <= datetime.now(timezone.utc)))
+
+        merged['_priority'] = 2
+        merged.loc[repriced, '_priority'] = 1
+        merged.loc[is_new, '_priority'] = 0
+        merged = merged[due].sort_values(['_priority', 'timestamp'], na_position='first', kind='stable')
+        if max_models is not None:
+            merged = merged.head(max_models)
+        return merged[catalog.columns]
+
+    def latest_results(self, catalog: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Latest benchmark row per model, restricted to models still in `catalog` if given."""
+        latest = self.latest()
+        if catalog is not None and not latest.empty:
+            keys = catalog[['provider', 'model_id']].drop_duplicates()
+            latest = latest.merge(keys, on=['provider', 'model_id'])
+        return pd.DataFrame([json.loads(r) for r in latest['row_json']])
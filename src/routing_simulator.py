@@ -0,0 +1,278 @@
+import argparse
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence
+from ranking_artifact import load_rankings
+from intelligence_engine import SCORING_PROFILES
+from task_registry import CONTEXT_TIERS
+from schema import widen
+
+POLICIES = ("cheapest_meeting_slo", "pareto_weighted", "cascade")
+# Requests replayed per vectorized block; bounds memory for million-request traces
+REPLAY_CHUNK = 65536
+# Assumed time to first token when a model has no streamed measurements
+DEFAULT_TTFT = 0.5
+DEFAULT_TASK_MIX = {"Coding": 0.3, "Math": 0.2, "Reasoning": 0.3, "LongContext": 0.2}
+# Prompt tokens each context tier's TTFT was measured at (filler budget plus the question)
+TIER_TOKENS = {tier: tokens + 100 for tier, tokens in CONTEXT_TIERS.items()}
+
+
+def synthetic_trace(n: int, task_mix: Optional[Dict[str, float]] = None, mean_input: float = 1500,
+                    mean_output: float = 300, slo_s: float = 5.0, seed: int = 0) -> pd.DataFrame:
+    """
+    A workload of `n` requests: task drawn from `task_mix`, lognormal input/output token
+    counts around the given means, and one latency SLO (seconds) for all requests.
+    """
+    mix = task_mix or DEFAULT_TASK_MIX
+    rng = np.random.default_rng(seed)
+    names = list(mix)
+    weights = np.array([mix[t] for t in names], dtype=float)
+    sigma = 0.8
+    return pd.DataFrame({
+        "task": pd.Categorical.from_codes(rng.choice(len(names), size=n, p=weights / weights.sum()), categories=names),
+        "input_tokens": np.maximum(1, rng.lognormal(np.log(mean_input) - sigma ** 2 / 2, sigma, n)).astype(np.int32),
+        "output_tokens": np.maximum(1, rng.lognormal(np.log(mean_output) - sigma ** 2 / 2, sigma, n)).astype(np.int32),
+        "slo_s": np.full(n, slo_s, dtype=np.float32),
+    })
+
+
+def load_trace(path: str) -> pd.DataFrame:
+    """A trace file (.parquet, .csv or .jsonl) with task, input_tokens, output_tokens and optionally slo_s."""
+    if path.endswith(".parquet"):
+        trace = pd.read_parquet(path)
+    elif path.endswith(".jsonl"):
+        trace = pd.read_json(path, lines=True)
+    else:
+        trace = pd.read_csv(path)
+    missing = {"task", "input_tokens", "output_tokens"} - set(trace.columns)
+    if missing:
+        raise ValueError(f"Trace {path} is missing columns {sorted(missing)}")
+    return trace
+
+
+class RoutingSimulator:
+    """
+    Replays a workload trace against the ranking table and reports, per routing
+    policy, total cost, expected quality and latency-SLO attainment.
+
+    Per candidate model: price from input/output $/M, quality per task from
+    <task>_score (avg_perf otherwise), and latency = TTFT + output_tokens / decode rate.
+    TTFT is interpolated over the measured per-context-tier curve (ttft_ctx_<tier>)
+    when present, else avg_ttft; the decode rate is decode_tps, else avg_speed.
+
+    Policies:
+      cheapest_meeting_slo  cheapest model predicted to meet the SLO (and `min_quality`);
+                            the fastest one if none does
+      pareto_weighted       among Pareto-front models meeting the SLO, the best weighted
+                            score of quality, cost and latency (engine SCORING_PROFILES)
+      cascade               try models from cheap to strong (`cascade_depth` steps along
+                            the quality/price frontier); each answer is accepted with
+                            probability = its quality (seeded draws), paying every attempt
+      fixed:<model_id>      always that model, as a baseline
+
+    Candidates are the Pareto-front models plus the best by value_score, up to
+    `max_candidates`. The trace is replayed in REPLAY_CHUNK blocks as
+    (requests x candidates) arrays.
+    """
+    def __init__(self, rankings: Optional[pd.DataFrame] = None, max_candidates: int = 20, profile: str = "balanced",
+                 min_quality: float = 0.0, cascade_depth: int = 3, seed: int = 0):
+        if rankings is None:
+            rankings = load_rankings()
+        if rankings is None or rankings.empty:
+            raise ValueError("No rankings to route over; run the pipeline first.")
+        self.profile = SCORING_PROFILES[profile]
+        self.min_quality = min_quality
+        self.cascade_depth = cascade_depth
+        self.seed = seed
+        self.all_models = widen(rankings)
+        self.models = self._candidates(self.all_models, max_candidates)
+        if self.models.empty:
+            raise ValueError("No ranked model has prices, quality and speed to route over.")
+
+    def _candidates(self, df: pd.DataFrame, max_candidates: int) -> pd.DataFrame:
+        usable = df.dropna(subset=['input', 'output', 'avg_perf'])
+        usable = usable[usable[['decode_tps', 'avg_speed']].max(axis=1) > 0] if 'decode_tps' in usable.columns \
+            else usable[usable['avg_speed'] > 0]
+        by_value = usable.sort_values('value_score', ascending=False)
+        if 'pareto_front' in usable.columns:
+            front = by_value[by_value['pareto_front'].fillna(False).astype(bool)]
+            by_value = pd.concat([front, by_value]).drop_duplicates(subset=['provider', 'model_id'])
+        return by_value.head(max_candidates).reset_index(drop=True)
+
+    def _model_arrays(self, models: pd.DataFrame, tasks: Sequence[str]) -> Dict[str, np.ndarray]:
+        decode = models['decode_tps'] if 'decode_tps' in models.columns else pd.Series(np.nan, index=models.index)
+        decode = decode.where(decode > 0, models['avg_speed']).to_numpy(dtype=float)
+        base_ttft = models['avg_ttft'] if 'avg_ttft' in models.columns else pd.Series(np.nan, index=models.index)
+        base_ttft = base_ttft.fillna(DEFAULT_TTFT).to_numpy(dtype=float)
+        curves = [(TIER_TOKENS[t], f"ttft_ctx_{t}") for t in sorted(TIER_TOKENS, key=TIER_TOKENS.get)
+                  if f"ttft_ctx_{t}" in models.columns]
+        ttft_points = []
+        for i in range(len(models)):
+            points = [(x, models[col].iloc[i]) for x, col in curves if pd.notna(models[col].iloc[i])]
+            ttft_points.append(points if len(points) >= 2 else None)
+        quality = np.empty((len(tasks), len(models)))
+        for t, task in enumerate(tasks):
+            col = f"{task}_score"
+            q = models[col].fillna(models['avg_perf']) if col in models.columns else models['avg_perf']
+            quality[t] = q.to_numpy(dtype=float)
+        return {
+            "price_in": models['input'].to_numpy(dtype=float) / 1e6,
+            "price_out": models['output'].to_numpy(dtype=float) / 1e6,
+            "decode": decode,
+            "ttft": base_ttft,
+            "ttft_points": ttft_points,
+            "quality": np.clip(quality, 0.0, 1.0),
+        }
+
+    @staticmethod
+    def _latency(arrays: Dict, input_tokens: np.ndarray, output_tokens: np.ndarray) -> np.ndarray:
+        ttft = np.broadcast_to(arrays["ttft"], (input_tokens.size, arrays["ttft"].size)).copy()
+        for m, points in enumerate(arrays["ttft_points"]):
+            if points:
+                xs, ys = zip(*points)
+                ttft[:, m] = np.interp(input_tokens, xs, ys)
+        return ttft + output_tokens[:, None] / arrays["decode"]
+
+    def _cascade_chain(self, arrays: Dict) -> np.ndarray:
+        """Up to cascade_depth candidates along the frontier of mean quality vs. price, cheapest first."""
+        price = arrays["price_in"] + arrays["price_out"]
+        mean_quality = arrays["quality"].mean(axis=0)
+        frontier = []
+        best = -np.inf
+        for m in np.lexsort((-mean_quality, price)):
+            if mean_quality[m] > best:
+                frontier.append(m)
+                best = mean_quality[m]
+        picks = np.unique(np.linspace(0, len(frontier) - 1, min(self.cascade_depth, len(frontier))).round().astype(int))
+        return np.array(frontier)[picks]
+
+    def replay(self, trace: pd.DataFrame, policies: Sequence[str] = POLICIES, slo_s: Optional[float] = None) -> pd.DataFrame:
+        """
+        One summary row per policy: total and per-1k-request cost ($), mean expected
+        quality, share of requests within their SLO, latency p50/p95 and the most used model.
+        `slo_s` overrides the trace's slo_s column (required if the trace has none).
+        """
+        task = trace['task']
+        if not isinstance(task.dtype, pd.CategoricalDtype):
+            task = task.astype("category")
+        tasks = [str(t) for t in task.cat.categories]
+        task_codes = task.cat.codes.to_numpy()
+        arrays = self._model_arrays(self.models, tasks)
+        input_tokens = trace['input_tokens'].to_numpy(dtype=float)
+        output_tokens = trace['output_tokens'].to_numpy(dtype=float)
+        if slo_s is not None:
+            slo = np.full(len(trace), slo_s, dtype=float)
+        elif 'slo_s' in trace.columns:
+            slo = trace['slo_s'].to_numpy(dtype=float)
+        else:
+            raise ValueError("Trace has no slo_s column; pass slo_s.")
+
+        frontier = self.models['pareto_front'].fillna(False).astype(bool).to_numpy() \
+            if 'pareto_front' in self.models.columns else np.ones(len(self.models), dtype=bool)
+        frontier = np.flatnonzero(frontier) if frontier.any() else np.arange(len(self.models))
+        chain = self._cascade_chain(arrays)
+        fixed = {}
+        for policy in policies:
+            if policy.startswith("fixed:"):
+                fixed[policy] = self._fixed_arrays(policy.split(":", 1)[1], tasks)
+
+        rng = np.random.default_rng(self.seed)
+        out = {p: {"cost": [], "quality": [], "latency": [], "choice": []} for p in policies}
+        for start in range(0, len(trace), REPLAY_CHUNK):
+            sl = slice(start, start + REPLAY_CHUNK)
+            inp, outp, codes, limit = input_tokens[sl], output_tokens[sl], task_codes[sl], slo[sl]
+            cost = inp[:, None] * arrays["price_in"] + outp[:, None] * arrays["price_out"]
+            latency = self._latency(arrays, inp, outp)
+            quality = arrays["quality"][codes]
+            feasible = (latency <= limit[:, None]) & (quality >= self.min_quality)
+            rows = np.arange(len(inp))
+            draws = rng.random((len(inp), len(chain)))
+
+            for policy in policies:
+                if policy == "cheapest_meeting_slo":
+                    pick = np.where(feasible.any(axis=1), np.where(feasible, cost, np.inf).argmin(axis=1), latency.argmin(axis=1))
+                    self._collect(out[policy], cost[rows, pick], quality[rows, pick], latency[rows, pick], pick)
+                elif policy == "pareto_weighted":
+                    pick = self._weighted_pick(cost, quality, latency, feasible, frontier)
+                    self._collect(out[policy], cost[rows, pick], quality[rows, pick], latency[rows, pick], pick)
+                elif policy == "cascade":
+                    accepted = draws < quality[:, chain]
+                    first = np.where(accepted.any(axis=1), accepted.argmax(axis=1), len(chain) - 1)
+                    steps = np.arange(len(chain))[None, :] <= first[:, None]
+                    self._collect(out[policy], (cost[:, chain] * steps).sum(axis=1), accepted[rows, first].astype(float),
+                                  (latency[:, chain] * steps).sum(axis=1), chain[first])
+                elif policy in fixed:
+                    f = fixed[policy]
+                    c = inp * f["price_in"][0] + outp * f["price_out"][0]
+                    lat = self._latency(f, inp, outp)[:, 0]
+                    self._collect(out[policy], c, f["quality"][codes, 0], lat, np.full(len(inp), -1))
+                else:
+                    raise ValueError(f"Unknown routing policy '{policy}'")
+
+        names = self.models['model_id'].astype(str).to_numpy()
+        summary = []
+        for policy in policies:
+            cost = np.concatenate(out[policy]["cost"])
+            latency = np.concatenate(out[policy]["latency"])
+            choice = np.concatenate(out[policy]["choice"])
+            used, counts = np.unique(choice, return_counts=True)
+            top = used[counts.argmax()]
+            summary.append({
+                "policy": policy,
+                "requests": int(cost.size),
+                "total_cost": round(float(cost.sum()), 4),
+                "cost_per_1k": round(float(cost.mean() * 1000), 4),
+                "quality": round(float(np.concatenate(out[policy]["quality"]).mean()), 4),
+                "slo_attainment": round(float((latency <= slo).mean()), 4),
+                "latency_p50": round(float(np.percentile(latency, 50)), 3),
+                "latency_p95": round(float(np.percentile(latency, 95)), 3),
+                "models_used": int(used.size),
+                "top_model": policy.split(":", 1)[1] if top < 0 else names[top],
+                "top_model_share": round(float(counts.max() / cost.size), 4),
+            })
+        return pd.DataFrame(summary)
+
+    def _weighted_pick(self, cost, quality, latency, feasible, cols: np.ndarray) -> np.ndarray:
+        """Per request, the best profile-weighted score among `cols`, preferring those meeting the SLO."""
+        def norm(x):
+            x = x[:, cols]
+            low = x.min(axis=1, keepdims=True)
+            span = x.max(axis=1, keepdims=True) - low
+            return (x - low) / np.where(span > 0, span, 1.0)
+        # Profile weights on quality columns count for quality; speed and p90 latency for latency
+        w = self.profile
+        w_quality = sum(v for k, v in w.items() if k == "avg_perf" or k.endswith("_score"))
+        w_latency = w.get("avg_speed", 0) + w.get("latency_p90", 0)
+        score = w_quality * norm(quality) - w.get("avg_cost", 0) * norm(cost) - w_latency * norm(latency)
+        feasible = feasible[:, cols]
+        score[feasible.any(axis=1)[:, None] & ~feasible] = -np.inf
+        return cols[score.argmax(axis=1)]
+
+    def _fixed_arrays(self, model_id: str, tasks: Sequence[str]) -> Dict:
+        match = self.all_models[self.all_models['model_id'].astype(str) == model_id]
+        if match.empty:
+            raise ValueError(f"Model '{model_id}' is not in the rankings")
+        return self._model_arrays(match.head(1).reset_index(drop=True), tasks)
+
+    @staticmethod
+    def _collect(acc: Dict[str, List], cost, quality, latency, choice):
+        acc["cost"].append(cost.astype(np.float64))
+        acc["quality"].append(quality.astype(np.float32))
+        acc["latency"].append(latency.astype(np.float32))
+        acc["choice"].append(choice.astype(np.int32))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a workload trace against the current rankings.")
+    parser.add_argument("--trace", help="Trace file (.parquet/.csv/.jsonl); default: a synthetic trace.")
+    parser.add_argument("--requests", type=int, default=100000, help="Synthetic trace size.")
+    parser.add_argument("--slo", type=float, default=5.0, help="Latency SLO in seconds.")
+    parser.add_argument("--baseline", help="Also replay always routing to this model_id.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    trace = load_trace(args.trace) if args.trace else synthetic_trace(args.requests, slo_s=args.slo, seed=args.seed)
+    policies = list(POLICIES) + ([f"fixed:{args.baseline}"] if args.baseline else [])
+    sim = RoutingSimulator(seed=args.seed)
+    pd.set_option("display.width", 200)
+    print(sim.replay(trace, policies, slo_s=None if 'slo_s' in trace.columns else args.slo).to_string(index=False))
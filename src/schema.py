@@ -0,0 +1,131 @@
+import os
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+# Stage exchange files. The Parquet file is what the next stage reads; the CSV next to
+# it is an export for people and spreadsheets.
+CATALOG_PATH = "data/provider_catalog.parquet"
+CATALOG_CSV = "data/provider_catalog.csv"
+BENCHMARK_PATH = "data/benchmark_results.parquet"
+BENCHMARK_CSV = "data/benchmark_results.csv"
+TRIALS_PATH = "data/benchmark_trials.parquet"
+TRIALS_CSV = "data/benchmark_trials.csv"
+
+# Repeated identifiers: stored once per distinct value (pandas categorical / Arrow dictionary).
+CATEGORICAL = ["provider", "model_id", "owned_by", "pricing_source", "listing_source"]
+# Measured metrics fit float32 (7 significant digits). Prices and the ratios derived from
+# them (input, output, avg_cost, value_score) stay float64.
+FLOAT32 = ["avg_speed", "avg_perf", "avg_ttft", "decode_tps", "avg_latency"]
+FLOAT32_PREFIXES = ("latency_", "itl_", "speed_", "profile_", "tps_", "ttft_")
+FLOAT32_SUFFIXES = ("_score",)
+FLOAT64 = ["input", "output", "avg_cost", "value_score"]
+INTEGER = {"created": "Int64"}
+
+
+def dtype_for(column: str) -> Optional[str]:
+    """Target dtype for a known column, or None to leave it as parsed."""
+    if column in CATEGORICAL:
+        return "category"
+    if column in FLOAT64:
+        return "float64"
+    if column in INTEGER:
+        return INTEGER[column]
+    if column in FLOAT32 or column.startswith(FLOAT32_PREFIXES) or column.endswith(FLOAT32_SUFFIXES):
+        return "float32"
+    return None
+
+
+def compact(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast known columns to their compact dtypes (see dtype_for); other columns are untouched."""
+    casts = {}
+    for col in df.columns:
+        target = dtype_for(col)
+        if target is None or str(df[col].dtype) == target:
+            continue
+        if target.startswith("float") and not pd.api.types.is_numeric_dtype(df[col]):
+            # All-null columns read from CSV come back as object
+            if df[col].notna().any():
+                continue
+        if target == "Int64" and not pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        casts[col] = target
+    return df.astype(casts) if casts else df
+
+
+def _float32_to_float64(values: pd.Series) -> pd.Series:
+    """Widen float32 to the float64 nearest its 7-significant-digit value (0.6506, not 0.6506000161)."""
+    x = values.to_numpy(dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        magnitude = np.floor(np.log10(np.abs(x)))
+        scale = np.power(10.0, 6 - np.where(np.isfinite(magnitude), magnitude, 0))
+        rounded = np.round(x * scale) / scale
+    return pd.Series(np.where(np.isfinite(rounded), rounded, x), index=values.index, name=values.name)
+
+
+def widen(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Plain dtypes for exports: categoricals back to strings and float32 to float64.
+    JSON feeds and daily history snapshots go through this so their content and
+    schema don't depend on the in-memory representation.
+    """
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            out[col] = s.astype(s.cat.categories.dtype)
+        elif s.dtype == np.float32:
+            out[col] = _float32_to_float64(s)
+        else:
+            out[col] = s
+    return pd.DataFrame(out, index=df.index)
+
+
+def export_csv(table: pa.Table, path: str):
+    """CSV export through Arrow's writer, several times faster than DataFrame.to_csv."""
+    tmp_path = path + ".tmp"
+    pa_csv.write_csv(table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def write_frame(df: pd.DataFrame, path: str, csv_path: Optional[str] = None) -> str:
+    """Atomically write the compacted frame as Parquet, plus an optional CSV export."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    table = pa.Table.from_pandas(compact(df), preserve_index=False)
+    tmp_path = path + ".tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+    if csv_path:
+        export_csv(table, csv_path)
+    return path
+
+
+def read_frame(path: str, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """
+    Read a stage file with compact dtypes. `path` may be Parquet or CSV; for a Parquet
+    path that doesn't exist, the CSV export beside it is used (data dirs written before
+    the Parquet exchange). None if neither exists; empty files give an empty frame.
+    """
+    sources = [path]
+    if not path.endswith(".csv"):
+        sources.append(os.path.splitext(path)[0] + ".csv")
+    for source in sources:
+        if not os.path.exists(source):
+            continue
+        if source.endswith(".csv"):
+            try:
+                df = pd.read_csv(source, usecols=columns)
+            except pd.errors.EmptyDataError:
+                return pd.DataFrame()
+        else:
+            df = pd.read_parquet(source, columns=columns)
+        return compact(df)
+    return None
+
+
+def footprint(df: pd.DataFrame) -> Dict[str, float]:
+    """Rows and deep in-memory size in MB, for logging and benchmarks."""
+    return {"rows": len(df), "mb": round(df.memory_usage(deep=True).sum() / 2 ** 20, 2)}
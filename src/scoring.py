@@ -0,0 +1,247 @@
+import re
+import sys
+import json
+import tempfile
+import importlib
+import threading
+import subprocess
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # not on Windows; the sandbox then relies on the wall-clock timeout alone
+    resource = None
+
+# A scorer maps (model answer, task's scorer spec) to a quality score in [0, 1].
+Scorer = Callable[[str, Dict], float]
+
+NUMBER = re.compile(r"-?\d+(?:,\d{3})*(?:\.\d+)?")
+FENCE = re.compile(r"```(?:python|py)?[ \t]*\n(.*?)```", re.DOTALL)
+
+# Limits for the code sandbox
+SANDBOX_TIMEOUT = 5.0
+SANDBOX_CPU_SECONDS = 2
+SANDBOX_MEMORY_BYTES = 256 * 2 ** 20
+
+SANDBOX_RUNNER = r"""
+import json, sys
+job = json.loads(sys.stdin.read())
+sys.setrecursionlimit(10000)
+namespace = {"__name__": "candidate"}
+try:
+    exec(compile(job["code"], "<candidate>", "exec"), namespace)
+    fn = namespace[job["function"]]
+except BaseException as e:
+    print(json.dumps({"passed": 0, "error": type(e).__name__}))
+    sys.exit(0)
+passed = 0
+for case in job["cases"]:
+    try:
+        if fn(*case["args"]) == case["expected"]:
+            passed += 1
+    except BaseException:
+        pass
+print(json.dumps({"passed": passed}))
+"""
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"[^a-z0-9.\-]+", " ", text.lower()).strip()
+
+
+def exact_match(answer: str, spec: Dict) -> float:
+    """1.0 if the normalized answer equals `expected` (or any of a list of accepted answers)."""
+    expected = spec["expected"] if isinstance(spec["expected"], list) else [spec["expected"]]
+    return 1.0 if _normalize(answer) in {_normalize(str(e)) for e in expected} else 0.0
+
+
+def numeric_match(answer: str, spec: Dict) -> float:
+    """1.0 if the last number in the answer is within `tolerance` (relative) of `expected`."""
+    numbers = NUMBER.findall(answer)
+    if not numbers:
+        return 0.0
+    value = float(numbers[-1].replace(",", ""))
+    expected = float(spec["expected"])
+    return 1.0 if abs(value - expected) <= spec.get("tolerance", 1e-9) * max(1.0, abs(expected)) else 0.0
+
+
+def choice_match(answer: str, spec: Dict) -> float:
+    """Multiple choice: 1.0 if the last option label the answer mentions is `expected`."""
+    options = spec.get("options", ["A", "B", "C", "D", "E"])
+    picked = [t for t in re.findall(r"\b[A-Za-z]\b", answer) if t in options]
+    return 1.0 if picked and picked[-1] == spec["expected"] else 0.0
+
+
+def extract_code(answer: str) -> str:
+    """
+    The code in a completion: the first fenced block if there is one, otherwise the text
+    from the first def/import on, cut back to the longest prefix of lines that compiles
+    (completions often trail off with prose or get truncated mid-line).
+    """
+    fenced = FENCE.search(answer)
+    if fenced:
+        return fenced.group(1)
+    start = re.search(r"^(def |import |from )", answer, re.MULTILINE)
+    lines = answer[start.start():].splitlines() if start else answer.splitlines()
+    for end in range(len(lines), 0, -1):
+        code = "\n".join(lines[:end])
+        try:
+            compile(code, "<candidate>", "exec")
+            return code
+        except (SyntaxError, ValueError):
+            continue
+    return ""
+
+
+def _limit_child():
+    resource.setrlimit(resource.RLIMIT_CPU, (SANDBOX_CPU_SECONDS, SANDBOX_CPU_SECONDS))
+    resource.setrlimit(resource.RLIMIT_AS, (SANDBOX_MEMORY_BYTES, SANDBOX_MEMORY_BYTES))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (0, 0))
+    resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+
+
+def python_tests(answer: str, spec: Dict) -> float:
+    """
+    Fraction of `cases` ({"args": [...], "expected": ...}) the answer's `function` passes.
+    The code runs in a separate, isolated interpreter (python -I) in an empty temp dir
+    with an empty environment, a wall-clock timeout and, on POSIX, CPU, memory, file-size
+    and process limits. That bounds runaway or greedy code; it is not a security
+    boundary against deliberately hostile code.
+    """
+    code = extract_code(answer)
+    cases = spec["cases"]
+    if not code or not cases:
+        return 0.0
+    job = json.dumps({"code": code, "function": spec["function"], "cases": cases})
+    with tempfile.TemporaryDirectory(prefix="modelradar-sandbox-") as workdir:
+        try:
+            proc = subprocess.run(
+                [sys.executable, "-I", "-c", SANDBOX_RUNNER], input=job, capture_output=True, text=True,
+                timeout=spec.get("timeout", SANDBOX_TIMEOUT), cwd=workdir, env={},
+                preexec_fn=_limit_child if resource is not None else None,
+            )
+        except subprocess.TimeoutExpired:
+            return 0.0
+    try:
+        passed = json.loads(proc.stdout.strip().splitlines()[-1])["passed"]
+    except (IndexError, ValueError, KeyError):
+        return 0.0
+    return passed / len(cases)
+
+
+SCORERS: Dict[str, Scorer] = {
+    "exact": exact_match,
+    "numeric": numeric_match,
+    "choice": choice_match,
+    "python_tests": python_tests,
+}
+
+
+def resolve_scorer(name: str) -> Scorer:
+    """A built-in scorer, or "package.module:function" for a custom one (importable by the worker processes)."""
+    if name in SCORERS:
+        return SCORERS[name]
+    if ":" in name:
+        module, attr = name.split(":", 1)
+        return getattr(importlib.import_module(module), attr)
+    raise ValueError(f"Unknown scorer '{name}'")
+
+
+def score(answer: Optional[str], spec: Optional[Dict]) -> Optional[float]:
+    """Score one answer; None when the task declares no scorer."""
+    if not spec:
+        return None
+    if not answer:
+        return 0.0
+    try:
+        return float(resolve_scorer(spec["type"])(answer, spec))
+    except Exception as e:
+        print(f"Scorer {spec.get('type')} failed: {e}")
+        return 0.0
+
+
+def score_batch(items: List[Tuple[Optional[str], Optional[Dict]]]) -> List[Optional[float]]:
+    return [score(answer, spec) for answer, spec in items]
+
+
+def _pool_context():
+    # Scoring is submitted from the benchmark's worker threads; forking a threaded
+    # process can deadlock, so workers come from a single-threaded fork server. Only this
+    # module is preloaded there: preloading __main__ would re-import the entry script.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(["scoring"])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+class BatchScorer:
+    """
+    Scores answers in a process pool, off the HTTP fetch threads. `submit` returns a
+    Future right away; answers are queued and sent to the pool `batch_size` at a time
+    (plus whatever is left on `flush`/exit), so the per-task IPC cost is amortized and
+    slow checks such as the code sandbox never block a fetch.
+
+    The pool starts on the first dispatch, so one scorer can be created up front and
+    shared by concurrent benchmark runs (the orchestrator's provider branches); whoever
+    created it closes it.
+    """
+    def __init__(self, max_workers: Optional[int] = None, batch_size: int = 8):
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending: List[Tuple[Future, Optional[str], Optional[Dict]]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=_pool_context())
+            return self._pool
+
+    def submit(self, answer: Optional[str], spec: Optional[Dict]) -> Future:
+        future = Future()
+        batch = None
+        with self._lock:
+            self._pending.append((future, answer, spec))
+            if len(self._pending) >= self.batch_size:
+                batch, self._pending = self._pending, []
+        if batch:
+            self._dispatch(batch)
+        return future
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[Future, Optional[str], Optional[Dict]]]):
+        job = self.pool.submit(score_batch, [(answer, spec) for _, answer, spec in batch])
+
+        def done(job):
+            try:
+                scores = job.result()
+            except Exception as e:
+                for future, _, _ in batch:
+                    future.set_exception(e)
+                return
+            for (future, _, _), value in zip(batch, scores):
+                future.set_result(value)
+        job.add_done_callback(done)
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def __enter__(self) -> "BatchScorer":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,149 @@
+import os
+import json
+import glob
+import random
+from typing import Dict, List, Optional
+
+TASKS_DIR = "config/tasks"
+
+# Prompt-length tiers: approximate tokens of filler context put in front of the question.
+# Budgets leave room for the answer inside a 4k / 32k context window.
+CONTEXT_TIERS = {"short": 0, "4k": 3500, "32k": 30000}
+# Completion caps (max_tokens) per output tier.
+OUTPUT_TIERS = {"small": 256, "large": 1024}
+
+# Named samples: items per (category, context tier, output tier) stratum (None for all),
+# restricted to the listed tiers (None for all). The daily suite leaves out the 32k
+# haystack and the long generations: models with a smaller context window would fail
+# them every day, and they are the most expensive calls.
+SUITES = {
+    "daily": {"per_stratum": 1, "context_tiers": ["short", "4k"], "output_tiers": ["small"]},
+    "weekly": {"per_stratum": None, "context_tiers": None, "output_tiers": None},
+}
+
+FILLER_WORDS = (
+    "the report notes that regional teams reviewed quarterly figures while the committee "
+    "discussed supply schedules logistics budgets staffing plans and vendor contracts before "
+    "the annual audit archived records maintenance windows server capacity customer surveys "
+    "shipping delays and training sessions across several offices during the spring"
+).split()
+
+
+def approx_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token); used to size filler, not to bill."""
+    return len(text) // 4
+
+
+def haystack(tokens: int, seed: str, needle: Optional[str] = None, depth: float = 0.5) -> str:
+    """
+    Deterministic filler of about `tokens` tokens, with `needle` inserted as a sentence
+    at `depth` (0 = start, 1 = end) for retrieval items.
+    """
+    rng = random.Random(seed)
+    sentences = []
+    size = 0
+    while size < tokens * 4:
+        words = rng.choices(FILLER_WORDS, k=rng.randint(8, 18))
+        sentence = " ".join(words).capitalize() + "."
+        sentences.append(sentence)
+        size += len(sentence) + 1
+    if needle:
+        sentences.insert(int(len(sentences) * min(max(depth, 0.0), 1.0)), needle)
+    return " ".join(sentences)
+
+
+class TaskRegistry:
+    """
+    Benchmark task items loaded from JSONL files (one item per line) in `tasks_dir`:
+
+        {"id": "math-mul-1", "category": "Math", "prompt": "...", "scorer": {...},
+         "reference": "...", "context_tier": "short", "output_tier": "small",
+         "needle": "...", "needle_depth": 0.5}
+
+    `category` becomes the `<category>_score` column; items without a scorer are measured
+    for throughput only. `context_tier` (CONTEXT_TIERS) puts filler text in front of the
+    prompt, with the optional `needle` sentence hidden in it; `output_tier` (OUTPUT_TIERS)
+    sets max_tokens. `reference` is a correct answer (used by the provider simulator).
+    """
+    def __init__(self, tasks_dir: str = TASKS_DIR):
+        self.tasks_dir = tasks_dir
+        self.items: List[Dict] = []
+        for path in sorted(glob.glob(os.path.join(tasks_dir, "*.jsonl"))):
+            with open(path, "r") as f:
+                for n, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        self.items.append(self._validate(json.loads(line)))
+                    except (ValueError, KeyError) as e:
+                        raise ValueError(f"{path}:{n}: {e}") from None
+        ids = [item["id"] for item in self.items]
+        if len(ids) != len(set(ids)):
+            raise ValueError(f"Duplicate task ids in {tasks_dir}")
+
+    @staticmethod
+    def _validate(item: Dict) -> Dict:
+        for key in ("id", "category", "prompt"):
+            if not item.get(key):
+                raise KeyError(f"task item missing '{key}'")
+        item.setdefault("context_tier", "short")
+        item.setdefault("output_tier", "small")
+        if item["context_tier"] not in CONTEXT_TIERS:
+            raise ValueError(f"unknown context_tier '{item['context_tier']}'")
+        if item["output_tier"] not in OUTPUT_TIERS:
+            raise ValueError(f"unknown output_tier '{item['output_tier']}'")
+        return item
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def strata(self) -> Dict[tuple, List[Dict]]:
+        groups: Dict[tuple, List[Dict]] = {}
+        for item in self.items:
+            groups.setdefault((item["category"], item["context_tier"], item["output_tier"]), []).append(item)
+        return groups
+
+    def sample(self, per_stratum: Optional[int] = None, seed: int = 0, context_tiers: Optional[List[str]] = None,
+               output_tiers: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Up to `per_stratum` items from every (category, context tier, output tier)
+        stratum, drawn with a per-stratum seed so adding items to one file doesn't
+        reshuffle the others. None returns every item. `context_tiers` / `output_tiers`
+        keep only strata in those tiers.
+        """
+        picked = []
+        for key, group in sorted(self.strata().items()):
+            _, context_tier, output_tier = key
+            if (context_tiers is not None and context_tier not in context_tiers) or \
+                    (output_tiers is not None and output_tier not in output_tiers):
+                continue
+            if per_stratum is not None and len(group) > per_stratum:
+                group = random.Random(f"{seed}:{':'.join(key)}").sample(group, per_stratum)
+            picked.extend(group)
+        return picked
+
+    def suite(self, name: str = "daily", seed: int = 0) -> List[Dict]:
+        """Benchmark tasks for a named suite (SUITES), ready for AutoBenchmarker.benchmark_all."""
+        if name not in SUITES:
+            raise ValueError(f"Unknown suite '{name}', expected one of {sorted(SUITES)}")
+        return [self.build(item) for item in self.sample(seed=seed, **SUITES[name])]
+
+    @staticmethod
+    def build(item: Dict) -> Dict:
+        """The task dict benchmark_all runs: full prompt (with any filler context) and max_tokens."""
+        prompt = item["prompt"]
+        filler = CONTEXT_TIERS[item["context_tier"]]
+        if filler:
+            context = haystack(filler, item["id"], item.get("needle"), item.get("needle_depth", 0.5))
+            prompt = f"{context}\n\n{prompt}"
+        return {
+            "id": item["id"],
+            "name": item["category"],
+            "prompt": prompt,
+            "question": item["prompt"],
+            "scorer": item.get("scorer"),
+            "reference": item.get("reference"),
+            "context_tier": item["context_tier"],
+            "output_tier": item["output_tier"],
+            "max_tokens": OUTPUT_TIERS[item["output_tier"]],
+        }
@@ -0,0 +1,66 @@
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+def bootstrap_ci(samples, stat: Callable = np.mean, n_boot: int = 1000, alpha: float = 0.05, seed: int = 0) -> Tuple[float, float]:
+    """Percentile bootstrap confidence interval for `stat` over `samples`."""
+    values = np.asarray(samples, dtype=float)
+    if values.size < 2:
+        point = float(stat(values)) if values.size else float("nan")
+        return point, point
+    rng = np.random.default_rng(seed)
+    resamples = values[rng.integers(0, values.size, size=(n_boot, values.size))]
+    boot = stat(resamples, axis=1)
+    return float(np.percentile(boot, 100 * alpha / 2)), float(np.percentile(boot, 100 * (1 - alpha / 2)))
+
+
+def ci_is_tight(samples, rel_width: float, stat: Callable = np.mean) -> bool:
+    """True once the CI width is within `rel_width` of the point estimate."""
+    if len(samples) < 2:
+        return False
+    low, high = bootstrap_ci(samples, stat)
+    center = float(stat(np.asarray(samples, dtype=float)))
+    return center > 0 and (high - low) / center <= rel_width
+
+
+def run_trials(call: Callable, warmup: int = 1, trials: int = 5, min_trials: int = 3,
+               ci_rel_width: Optional[float] = 0.1) -> List[Dict]:
+    """
+    Run `warmup` discarded calls, then up to `trials` measured ones. Stops early once
+    the throughput CI is within `ci_rel_width` (after at least `min_trials`).
+    `call` returns a result dict with `latency` and `tokens_per_sec`, or None on failure.
+    """
+    for _ in range(warmup):
+        call()
+
+    results = []
+    for _ in range(trials):
+        res = call()
+        if res is None:
+            # Budget exhausted or hard failure; more attempts won't help.
+            break
+        results.append(res)
+        if ci_rel_width is not None and len(results) >= min_trials and \
+                ci_is_tight([r['tokens_per_sec'] for r in results], ci_rel_width):
+            break
+    return results
+
+
+def summarize_trials(results: List[Dict]) -> Dict:
+    """Latency percentiles, throughput mean/stddev and bootstrap CIs over measured calls."""
+    latency = np.array([r['latency'] for r in results], dtype=float)
+    speed = np.array([r['tokens_per_sec'] for r in results], dtype=float)
+    speed_low, speed_high = bootstrap_ci(speed)
+    p90_low, p90_high = bootstrap_ci(latency, stat=lambda x, axis=None: np.percentile(x, 90, axis=axis))
+    return {
+        "n_trials": int(latency.size),
+        "latency_p50": round(float(np.percentile(latency, 50)), 4),
+        "latency_p90": round(float(np.percentile(latency, 90)), 4),
+        "latency_p99": round(float(np.percentile(latency, 99)), 4),
+        "latency_p90_ci_low": round(p90_low, 4),
+        "latency_p90_ci_high": round(p90_high, 4),
+        "speed_mean": round(float(speed.mean()), 2),
+        "speed_std": round(float(speed.std(ddof=1)) if speed.size > 1 else 0.0, 2),
+        "speed_ci_low": round(speed_low, 2),
+        "speed_ci_high": round(speed_high, 2),
+    }